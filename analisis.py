@@ -2,6 +2,7 @@ import pandas as pd
 import warnings
 from config import HOJAS_REQUERIDAS, COLUMNAS_REQUERIDAS
 from validadores import VALIDADORES
+from resultados import ResultadoHoja, ResultadoLibro
 
 # Suprimir warnings de openpyxl sobre validación de datos
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
@@ -44,8 +45,8 @@ print("\n" + "=" * 40)
 print("Validación de columnas y contenido:")
 print("=" * 40)
 
-total_errores = 0
-total_advertencias = 0
+# Resultados por hoja y totales (el mismo acumulador que usan validar_libro y la app)
+resultados = ResultadoLibro()
 
 # Construir contexto con datos de referencia para validaciones cruzadas
 contexto = {}
@@ -109,6 +110,9 @@ for nombre_hoja in excel_file.sheet_names:
     columnas_extra = [col for col in columnas_actuales if col not in columnas_esperadas]
     
     print(f"\n{nombre_hoja}:")
+    resultado_hoja = ResultadoHoja(nombre_hoja, num_filas=len(df),
+                                   estructura_valida=not columnas_faltantes and not columnas_extra,
+                                   contenido_valido=True)
     
     # Validar estructura de columnas
     if not columnas_faltantes and not columnas_extra:
@@ -118,13 +122,13 @@ for nombre_hoja in excel_file.sheet_names:
             print(f"  ✗ Faltan {len(columnas_faltantes)} columna(s):")
             for col in columnas_faltantes:
                 print(f"    - {col}")
-            total_errores += len(columnas_faltantes)
+            resultado_hoja.errores.extend(f"Falta la columna '{col}'" for col in columnas_faltantes)
         
         if columnas_extra:
             print(f"  ⚠ Hay {len(columnas_extra)} columna(s) adicional(es):")
             for col in columnas_extra:
                 print(f"    - {col}")
-            total_advertencias += len(columnas_extra)
+            resultado_hoja.advertencias.extend(f"Columna adicional '{col}'" for col in columnas_extra)
     
     # Validar contenido usando el validador específico
     if nombre_hoja in VALIDADORES:
@@ -145,21 +149,26 @@ for nombre_hoja in excel_file.sheet_names:
         if resultado['errores']:
             for error in resultado['errores']:
                 print(f"    ✗ {error}")
-                total_errores += 1
         
         if resultado['advertencias']:
             for advertencia in resultado['advertencias']:
                 print(f"    ⚠ {advertencia}")
-                total_advertencias += 1
+        
+        resultado_hoja.contenido_valido = resultado['valido']
+        resultado_hoja.errores.extend(resultado['errores'])
+        resultado_hoja.advertencias.extend(resultado['advertencias'])
+        resultado_hoja.incidencias.extend(resultado.get('incidencias', []))
+    
+    resultados.agregar(resultado_hoja)
 
 # Resumen final
 print("\n" + "=" * 40)
 print("RESUMEN DE VALIDACIÓN:")
 print("=" * 40)
-print(f"Total de errores: {total_errores}")
-print(f"Total de advertencias: {total_advertencias}")
+print(f"Total de errores: {resultados.total_errores}")
+print(f"Total de advertencias: {resultados.total_advertencias}")
 
-if total_errores == 0:
+if resultados.valido:
     print("\n✓ El archivo Excel es VÁLIDO")
 else:
-    print(f"\n✗ El archivo Excel tiene {total_errores} error(es) que deben corregirse")
+    print(f"\n✗ El archivo Excel tiene {resultados.total_errores} error(es) que deben corregirse")
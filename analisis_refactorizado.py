@@ -1,9 +1,10 @@
 import pandas as pd
 from config import HOJAS_REQUERIDAS, COLUMNAS_REQUERIDAS
-from validador_core import construir_contexto, validar_hoja
-from exportador_json import export_excel_to_json
+from validador_core import construir_contexto, validar_hoja, leer_hojas
+from resultados import ResultadoHoja, ResultadoLibro
 import warnings
 import sys
+import os
 
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
@@ -45,11 +46,14 @@ print("\n" + "=" * 40)
 print("Validación de columnas y contenido:")
 print("=" * 40)
 
-total_errores = 0
-total_advertencias = 0
+# Resultados por hoja y totales (el mismo acumulador que usan validar_libro y la app)
+resultados = ResultadoLibro()
+
+# Leer cada hoja una sola vez (se reutilizan en el contexto, la validación y la exportación)
+hojas = leer_hojas(excel_file, [hoja for hoja in excel_file.sheet_names if hoja != "Instrucciones"])
 
 # Construir contexto (reutilizando función compartida)
-contexto = construir_contexto(excel_file, archivo_excel)
+contexto = construir_contexto(excel_file, archivo_excel, hojas)
 
 # Validar cada hoja
 for nombre_hoja in excel_file.sheet_names:
@@ -57,8 +61,8 @@ for nombre_hoja in excel_file.sheet_names:
     if nombre_hoja == "Instrucciones":
         continue
     
-    # Leer la hoja
-    df = pd.read_excel(archivo_excel, sheet_name=nombre_hoja, header=1)
+    # Hoja ya leída
+    df = hojas[nombre_hoja]
     
     columnas_actuales = list(df.columns)
     columnas_esperadas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -68,6 +72,9 @@ for nombre_hoja in excel_file.sheet_names:
     columnas_extra = [col for col in columnas_actuales if col not in columnas_esperadas]
     
     print(f"\n{nombre_hoja}:")
+    resultado_hoja = ResultadoHoja(nombre_hoja, num_filas=len(df),
+                                   estructura_valida=not columnas_faltantes and not columnas_extra,
+                                   contenido_valido=True)
     
     # Validar estructura de columnas
     if not columnas_faltantes and not columnas_extra:
@@ -77,13 +84,13 @@ for nombre_hoja in excel_file.sheet_names:
             print(f"  ✗ Faltan {len(columnas_faltantes)} columna(s):")
             for col in columnas_faltantes:
                 print(f"    - {col}")
-            total_errores += len(columnas_faltantes)
+            resultado_hoja.errores.extend(f"Falta la columna '{col}'" for col in columnas_faltantes)
         
         if columnas_extra:
             print(f"  ⚠ Hay {len(columnas_extra)} columna(s) adicional(es):")
             for col in columnas_extra:
                 print(f"    - {col}")
-            total_advertencias += len(columnas_extra)
+            resultado_hoja.advertencias.extend(f"Columna adicional '{col}'" for col in columnas_extra)
     
     # Validar contenido (reutilizando función compartida)
     resultado = validar_hoja(nombre_hoja, df, contexto)
@@ -96,36 +103,98 @@ for nombre_hoja in excel_file.sheet_names:
     if resultado['errores']:
         for error in resultado['errores']:
             print(f"    ✗ {error}")
-            total_errores += 1
     
     if resultado['advertencias']:
         for advertencia in resultado['advertencias']:
             print(f"    ⚠ {advertencia}")
-            total_advertencias += 1
+    
+    resultado_hoja.contenido_valido = resultado['valido']
+    resultado_hoja.errores.extend(resultado['errores'])
+    resultado_hoja.advertencias.extend(resultado['advertencias'])
+    resultado_hoja.incidencias.extend(resultado.get('incidencias', []))
+    resultados.agregar(resultado_hoja)
 
 # Resumen final
 print("\n" + "=" * 40)
 print("RESUMEN DE VALIDACIÓN:")
 print("=" * 40)
-print(f"Total de errores: {total_errores}")
-print(f"Total de advertencias: {total_advertencias}")
+print(f"Total de errores: {resultados.total_errores}")
+print(f"Total de advertencias: {resultados.total_advertencias}")
 
-if total_errores == 0:
+if resultados.valido:
     print("\n✓ El archivo Excel es VÁLIDO")
     
-    # Preguntar si quiere exportar a JSON
+    # Las exportaciones parten de las hojas ya leídas y validadas (sin releer el archivo)
+    from exportador_json import ExcelToJSONExporter
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+    
+    # Exportar a JSON:
+    #   --export-json [directorio] [--columnar parquet|arrow]
     if len(sys.argv) > 1 and sys.argv[1] == '--export-json':
         print("\n" + "=" * 40)
         print("EXPORTANDO A JSON...")
         print("=" * 40)
         try:
-            output_dir = sys.argv[2] if len(sys.argv) > 2 else 'output'
-            archivos = export_excel_to_json(archivo_excel, output_dir)
+            output_dir = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith('--') else 'output'
+            archivos = exporter.save_to_files(output_dir)
             print(f"✓ Archivos JSON generados en '{output_dir}/':")
             for nombre, ruta in archivos.items():
                 print(f"  - {nombre}: {ruta}")
+            
+            # Exportación columnar (hojas validadas + tablas derivadas) junto al JSON
+            if '--columnar' in sys.argv:
+                from exportador_columnar import export_columnar
+                i = sys.argv.index('--columnar')
+                formato = sys.argv[i + 1] if len(sys.argv) > i + 1 and not sys.argv[i + 1].startswith('--') else 'parquet'
+                directorio_columnar = os.path.join(output_dir, 'columnar')
+                archivos = export_columnar(exporter, directorio_columnar, formato)
+                print(f"✓ Archivos {formato} generados en '{directorio_columnar}/':")
+                for nombre, ruta in archivos.items():
+                    print(f"  - {nombre}: {ruta}")
         except Exception as e:
             print(f"✗ Error al exportar JSON: {str(e)}")
+    
+    # Exportar estudiantes y calificaciones como NDJSON particionado:
+    #   --export-ndjson [directorio] [--por-sede] [--registros-por-archivo N]
+    elif len(sys.argv) > 1 and sys.argv[1] == '--export-ndjson':
+        print("\n" + "=" * 40)
+        print("EXPORTANDO A NDJSON...")
+        print("=" * 40)
+        try:
+            argumentos = sys.argv[2:]
+            por_sede = '--por-sede' in argumentos
+            registros_por_archivo = None
+            if '--registros-por-archivo' in argumentos:
+                registros_por_archivo = int(argumentos[argumentos.index('--registros-por-archivo') + 1])
+            posicionales = [a for i, a in enumerate(argumentos)
+                            if not a.startswith('--') and (i == 0 or argumentos[i - 1] != '--registros-por-archivo')]
+            output_dir = posicionales[0] if posicionales else 'output'
+            manifiesto = exporter.save_to_ndjson(output_dir, por_sede, registros_por_archivo)
+            print(f"✓ Archivos NDJSON generados en '{output_dir}/'")
+            print(f"  - manifiesto: {manifiesto}")
+        except Exception as e:
+            print(f"✗ Error al exportar NDJSON: {str(e)}")
+    
+    # Exportar solo los cambios respecto a una exportación anterior:
+    #   --export-delta <directorio_anterior> [directorio]
+    elif len(sys.argv) > 2 and sys.argv[1] == '--export-delta':
+        print("\n" + "=" * 40)
+        print("EXPORTANDO DELTA...")
+        print("=" * 40)
+        try:
+            from exportador_delta import export_delta
+            
+            directorio_anterior = sys.argv[2]
+            output_dir = sys.argv[3] if len(sys.argv) > 3 else os.path.join('output', 'delta')
+            resumen = export_delta(exporter, directorio_anterior, output_dir)
+            print(f"✓ Delta respecto a '{directorio_anterior}/' generado en '{output_dir}/':")
+            for entidad, conteo in resumen['entidades'].items():
+                print(f"  - {entidad}: {conteo['insertados']} insertado(s), "
+                      f"{conteo['actualizados']} actualizado(s), {conteo['eliminados']} eliminado(s)")
+            secciones = resumen['config']['secciones_modificadas']
+            print(f"  - config: {', '.join(secciones) if secciones else 'sin cambios'}")
+        except Exception as e:
+            print(f"✗ Error al exportar delta: {str(e)}")
 else:
-    print(f"\n✗ El archivo Excel tiene {total_errores} error(es) que deben corregirse")
+    print(f"\n✗ El archivo Excel tiene {resultados.total_errores} error(es) que deben corregirse")
     print("   Corrige los errores antes de exportar a JSON")
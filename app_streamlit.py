@@ -1,14 +1,16 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from io import BytesIO
-import warnings
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from io import BytesIO, StringIO
+import csv
 import json
+import time
+import warnings
 import zipfile
-from config import HOJAS_REQUERIDAS, COLUMNAS_REQUERIDAS
-from validador_core import construir_contexto, validar_hoja
-from exportador_json import ExcelToJSONExporter
+from config import HOJAS_REQUERIDAS, NIVEL_COMPRESION_ZIP, METRICAS_PUERTO, METRICAS_HOST
+from metricas import TAMAÑO_CARGA, consultar_cache, iniciar_servidor_metricas, marcar_calculo, registrar_sesion
+from trabajo_validacion import HOJAS_VALIDADAS, TrabajoValidacion, huella_archivo
+from tabla_incidencias import construir_tabla_incidencias, filtrar_incidencias, mascara_incidencias, paginar, vista_previa
+# plotly y los exportadores se importan al usarse (después de cargar un archivo)
 
 # Configuración de página
 st.set_page_config(
@@ -20,6 +22,18 @@ st.set_page_config(
 
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
+# Métricas Prometheus en un puerto local (solo con SEED_METRICAS_PUERTO; el servidor se inicia una vez por proceso)
+iniciar_servidor_metricas(METRICAS_PUERTO, METRICAS_HOST)
+contexto_ejecucion = get_script_run_ctx()
+if contexto_ejecucion is not None:
+    registrar_sesion(contexto_ejecucion.session_id)
+
+# Segundos entre actualizaciones de la página mientras se valida en segundo plano
+INTERVALO_ACTUALIZACION_S = 0.5
+
+# Filas por página en la vista previa de celdas con incidencias
+FILAS_VISTA_PREVIA = 50
+
 # Estilos personalizados
 st.markdown("""
 <style>
@@ -53,123 +67,236 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def validar_excel(archivo_excel):
+def obtener_trabajo(archivo_cargado, medir_rendimiento=False):
     """
-    Valida el archivo Excel y retorna resultados
+    Trabajo de validación en segundo plano del archivo cargado
+    
+    Se guarda en la sesión identificado por el SHA-256 del contenido: las
+    siguientes ejecuciones del script consultan el mismo trabajo en lugar de
+    volver a validar, y al cargar otro archivo se cancela el anterior. Activar
+    la medición de rendimiento vuelve a validar el archivo (perfilado).
     """
-    resultados = {
-        'hojas_validas': [],
-        'hojas_con_errores': [],
-        'total_errores': 0,
-        'total_advertencias': 0,
-        'detalles': {}
-    }
+    trabajo = st.session_state.get('trabajo_validacion')
+    contenido = archivo_cargado.getvalue()
+    if trabajo is None or trabajo.huella != huella_archivo(contenido) or \
+            (medir_rendimiento and not trabajo.medir_rendimiento):
+        if trabajo is not None:
+            trabajo.cancelar()
+        trabajo = TrabajoValidacion(contenido, archivo_cargado.name, medir_rendimiento).iniciar()
+        TAMAÑO_CARGA.observar(len(contenido))
+        st.session_state['trabajo_validacion'] = trabajo
+    return trabajo
+
+def mostrar_vista_previa(hoja, df, incidencias):
+    """
+    Filas con incidencias de una hoja, con las celdas afectadas resaltadas
     
-    try:
-        excel_file = pd.ExcelFile(archivo_excel)
-        
-        # Construir contexto
-        contexto = {}
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        total_hojas = len(HOJAS_REQUERIDAS) - 1  # Sin Instrucciones
-        hoja_actual = 0
-        
-        # Primera pasada: construir contexto
-        status_text.text("🔄 Construyendo contexto de referencia...")
-        contexto = construir_contexto(excel_file, archivo_excel)
-        
-        # Segunda pasada: validar hojas
-        for hoja in HOJAS_REQUERIDAS:
-            if hoja == "Instrucciones":
+    Las celdas se marcan a partir de las filas y la columna de cada incidencia
+    (sin recorrer celda por celda) y solo se muestra la página visible.
+    """
+    mascara = mascara_incidencias(df, incidencias)
+    col_p1, col_p2 = st.columns([1, 3])
+    with col_p1:
+        pagina = st.number_input("Página", min_value=1, value=1, step=1, key=f"pagina_vista_{hoja}")
+    filas, estilos, total_filas, total_paginas = vista_previa(df, mascara, pagina, FILAS_VISTA_PREVIA)
+    with col_p2:
+        st.caption(f"{total_filas:,} fila(s) con incidencias · página {min(pagina, total_paginas)} de {total_paginas} · "
+                   "🟥 error · 🟨 advertencia (filas sin columna específica: fila completa)")
+    if total_filas == 0:
+        st.info("Las incidencias de esta hoja no señalan filas específicas")
+        return
+    st.dataframe(filas.style.apply(lambda _: estilos, axis=None), width='stretch')
+
+def mostrar_detalles_por_hoja(detalles, hojas=None):
+    """
+    Pestañas por hoja; las hojas aún no validadas se muestran como pendientes
+    
+    Con 'hojas' (DataFrames, al terminar la validación) cada pestaña ofrece la
+    vista previa de las celdas con incidencias.
+    """
+    tabs = st.tabs(HOJAS_VALIDADAS)
+    
+    for tab, hoja in zip(tabs, HOJAS_VALIDADAS):
+        with tab:
+            detalle = detalles.get(hoja)
+            if detalle is None:
+                st.info("⏳ Validación pendiente...")
                 continue
             
-            hoja_actual += 1
-            progreso = hoja_actual / total_hojas
-            progress_bar.progress(progreso)
-            status_text.text(f"📋 Validando: {hoja} ({hoja_actual}/{total_hojas})")
+            col_info1, col_info2, col_info3, col_info4 = st.columns(4)
+            with col_info1:
+                st.metric("Filas", detalle.num_filas)
+            with col_info2:
+                st.metric("Errores", detalle.num_errores)
+            with col_info3:
+                st.metric("Advertencias", detalle.num_advertencias)
+            with col_info4:
+                estado = "✅ Válida" if detalle.contenido_valido and detalle.num_errores == 0 else "❌ Con Errores"
+                st.markdown(f"**Estado:** {estado}")
             
-            resultado_hoja = {
-                'nombre': hoja,
-                'existe': False,
-                'estructura_valida': False,
-                'contenido_valido': False,
-                'errores': [],
-                'advertencias': [],
-                'num_filas': 0
+            # Los mensajes se consultan en el explorador de incidencias (paginado)
+            if len(detalle.errores) == 0 and len(detalle.advertencias) == 0:
+                st.success("✅ No hay errores ni advertencias en esta hoja")
+            else:
+                st.caption("🔎 Consulta los mensajes en el explorador de incidencias")
+                if hojas is not None and hoja in hojas and st.toggle("🔍 Ver celdas con incidencias", key=f"vista_{hoja}"):
+                    mostrar_vista_previa(hoja, hojas[hoja], detalle.incidencias)
+
+# La tabla se arma una vez por archivo (huella); _detalles no se hashea
+@st.cache_data(max_entries=4, show_spinner=False)
+def tabla_incidencias_archivo(huella, _detalles):
+    marcar_calculo()
+    return construir_tabla_incidencias(_detalles)
+
+def mostrar_explorador_incidencias(tabla):
+    """
+    Tabla paginada de incidencias con filtros por hoja, regla y severidad
+    
+    El filtrado y la paginación se hacen en el servidor: al navegador solo se
+    envían las filas de la página visible.
+    """
+    if tabla.empty:
+        st.success("✅ No hay errores ni advertencias")
+        return
+    
+    col_f1, col_f2, col_f3 = st.columns(3)
+    with col_f1:
+        hojas = st.multiselect("Hoja", tabla['hoja'].unique().tolist(), key='filtro_hojas')
+    with col_f2:
+        reglas = st.multiselect("Regla", sorted(tabla['regla'].unique().tolist()), key='filtro_reglas')
+    with col_f3:
+        severidades = st.multiselect("Severidad", tabla['severidad'].unique().tolist(),
+                                     format_func=str.capitalize, key='filtro_severidades')
+    filtrada = filtrar_incidencias(tabla, hojas, reglas, severidades)
+    
+    col_p1, col_p2, col_p3 = st.columns([1, 1, 2])
+    with col_p1:
+        tamaño = st.selectbox("Filas por página", [25, 50, 100, 250], key='incidencias_por_pagina')
+    total_paginas = max(1, -(-len(filtrada) // tamaño))
+    with col_p2:
+        pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, step=1,
+                                 key='pagina_incidencias')
+    visibles, total_paginas = paginar(filtrada, pagina, tamaño)
+    with col_p3:
+        st.caption(f"{len(filtrada):,} de {len(tabla):,} incidencias · página {min(pagina, total_paginas)} de {total_paginas}")
+    
+    st.dataframe(
+        visibles,
+        hide_index=True,
+        width='stretch',
+        column_config={
+            'hoja': "Hoja",
+            'severidad': "Severidad",
+            'regla': "Regla",
+            'columna': "Columna",
+            'mensaje': st.column_config.TextColumn("Mensaje", width='large'),
+            'num_filas': "Núm. filas",
+            'filas': "Filas afectadas"
+        }
+    )
+
+def mostrar_rendimiento(trabajo):
+    """Duración, filas y memoria pico por etapa de la validación perfilada, con la traza JSON"""
+    with st.expander("⏱️ Rendimiento"):
+        st.dataframe(
+            trabajo.rendimiento,
+            hide_index=True,
+            width='stretch',
+            column_config={
+                'etapa': "Etapa",
+                'nombre': "Nombre",
+                'llamadas': "Llamadas",
+                'duracion_ms': st.column_config.NumberColumn("Duración (ms)", format="%.1f"),
+                'filas': "Filas",
+                'memoria_pico_kb': st.column_config.NumberColumn("Memoria pico (KB)", format="%.0f")
             }
-            
-            if hoja not in excel_file.sheet_names:
-                resultado_hoja['errores'].append(f"La hoja '{hoja}' no existe")
-                resultados['detalles'][hoja] = resultado_hoja
-                resultados['hojas_con_errores'].append(hoja)
-                resultados['total_errores'] += 1
-                continue
-            
-            resultado_hoja['existe'] = True
-            df = pd.read_excel(excel_file, sheet_name=hoja, header=1)
-            resultado_hoja['num_filas'] = len(df)
-            
-            # Validar estructura (columnas) - excepto Sede principal que tiene estructura transpuesta
-            if hoja in COLUMNAS_REQUERIDAS and hoja != "Sede principal":
-                columnas_requeridas = COLUMNAS_REQUERIDAS[hoja]
-                columnas_presentes = df.columns.tolist()
-                
-                if columnas_requeridas == columnas_presentes[:len(columnas_requeridas)]:
-                    resultado_hoja['estructura_valida'] = True
-                else:
-                    resultado_hoja['errores'].append("Estructura de columnas incorrecta")
-            elif hoja == "Sede principal":
-                # Sede principal tiene estructura transpuesta, solo validar que existe
-                resultado_hoja['estructura_valida'] = True
-            
-            # Validar contenido
-            validacion = validar_hoja(hoja, df, contexto)
-            resultado_hoja['contenido_valido'] = validacion['valido']
-            resultado_hoja['errores'].extend(validacion['errores'])
-            resultado_hoja['advertencias'].extend(validacion['advertencias'])
-            
-            # Agregar a resultados
-            resultados['detalles'][hoja] = resultado_hoja
-            resultados['total_errores'] += len(resultado_hoja['errores'])
-            resultados['total_advertencias'] += len(resultado_hoja['advertencias'])
-            
-            if len(resultado_hoja['errores']) > 0:
-                resultados['hojas_con_errores'].append(hoja)
-            elif resultado_hoja['estructura_valida'] and resultado_hoja['contenido_valido']:
-                resultados['hojas_validas'].append(hoja)
-        
-        progress_bar.progress(1.0)
-        status_text.text("✅ Validación completada")
-        
-    except Exception as e:
-        st.error(f"❌ Error al procesar el archivo: {str(e)}")
-        return None
+        )
+        st.download_button(
+            label="📥 Descargar traza",
+            data=json.dumps(trabajo.traza, ensure_ascii=False).encode('utf-8'),
+            file_name="traza_validacion.json",
+            mime="application/json",
+            help="Formato Trace Event: se abre en chrome://tracing o ui.perfetto.dev"
+        )
+
+def _exportacion(datos, inicio):
+    return {'datos': datos, 'tamaño_bytes': len(datos), 'duracion_s': time.perf_counter() - inicio}
+
+# Las exportaciones se cachean por la huella (SHA-256) del archivo; _trabajo no se hashea
+@st.cache_data(max_entries=8, show_spinner=False)
+def construir_zip_json(huella, _trabajo):
+    """ZIP con los 4 JSON, generado sobre las hojas y el catálogo ya validados (sin releer el archivo)"""
+    from exportador_json import ExcelToJSONExporter
+    
+    marcar_calculo()
+    inicio = time.perf_counter()
+    resultados = _trabajo.resultados
+    exporter = ExcelToJSONExporter(hojas=resultados.hojas, contexto=resultados.contexto)
     
-    return resultados
+    # Cada documento se escribe de forma incremental en su entrada del ZIP
+    zip_buffer = BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED,
+                         compresslevel=NIVEL_COMPRESION_ZIP) as zip_file:
+        exporter.write_zip(zip_file)
+    return _exportacion(zip_buffer.getvalue(), inicio)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def construir_zip_parquet(huella, _trabajo):
+    """ZIP con cada hoja validada y las tablas derivadas en Parquet"""
+    from exportador_json import ExcelToJSONExporter
+    from exportador_columnar import escribir_zip_columnar
+    
+    marcar_calculo()
+    inicio = time.perf_counter()
+    resultados = _trabajo.resultados
+    exporter = ExcelToJSONExporter(hojas=resultados.hojas, contexto=resultados.contexto)
+    columnar_buffer = BytesIO()
+    with zipfile.ZipFile(columnar_buffer, 'w') as zip_file:
+        escribir_zip_columnar(None, zip_file, 'parquet', exporter)
+    return _exportacion(columnar_buffer.getvalue(), inicio)
+
+def boton_exportacion(clave, etiqueta, construir, trabajo, **descarga):
+    """
+    Botón que genera una exportación solo cuando se pide
+    
+    La solicitud se recuerda en la sesión (por huella del archivo) para que el botón
+    de descarga siga visible en las siguientes ejecuciones, que leen la caché.
+    """
+    solicitada = st.session_state.get(clave) == trabajo.huella
+    if not solicitada and st.button(etiqueta, key=f"{clave}_preparar"):
+        st.session_state[clave] = trabajo.huella
+        solicitada = True
+    if not solicitada:
+        return
+    
+    with st.spinner("Generando exportación..."):
+        exportacion = consultar_cache(clave, construir, trabajo.huella, trabajo)
+    st.download_button(data=exportacion['datos'], **descarga)
+    st.caption(f"{exportacion['tamaño_bytes'] / 1024:,.0f} KB · generado en {exportacion['duracion_s']:.2f}s")
 
 def generar_reporte_csv(resultados):
-    """Genera un CSV con el resumen de errores"""
-    datos = []
-    for hoja, detalle in resultados['detalles'].items():
-        for error in detalle['errores']:
-            datos.append({
-                'Hoja': hoja,
-                'Tipo': 'Error',
-                'Mensaje': error,
-                'Filas': detalle['num_filas']
-            })
-        for advertencia in detalle['advertencias']:
-            datos.append({
-                'Hoja': hoja,
-                'Tipo': 'Advertencia',
-                'Mensaje': advertencia,
-                'Filas': detalle['num_filas']
-            })
+    """
+    Genera un CSV con el resumen de errores
     
-    df = pd.DataFrame(datos)
-    return df.to_csv(index=False).encode('utf-8-sig')
+    Se escribe fila por fila con el módulo csv (sin armar un DataFrame con todos
+    los mensajes); incluye la regla, la columna y las filas de Excel afectadas.
+    """
+    salida = StringIO()
+    escritor = csv.writer(salida, lineterminator='\n')
+    escritor.writerow(['Hoja', 'Tipo', 'Mensaje', 'Filas', 'Regla', 'Columna', 'Filas afectadas'])
+    for hoja, detalle in resultados.detalles.items():
+        incidencias = sorted(detalle.incidencias, key=lambda incidencia: incidencia['severidad'] != 'error')
+        for incidencia in incidencias:
+            escritor.writerow([
+                hoja,
+                'Error' if incidencia['severidad'] == 'error' else 'Advertencia',
+                incidencia['mensaje'],
+                detalle.num_filas,
+                incidencia['regla'],
+                incidencia['columna'] or '',
+                ', '.join(map(str, incidencia['filas']))
+            ])
+    return salida.getvalue().encode('utf-8-sig')
 
 # Header
 st.markdown('<div class="main-header">📊 Validador de Excel - Seed Pablo Neruda</div>', unsafe_allow_html=True)
@@ -185,6 +312,12 @@ with st.sidebar:
         help="Arrastra y suelta o haz clic para seleccionar"
     )
     
+    medir_rendimiento = st.checkbox(
+        "⏱️ Medir rendimiento",
+        value=False,
+        help="Registra duración, filas y memoria pico de cada etapa de la validación"
+    )
+    
     st.markdown("---")
     st.subheader("ℹ️ Información")
     st.info("""
@@ -201,6 +334,11 @@ with st.sidebar:
 
 # Contenido principal
 if archivo_cargado is None:
+    # Sin archivo: detener la validación que hubiera en curso
+    trabajo_anterior = st.session_state.pop('trabajo_validacion', None)
+    if trabajo_anterior is not None:
+        trabajo_anterior.cancelar()
+    
     # Estado inicial - sin archivo
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
@@ -217,12 +355,28 @@ if archivo_cargado is None:
             st.write(f"{i}. {hoja}")
 
 else:
-    # Archivo cargado - ejecutar validación
+    # Archivo cargado - validación en segundo plano
     st.success(f"✅ Archivo cargado: **{archivo_cargado.name}**")
     
-    # Ejecutar validación
-    with st.spinner("Validando archivo..."):
-        resultados = validar_excel(archivo_cargado)
+    # Cada ejecución del script muestra el avance del mismo trabajo (no se vuelve a validar)
+    trabajo = obtener_trabajo(archivo_cargado, medir_rendimiento)
+    estado_trabajo = trabajo.estado()
+    resultados = None
+    
+    if estado_trabajo['estado'] == 'fallo':
+        st.error(f"❌ Error al procesar el archivo: {estado_trabajo['error']}")
+    elif estado_trabajo['estado'] == 'en_curso':
+        # Resultados parciales: las pestañas se llenan a medida que termina cada hoja
+        st.progress(estado_trabajo['progreso'], text=estado_trabajo['fase'])
+        st.markdown("### 📋 Detalles por Hoja")
+        mostrar_detalles_por_hoja(estado_trabajo['detalles'])
+        time.sleep(INTERVALO_ACTUALIZACION_S)
+        st.rerun()
+    else:
+        resultados = trabajo.resultados
+        st.caption(f"⏱️ Validación completada en {estado_trabajo['duracion_s']:.1f}s")
+        if trabajo.rendimiento:
+            mostrar_rendimiento(trabajo)
     
     if resultados:
         # Métricas principales
@@ -232,7 +386,7 @@ else:
         with col1:
             st.metric(
                 "Total Errores",
-                resultados['total_errores'],
+                resultados.total_errores,
                 delta=None,
                 delta_color="inverse"
             )
@@ -240,13 +394,13 @@ else:
         with col2:
             st.metric(
                 "Advertencias",
-                resultados['total_advertencias'],
+                resultados.total_advertencias,
                 delta=None,
                 delta_color="normal"
             )
         
         with col3:
-            hojas_validas = len(resultados['hojas_validas'])
+            hojas_validas = len(resultados.hojas_validas)
             total_hojas = len(HOJAS_REQUERIDAS) - 1
             st.metric(
                 "Hojas Válidas",
@@ -255,7 +409,7 @@ else:
             )
         
         with col4:
-            if resultados['total_errores'] == 0:
+            if resultados.total_errores == 0:
                 st.markdown('<div class="success-box"><b>✅ VÁLIDO</b></div>', unsafe_allow_html=True)
             else:
                 st.markdown('<div class="error-box"><b>❌ CON ERRORES</b></div>', unsafe_allow_html=True)
@@ -263,13 +417,14 @@ else:
         st.markdown("---")
         
         # Gráficos
+        import plotly.graph_objects as go
         col_left, col_right = st.columns(2)
         
         with col_left:
             # Gráfico de barras: Errores por hoja
-            errores_por_hoja = {hoja: len(detalle['errores']) 
-                               for hoja, detalle in resultados['detalles'].items() 
-                               if len(detalle['errores']) > 0}
+            errores_por_hoja = {hoja: detalle.num_errores 
+                               for hoja, detalle in resultados.detalles.items() 
+                               if detalle.num_errores > 0}
             
             if errores_por_hoja:
                 fig_errores = go.Figure(data=[
@@ -292,8 +447,8 @@ else:
         with col_right:
             # Gráfico circular: Estado de hojas
             estado_hojas = {
-                'Válidas': len(resultados['hojas_validas']),
-                'Con Errores': len(resultados['hojas_con_errores']),
+                'Válidas': len(resultados.hojas_validas),
+                'Con Errores': len(resultados.hojas_con_errores),
             }
             
             fig_estado = go.Figure(data=[
@@ -314,29 +469,12 @@ else:
         # Detalles por hoja (tabs)
         st.markdown("### 📋 Detalles por Hoja")
         
-        tabs = st.tabs([hoja for hoja in resultados['detalles'].keys()])
+        mostrar_detalles_por_hoja(resultados.detalles, resultados.hojas)
         
-        for tab, (hoja, detalle) in zip(tabs, resultados['detalles'].items()):
-            with tab:
-                col_info1, col_info2 = st.columns(2)
-                with col_info1:
-                    st.metric("Filas", detalle['num_filas'])
-                with col_info2:
-                    estado = "✅ Válida" if detalle['contenido_valido'] and len(detalle['errores']) == 0 else "❌ Con Errores"
-                    st.markdown(f"**Estado:** {estado}")
-                
-                if len(detalle['errores']) > 0:
-                    st.error("**Errores encontrados:**")
-                    for i, error in enumerate(detalle['errores'], 1):
-                        st.write(f"{i}. {error}")
-                
-                if len(detalle['advertencias']) > 0:
-                    st.warning("**Advertencias:**")
-                    for i, adv in enumerate(detalle['advertencias'], 1):
-                        st.write(f"{i}. {adv}")
-                
-                if len(detalle['errores']) == 0 and len(detalle['advertencias']) == 0:
-                    st.success("✅ No hay errores ni advertencias en esta hoja")
+        # Explorador de incidencias (todas las hojas)
+        st.markdown("### 🔎 Explorador de Incidencias")
+        mostrar_explorador_incidencias(consultar_cache(
+            'tabla_incidencias', tabla_incidencias_archivo, trabajo.huella, resultados.detalles))
         
         st.markdown("---")
         
@@ -359,25 +497,25 @@ else:
 {'='*80}
 
 RESUMEN:
-- Total de errores: {resultados['total_errores']}
-- Total de advertencias: {resultados['total_advertencias']}
-- Hojas válidas: {len(resultados['hojas_validas'])}/{len(HOJAS_REQUERIDAS)-1}
+- Total de errores: {resultados.total_errores}
+- Total de advertencias: {resultados.total_advertencias}
+- Hojas válidas: {len(resultados.hojas_validas)}/{len(HOJAS_REQUERIDAS)-1}
 
 {'='*80}
 
 DETALLES POR HOJA:
 
 """
-            for hoja, detalle in resultados['detalles'].items():
+            for hoja, detalle in resultados.detalles.items():
                 resumen_txt += f"\n{hoja}:\n"
-                resumen_txt += f"  - Filas: {detalle['num_filas']}\n"
-                if detalle['errores']:
+                resumen_txt += f"  - Filas: {detalle.num_filas}\n"
+                if detalle.errores:
                     resumen_txt += f"  - Errores:\n"
-                    for error in detalle['errores']:
+                    for error in detalle.errores:
                         resumen_txt += f"    * {error}\n"
-                if detalle['advertencias']:
+                if detalle.advertencias:
                     resumen_txt += f"  - Advertencias:\n"
-                    for adv in detalle['advertencias']:
+                    for adv in detalle.advertencias:
                         resumen_txt += f"    * {adv}\n"
             
             st.download_button(
@@ -391,43 +529,35 @@ DETALLES POR HOJA:
             # Opción para forzar exportación aun con errores
             force_export = st.checkbox("Forzar exportación (ignorar errores)", value=False)
 
-            # Exportar a JSON
-            if resultados['total_errores'] == 0 or force_export:
+            # Exportaciones bajo demanda: se generan al pedirlas y se cachean por SHA-256 del archivo
+            if resultados.total_errores == 0 or force_export:
+                if resultados.total_errores > 0 and force_export:
+                    st.info("🔔 Exportando aún con errores: revisa las advertencias y el resultado antes de usarlo en producción.")
+                
                 try:
-                    if resultados['total_errores'] > 0 and force_export:
-                        st.info("🔔 Exportando aún con errores: revisa las advertencias y el resultado antes de usarlo en producción.")
-                    # Crear exportador
-                    excel_file = pd.ExcelFile(archivo_cargado)
-                    exporter = ExcelToJSONExporter(excel_file)
-                    data = exporter.export_all()
-                    
-                    # Crear ZIP con todos los JSONs
-                    zip_buffer = BytesIO()
-                    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                        # Agregar config.json
-                        zip_file.writestr('config.json', 
-                                        json.dumps(data['config'], ensure_ascii=False, indent=2))
-                        # Agregar profesores.json
-                        zip_file.writestr('profesores.json', 
-                                        json.dumps(data['profesores'], ensure_ascii=False, indent=2))
-                        # Agregar estudiantes.json
-                        zip_file.writestr('estudiantes.json', 
-                                        json.dumps(data['estudiantes'], ensure_ascii=False, indent=2))
-                        # Agregar calificaciones_anuales.json
-                        zip_file.writestr('calificaciones_anuales.json', 
-                                        json.dumps(data['calificaciones_anuales'], ensure_ascii=False, indent=2))
-                    
-                    zip_buffer.seek(0)
-                    
-                    st.download_button(
+                    boton_exportacion(
+                        'exportacion_json', "⚙️ Preparar exportación JSON", construir_zip_json, trabajo,
                         label="📦 Exportar a JSON",
-                        data=zip_buffer.getvalue(),
                         file_name="seed_data.zip",
                         mime="application/zip",
                         help="Descarga 4 archivos JSON: config, profesores, estudiantes y calificaciones"
                     )
                 except Exception as e:
                     st.error(f"Error al exportar JSON: {str(e)}")
+                
+                # Exportación columnar (Parquet) de las hojas validadas y tablas derivadas
+                try:
+                    boton_exportacion(
+                        'exportacion_parquet', "⚙️ Preparar exportación Parquet", construir_zip_parquet, trabajo,
+                        label="🗂️ Exportar a Parquet",
+                        file_name="seed_data_parquet.zip",
+                        mime="application/zip",
+                        help="Descarga cada hoja validada y las tablas de estudiantes y calificaciones en formato Parquet"
+                    )
+                except ImportError as e:
+                    st.caption(f"ℹ️ Exportación Parquet no disponible: {str(e)}")
+                except Exception as e:
+                    st.error(f"Error al exportar Parquet: {str(e)}")
             else:
                 st.warning("⚠️ Corrige los errores antes de exportar")
 
@@ -0,0 +1,122 @@
+"""
+Benchmark de la agrupación de Calificaciones anuales (export_calificaciones)
+
+Genera una hoja sintética en memoria (sin pasar por Excel), mide
+agrupar_calificaciones y, opcionalmente, la compara con la implementación
+anterior fila a fila para verificar que el resultado es idéntico.
+
+Uso:
+    python benchmarks/bench_calificaciones.py [--filas 2000000] [--referencia]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exportador_json import agrupar_calificaciones  # noqa: E402
+from serializador_json import a_valor_json  # noqa: E402
+
+ASIGNATURAS = ['Matemáticas', 'Español', 'Ciencias Naturales', 'Sociales', 'Inglés',
+               'Educación Física', 'Artística', 'Tecnología', 'Ética', 'Religión']
+
+
+def generar_hoja(filas: int, semilla: int = 42) -> pd.DataFrame:
+    """Hoja Calificaciones anuales sintética (~10 asignaturas por estudiante, con repeticiones)"""
+    rng = np.random.default_rng(semilla)
+    estudiantes = max(1, filas // 10)
+    documentos = rng.integers(1_000_000, 1_000_000 + estudiantes, filas)
+    return pd.DataFrame({
+        'Número de documento del estudiante': documentos,
+        'Nombre del estudiante': np.char.add('Estudiante ', documentos.astype(str)),
+        # ~2% de asignaturas que no existen en la hoja Asignaturas
+        'Nombre de la asignatura': rng.choice(ASIGNATURAS + ['Inventada'], filas, p=[0.098] * 10 + [0.02]),
+        'Año escolar': rng.choice([2024, 2025], filas, p=[0.9, 0.1]),
+        'Sede asignada': rng.choice(['Sede Principal', 'Sede Rural'], filas, p=[0.95, 0.05]),
+        'Tipo de nota': 'Cuantitativa (Números)',
+        'Promedio anual': np.round(rng.uniform(1, 5, filas), 1),
+        'Aprobó': rng.choice(['Sí', 'No'], filas)
+    })
+
+
+def agrupar_fila_a_fila(df: pd.DataFrame, asignaturas_validas: set) -> dict:
+    """Implementación anterior (iterrows + diccionarios), usada como referencia"""
+    estudiantes_agrupados = {}
+    for _, row in df.iterrows():
+        asignatura = str(row.get('Nombre de la asignatura', '')).strip()
+        if asignaturas_validas and asignatura not in asignaturas_validas:
+            continue
+        año_escolar = row.get('Año escolar', '')
+        if isinstance(año_escolar, (int, float)) and not pd.isna(año_escolar):
+            año_escolar = str(int(año_escolar))
+        else:
+            año_escolar = str(año_escolar).strip()
+        num_documento = str(row.get('Número de documento del estudiante', '')).strip()
+        sede_asignada = str(row.get('Sede asignada', '')).strip()
+        promedio_anual = a_valor_json(row.get('Promedio anual'))
+        clave_base = f"{num_documento}_{año_escolar}_{sede_asignada}"
+        if clave_base not in estudiantes_agrupados:
+            estudiantes_agrupados[clave_base] = {
+                'numero_documento': num_documento,
+                'año_escolar': año_escolar,
+                'sede_asignada': sede_asignada,
+                'Nombre del estudiante': str(row.get('Nombre del estudiante', '')).strip(),
+                'Año escolar': año_escolar,
+                'Sede asignada': sede_asignada,
+                'Tipo de nota': str(row.get('Tipo de nota', '')).strip(),
+                'Aprobó': str(row.get('Aprobó', '')) if pd.notna(row.get('Aprobó')) else None,
+                'calificaciones': [],
+                'asignaturas_vistas': {}
+            }
+        grupo = estudiantes_agrupados[clave_base]
+        if asignatura not in grupo['asignaturas_vistas']:
+            grupo['calificaciones'].append({'Nombre de la asignatura': asignatura, 'Promedio anual': promedio_anual})
+            grupo['asignaturas_vistas'][asignatura] = len(grupo['calificaciones']) - 1
+        else:
+            grupo['calificaciones'][grupo['asignaturas_vistas'][asignatura]]['Promedio anual'] = promedio_anual
+
+    docs_agrupados = {}
+    for clave, datos in estudiantes_agrupados.items():
+        docs_agrupados.setdefault(datos['numero_documento'], []).append(datos)
+    auxiliares = ['numero_documento', 'año_escolar', 'sede_asignada', 'asignaturas_vistas']
+    resultado = {}
+    for doc, entradas in docs_agrupados.items():
+        for datos in entradas:
+            clave = doc if len(entradas) == 1 else f"{doc}_{datos['año_escolar']}_{datos['sede_asignada']}"
+            resultado[clave] = {k: v for k, v in datos.items() if k not in auxiliares}
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=2_000_000, help='Filas de la hoja sintética')
+    parser.add_argument('--referencia', action='store_true',
+                        help='Ejecutar también la versión fila a fila y comparar resultados (lento)')
+    args = parser.parse_args()
+
+    df = generar_hoja(args.filas)
+    asignaturas_validas = set(ASIGNATURAS)
+    print(f"Filas: {len(df):,}")
+
+    inicio = time.perf_counter()
+    resultado = dict(agrupar_calificaciones(df, asignaturas_validas))
+    duracion = time.perf_counter() - inicio
+    print(f"agrupar_calificaciones (groupby): {duracion:.2f} s -> {len(resultado):,} estudiantes")
+
+    if args.referencia:
+        inicio = time.perf_counter()
+        referencia = agrupar_fila_a_fila(df, asignaturas_validas)
+        duracion_ref = time.perf_counter() - inicio
+        print(f"fila a fila (referencia):         {duracion_ref:.2f} s ({duracion_ref / duracion:.1f}x)")
+        if list(referencia.items()) != list(resultado.items()):
+            print("✗ Los resultados NO coinciden")
+            sys.exit(1)
+        print("✓ Resultados idénticos (claves, orden y valores)")
+
+
+if __name__ == '__main__':
+    main()
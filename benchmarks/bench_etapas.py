@@ -0,0 +1,247 @@
+"""
+Benchmark de punta a punta por etapas, con memoria pico y línea base
+
+Genera (una sola vez) libros sintéticos de varios tamaños con
+generador_sintetico.py y, para cada uno, mide en un proceso nuevo:
+    lectura/<hoja>         pd.ExcelFile.parse de cada hoja (header=1)
+    contexto               validador_core.construir_contexto
+    validacion/<hoja>      cada validador de VALIDADORES (vía validar_hoja)
+    exportacion/<método>   export_config, export_profesores, export_estudiantes y export_calificaciones
+    serializacion/<doc>    serialización JSON de cada documento ya construido
+y la memoria residente pico (RSS) al terminar cada etapa. Cada tamaño se
+ejecuta --repeticiones veces; se reporta la mediana de cada etapa y el máximo RSS.
+
+Con --linea-base compara contra resultados guardados y falla si alguna etapa
+(de al menos --minimo-ms en la línea base) o el RSS pico empeoran más que
+--umbral. La línea base depende de la máquina: regenerarla con
+--guardar-linea-base en la máquina donde se compara.
+
+Uso:
+    python benchmarks/bench_etapas.py --tamaños 100,1000,10000
+    python benchmarks/bench_etapas.py --linea-base benchmarks/linea_base.json --umbral 0.25
+    python benchmarks/bench_etapas.py --guardar-linea-base benchmarks/linea_base.json
+
+Código de salida 1 si hay regresiones respecto a la línea base.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+TAMAÑOS_POR_DEFECTO = [100, 1000, 10000]
+
+# Filas de Calificaciones anuales por matrícula en los libros generados
+CALIFICACIONES_POR_ESTUDIANTE = 5
+
+
+def rss_pico_mb():
+    """Memoria residente pico del proceso en MB (None si la plataforma no lo informa)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def preparar_libro(directorio: str, matriculas: int, semilla: int) -> str:
+    """Libro sintético de un tamaño (se reutiliza si ya existe: la generación es determinista)"""
+    from generador_sintetico import generar_libro
+
+    ruta = os.path.join(directorio, f"bench_{matriculas}_s{semilla}.xlsx")
+    if not os.path.exists(ruta):
+        temporal = ruta + '.tmp.xlsx'
+        generar_libro(temporal, matriculas, matriculas * CALIFICACIONES_POR_ESTUDIANTE, semilla=semilla)
+        os.replace(temporal, ruta)
+    return ruta
+
+
+def medir_libro(ruta: str):
+    """
+    Mide cada etapa sobre un libro (se ejecuta en un proceso nuevo)
+
+    Returns:
+        list: [{'etapa', 'ms', 'rss_mb'}] en orden de ejecución
+    """
+    import warnings
+
+    import pandas as pd
+
+    from exportador_json import ExcelToJSONExporter
+    from serializador_json import iter_lista_json, iter_objeto_json, iter_valor_json
+    from trabajo_validacion import HOJAS_VALIDADAS
+    from validador_core import construir_contexto, validar_hoja
+    from validadores import VALIDADORES
+
+    warnings.filterwarnings('ignore')
+    etapas = []
+
+    def medir(etapa, funcion, *args):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        etapas.append({'etapa': etapa, 'ms': (time.perf_counter() - inicio) * 1000, 'rss_mb': rss_pico_mb()})
+        return resultado
+
+    excel_file = medir('lectura/abrir', pd.ExcelFile, ruta)
+    hojas = {}
+    for hoja in HOJAS_VALIDADAS:
+        if hoja in excel_file.sheet_names:
+            hojas[hoja] = medir(f'lectura/{hoja}', excel_file.parse, hoja, 1)
+
+    contexto = medir('contexto', construir_contexto, excel_file, ruta, hojas)
+
+    for hoja in VALIDADORES:
+        if hoja in hojas:
+            medir(f'validacion/{hoja}', validar_hoja, hoja, hojas[hoja], contexto)
+
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+    documentos = {}
+    for documento, exportar in exporter._exportadores().items():
+        documentos[documento] = medir(f'exportacion/{exportar.__name__}', exportar)
+
+    serializador = exporter.serializador
+    serializar = {
+        'config': lambda valor: iter_valor_json(valor, serializador),
+        'profesores': lambda valor: iter_lista_json(valor, serializador),
+        'estudiantes': lambda valor: iter_lista_json(valor, serializador),
+        'calificaciones_anuales': lambda valor: iter_objeto_json(valor.items(), serializador)
+    }
+    for documento, valor in documentos.items():
+        medir(f'serializacion/{documento}', lambda: sum(len(fragmento) for fragmento in serializar[documento](valor)))
+    return etapas
+
+
+def ejecutar_tamaño(ruta: str, repeticiones: int):
+    """Mide un libro en 'repeticiones' procesos nuevos; mediana por etapa y máximo RSS"""
+    corridas = []
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, os.path.abspath(__file__), '--medir', ruta],
+                                 capture_output=True, text=True, cwd=RAIZ)
+        if proceso.returncode != 0:
+            raise RuntimeError(f"Falló la medición de {ruta}:\n{proceso.stderr}")
+        corridas.append(json.loads(proceso.stdout))
+
+    etapas = {}
+    for corrida in corridas:
+        for medicion in corrida:
+            etapas.setdefault(medicion['etapa'], []).append(medicion)
+    resultado = {
+        etapa: {'ms': round(statistics.median(m['ms'] for m in mediciones), 2)}
+        for etapa, mediciones in etapas.items()
+    }
+    rss = [m['rss_mb'] for corrida in corridas for m in corrida if m['rss_mb'] is not None]
+    return {
+        'etapas': resultado,
+        'total_ms': round(sum(etapa['ms'] for etapa in resultado.values()), 2),
+        'rss_pico_mb': round(max(rss), 1) if rss else None
+    }
+
+
+def comparar(resultados, linea_base, umbral: float, minimo_ms: float):
+    """
+    Regresiones respecto a la línea base
+
+    Returns:
+        list: Mensajes de las etapas (y RSS) que empeoraron más que el umbral
+    """
+    regresiones = []
+    for tamaño, actual in resultados['tamaños'].items():
+        base = linea_base.get('tamaños', {}).get(tamaño)
+        if base is None:
+            continue
+        for etapa, medicion in actual['etapas'].items():
+            referencia = base['etapas'].get(etapa)
+            if referencia is None or referencia['ms'] < minimo_ms:
+                continue
+            if medicion['ms'] > referencia['ms'] * (1 + umbral):
+                regresiones.append(f"[{tamaño}] {etapa}: {medicion['ms']:.1f} ms "
+                                   f"(línea base {referencia['ms']:.1f} ms, +{medicion['ms'] / referencia['ms'] - 1:.0%})")
+        if actual['rss_pico_mb'] and base.get('rss_pico_mb') and \
+                actual['rss_pico_mb'] > base['rss_pico_mb'] * (1 + umbral):
+            regresiones.append(f"[{tamaño}] RSS pico: {actual['rss_pico_mb']:.0f} MB "
+                               f"(línea base {base['rss_pico_mb']:.0f} MB)")
+    return regresiones
+
+
+def imprimir_tabla(resultados) -> None:
+    tamaños = list(resultados['tamaños'])
+    etapas = list(dict.fromkeys(etapa for r in resultados['tamaños'].values() for etapa in r['etapas']))
+    ancho = max(len(etapa) for etapa in etapas)
+    print(f"{'etapa (ms)':<{ancho}}  " + '  '.join(f"{tamaño:>10}" for tamaño in tamaños))
+    for etapa in etapas:
+        valores = [resultados['tamaños'][t]['etapas'].get(etapa, {}).get('ms') for t in tamaños]
+        print(f"{etapa:<{ancho}}  " + '  '.join(f"{v:>10.1f}" if v is not None else f"{'-':>10}" for v in valores))
+    print(f"{'TOTAL':<{ancho}}  " + '  '.join(f"{resultados['tamaños'][t]['total_ms']:>10.1f}" for t in tamaños))
+    print(f"{'RSS pico (MB)':<{ancho}}  " + '  '.join(
+        f"{resultados['tamaños'][t]['rss_pico_mb'] or 0:>10.1f}" for t in tamaños))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamaños', default=','.join(map(str, TAMAÑOS_POR_DEFECTO)),
+                        help="Filas de Matrículas de cada libro, separadas por coma (Calificaciones: x5)")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Procesos por tamaño (mediana)")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla de los libros generados")
+    parser.add_argument('--fixtures', default=os.path.join(tempfile.gettempdir(), 'seed_bench'),
+                        help="Directorio donde se generan (y reutilizan) los libros")
+    parser.add_argument('--salida', help="Guardar los resultados en este JSON")
+    parser.add_argument('--linea-base', help="JSON de línea base contra el que comparar")
+    parser.add_argument('--guardar-linea-base', help="Guardar los resultados como nueva línea base")
+    parser.add_argument('--umbral', type=float, default=0.25, help="Regresión tolerada (0.25 = +25%%)")
+    parser.add_argument('--minimo-ms', type=float, default=25.0,
+                        help="Solo se comparan etapas de al menos estos ms en la línea base")
+    parser.add_argument('--medir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir_libro(args.medir)))
+        return 0
+
+    os.makedirs(args.fixtures, exist_ok=True)
+    resultados = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeticiones': args.repeticiones,
+        'tamaños': {}
+    }
+    for tamaño in (int(t) for t in args.tamaños.split(',')):
+        print(f"Generando/reutilizando libro de {tamaño} matrículas...", file=sys.stderr)
+        ruta = preparar_libro(args.fixtures, tamaño, args.semilla)
+        print(f"Midiendo {os.path.basename(ruta)} ({args.repeticiones} repeticiones)...", file=sys.stderr)
+        resultados['tamaños'][str(tamaño)] = ejecutar_tamaño(ruta, args.repeticiones)
+
+    imprimir_tabla(resultados)
+
+    for destino in (args.salida, args.guardar_linea_base):
+        if destino:
+            with open(destino, 'w', encoding='utf-8') as f:
+                json.dump(resultados, f, ensure_ascii=False, indent=2)
+            print(f"\n✓ Resultados guardados en {destino}")
+
+    if args.linea_base:
+        with open(args.linea_base, encoding='utf-8') as f:
+            linea_base = json.load(f)
+        regresiones = comparar(resultados, linea_base, args.umbral, args.minimo_ms)
+        if regresiones:
+            print(f"\n✗ {len(regresiones)} regresión(es) de más de {args.umbral:.0%} respecto a {args.linea_base}:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+        print(f"\n✓ Sin regresiones de más de {args.umbral:.0%} respecto a {args.linea_base}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Presupuesto de tiempo de arranque del CLI (python -X importtime)
+
+Ejecuta `validar_lote.py --help` y, si se indica un archivo, `validar_lote.py
+--preflight <archivo>` en procesos nuevos. Mide el tiempo total (mediana de
+varias ejecuciones) y el tiempo de importación por módulo, y falla si se supera
+el presupuesto o si el camino rápido importa módulos pesados.
+
+Uso:
+    python benchmarks/bench_importacion.py [--archivo seed.xlsx] [--presupuesto-ms 200]
+
+Código de salida 1 si algún caso supera el presupuesto o importa un módulo prohibido.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que --help y --preflight no deben importar
+MODULOS_PROHIBIDOS = ['pandas', 'numpy', 'openpyxl', 'plotly', 'pyarrow', 'streamlit',
+                      'validadores', 'validador_core', 'exportador_json']
+
+_LINEA_IMPORTTIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def medir(argumentos, repeticiones: int):
+    """
+    Ejecuta el CLI en procesos nuevos
+
+    Returns:
+        (mediana en ms, {módulo de primer nivel: tiempo acumulado en µs}, módulos importados)
+    """
+    comando = [sys.executable, '-X', 'importtime', os.path.join(RAIZ, 'validar_lote.py')] + argumentos
+    tiempos = []
+    modulos, importados = {}, set()
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        proceso = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        modulos, importados = {}, set()
+        for linea in proceso.stderr.splitlines():
+            coincidencia = _LINEA_IMPORTTIME.match(linea)
+            if not coincidencia:
+                continue
+            importados.add(coincidencia.group(4))
+            # Tiempos solo de los módulos importados directamente (sin sangría extra)
+            if len(coincidencia.group(3)) <= 1:
+                modulos[coincidencia.group(4)] = int(coincidencia.group(2))
+    return statistics.median(tiempos), modulos, importados
+
+
+def revisar(nombre: str, argumentos, presupuesto_ms: float, repeticiones: int) -> bool:
+    mediana, modulos, importados = medir(argumentos, repeticiones)
+    prohibidos = sorted({m.split('.')[0] for m in importados} & set(MODULOS_PROHIBIDOS))
+    correcto = mediana <= presupuesto_ms and not prohibidos
+
+    print(f"{'✓' if correcto else '✗'} {nombre}: {mediana:.0f} ms (presupuesto {presupuesto_ms:.0f} ms)")
+    for modulo, us in sorted(modulos.items(), key=lambda m: -m[1])[:5]:
+        print(f"    {us / 1000:7.1f} ms  {modulo}")
+    if prohibidos:
+        print(f"    ✗ importa módulos pesados: {', '.join(prohibidos)}")
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archivo', help='Archivo .xlsx para medir --preflight')
+    parser.add_argument('--presupuesto-ms', type=float, default=200, help='Tiempo máximo por ejecución')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Ejecuciones por caso (se usa la mediana)')
+    args = parser.parse_args()
+
+    correcto = revisar('--help', ['--help'], args.presupuesto_ms, args.repeticiones)
+    if args.archivo:
+        with tempfile.TemporaryDirectory() as salida:
+            correcto &= revisar('--preflight', ['--preflight', '--jobs', '1', '--salida', salida,
+                                                os.path.abspath(args.archivo)],
+                                args.presupuesto_ms, args.repeticiones)
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark de las columnas de texto: object contra string[pyarrow]
+
+Lee una vez las hojas con más texto (Matrículas, Profesores, Calificaciones
+anuales) de un libro sintético de generador_sintetico.py y, para cada modo de
+tipos_texto.py ('object' y 'pyarrow'), mide:
+    memoria/<hoja>         memoria de la hoja (memory_usage(deep=True)) en MB
+    conversion             convertir_texto de las tres hojas
+    str/<operación>        operaciones .str de los validadores y el exportador
+                           (contains('@'), strip, split(','), comparación, factorize)
+    validacion/<hoja>      el validador de la hoja (vía validar_hoja)
+    exportacion/<método>   export_profesores, export_estudiantes y export_calificaciones
+Se reporta la mediana de --repeticiones corridas de cada etapa y se verifica que
+ambos modos produzcan los mismos mensajes y documentos.
+
+Uso:
+    python benchmarks/bench_texto.py [--matriculas 20000] [--repeticiones 5]
+    python benchmarks/bench_texto.py --libro seed_Pablo_Neruda.xlsx
+
+Requiere pyarrow.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exportador_json import ExcelToJSONExporter  # noqa: E402
+from tipos_texto import convertir_texto  # noqa: E402
+from validador_core import construir_contexto, leer_hojas, validar_hoja  # noqa: E402
+
+HOJAS_TEXTO = ['Matrículas', 'Profesores', 'Calificaciones anuales']
+MODOS = ['object', 'pyarrow']
+
+# Filas de Calificaciones anuales por matrícula en el libro generado
+CALIFICACIONES_POR_ESTUDIANTE = 5
+
+
+def preparar_libro(directorio: str, matriculas: int, semilla: int) -> str:
+    """Libro sintético (se reutiliza si ya existe: la generación es determinista)"""
+    from generador_sintetico import generar_libro
+
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f"bench_{matriculas}_s{semilla}.xlsx")
+    if not os.path.exists(ruta):
+        temporal = ruta + '.tmp.xlsx'
+        generar_libro(temporal, matriculas, matriculas * CALIFICACIONES_POR_ESTUDIANTE, semilla=semilla)
+        os.replace(temporal, ruta)
+    return ruta
+
+
+def operaciones_texto(hojas):
+    """Operaciones .str como las usan los validadores y el exportador: nombre -> función"""
+    matriculas = hojas['Matrículas']
+    profesores = hojas['Profesores']
+    calificaciones = hojas['Calificaciones anuales']
+    return {
+        'contains@': lambda: matriculas['Correo electrónico'].str.contains('@', na=False),
+        'strip': lambda: matriculas['Nombres'].str.strip(),
+        'split,': lambda: profesores['Asignaturas a cargo'].str.split(','),
+        'igualdad': lambda: calificaciones['Aprobó'] == 'Sí',
+        'factorize': lambda: pd.factorize(calificaciones['Nombre del estudiante'])
+    }
+
+
+def medir_modo(hojas_leidas, excel_file, ruta: str, modo: str, repeticiones: int):
+    """
+    Mide un modo sobre copias de las hojas leídas
+
+    Returns:
+        tuple: (etapas {etapa: ms o MB}, mensajes de validación, documentos exportados)
+    """
+    tiempos = {}
+
+    def medir(etapa, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.setdefault(etapa, []).append((time.perf_counter() - inicio) * 1000)
+        return resultado
+
+    for _ in range(repeticiones):
+        hojas = {hoja: df.copy() for hoja, df in hojas_leidas.items()}
+        medir('conversion', lambda: [convertir_texto(hojas[hoja], modo) for hoja in HOJAS_TEXTO])
+        contexto = construir_contexto(excel_file, ruta, hojas)
+
+        for operacion, funcion in operaciones_texto(hojas).items():
+            medir(f'str/{operacion}', funcion)
+
+        mensajes = {}
+        for hoja in HOJAS_TEXTO:
+            resultado = medir(f'validacion/{hoja}', lambda: validar_hoja(hoja, hojas[hoja], contexto))
+            mensajes[hoja] = (resultado['errores'], resultado['advertencias'])
+
+        exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+        documentos = {}
+        for exportar in (exporter.export_profesores, exporter.export_estudiantes, exporter.export_calificaciones):
+            documentos[exportar.__name__] = medir(f'exportacion/{exportar.__name__}', exportar)
+
+    etapas = {f'memoria/{hoja} (MB)': hojas[hoja].memory_usage(deep=True).sum() / 2 ** 20 for hoja in HOJAS_TEXTO}
+    etapas.update({etapa: statistics.median(valores) for etapa, valores in tiempos.items()})
+    return etapas, mensajes, documentos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matriculas', type=int, default=20000,
+                        help="Filas de Matrículas del libro generado (Calificaciones: x5)")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del libro generado")
+    parser.add_argument('--libro', help="Usar este libro en lugar de generar uno")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Corridas por modo (mediana)")
+    parser.add_argument('--fixtures', default=os.path.join(tempfile.gettempdir(), 'seed_bench'),
+                        help="Directorio donde se genera (y reutiliza) el libro")
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    ruta = args.libro or preparar_libro(args.fixtures, args.matriculas, args.semilla)
+    excel_file = pd.ExcelFile(ruta)
+    hojas_leidas = leer_hojas(excel_file, tipo_texto='')
+    faltantes = [hoja for hoja in HOJAS_TEXTO if hoja not in hojas_leidas]
+    if faltantes:
+        print(f"✗ El libro no tiene las hojas: {', '.join(faltantes)}")
+        sys.exit(1)
+    print(f"Libro: {ruta} ({', '.join(f'{hoja}: {len(hojas_leidas[hoja]):,}' for hoja in HOJAS_TEXTO)} filas)")
+
+    resultados = {modo: medir_modo(hojas_leidas, excel_file, ruta, modo, args.repeticiones) for modo in MODOS}
+
+    etapas = list(resultados[MODOS[0]][0])
+    ancho = max(len(etapa) for etapa in etapas)
+    print(f"\n{'etapa (ms)':<{ancho}}  " + '  '.join(f"{modo:>10}" for modo in MODOS) + f"  {'pyarrow/object':>14}")
+    for etapa in etapas:
+        valores = [resultados[modo][0][etapa] for modo in MODOS]
+        proporcion = f"{valores[1] / valores[0]:.2f}x" if valores[0] else '-'
+        print(f"{etapa:<{ancho}}  " + '  '.join(f"{valor:>10.1f}" for valor in valores) + f"  {proporcion:>14}")
+
+    if any(resultados[modo][1:] != resultados[MODOS[0]][1:] for modo in MODOS[1:]):
+        print("\n✗ Los modos NO producen los mismos mensajes y documentos")
+        sys.exit(1)
+    print("\n✓ Mensajes de validación y documentos exportados idénticos en ambos modos")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Prueba de carga del servicio HTTP de validación (servicio_http.py)
+
+Envía N archivos con C clientes concurrentes, espera cada resultado consultando
+el estado y reporta rendimiento (trabajos/s), latencia de punta a punta
+(mediana y p95), tiempo en cola y rechazos por cola llena (503, se reintentan).
+
+Uso:
+    # Contra una instancia ya iniciada
+    python benchmarks/carga_servicio.py seed.xlsx --url http://127.0.0.1:8000 -n 40 -c 8
+
+    # Iniciando una instancia local con 4 workers
+    python benchmarks/carga_servicio.py seed.xlsx --iniciar --workers 4 -n 40 -c 8
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _pedir(url: str, metodo: str = 'GET', datos: bytes = None):
+    solicitud = urllib.request.Request(url, data=datos, method=metodo)
+    if datos is not None:
+        solicitud.add_header('Content-Type', 'application/octet-stream')
+    try:
+        with urllib.request.urlopen(solicitud, timeout=600) as respuesta:
+            return respuesta.status, json.loads(respuesta.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}')
+
+
+def ejecutar_trabajo(url: str, contenido: bytes, nombre: str, exportar: bool, sondeo_s: float):
+    """Envía un archivo y espera su resultado. Returns: dict con tiempos y estado"""
+    inicio = time.perf_counter()
+    rechazos = 0
+    while True:
+        codigo, respuesta = _pedir(f"{url}/trabajos?nombre={quote(nombre)}&exportar={int(exportar)}",
+                                   'POST', contenido)
+        if codigo != 503:
+            break
+        rechazos += 1
+        time.sleep(sondeo_s)
+    if codigo != 202:
+        return {'ok': False, 'rechazos': rechazos, 'error': respuesta, 'latencia_s': time.perf_counter() - inicio}
+
+    id_trabajo = respuesta['id']
+    while True:
+        _, estado = _pedir(f"{url}/trabajos/{id_trabajo}")
+        if estado['estado'] in ('terminado', 'fallo'):
+            break
+        time.sleep(sondeo_s)
+    _pedir(f"{url}/trabajos/{id_trabajo}", 'DELETE')
+    return {
+        'ok': estado['estado'] == 'terminado',
+        'rechazos': rechazos,
+        'latencia_s': time.perf_counter() - inicio,
+        'espera_s': estado['espera_s'],
+        'duracion_s': estado['duracion_s']
+    }
+
+
+def _esperar_servicio(url: str, limite_s: float = 30) -> None:
+    fin = time.time() + limite_s
+    while time.time() < fin:
+        try:
+            _pedir(f"{url}/salud")
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"El servicio no respondió en {url}")
+
+
+def _percentil(valores, p: float) -> float:
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('archivo', help="Archivo .xlsx a enviar")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="URL del servicio")
+    parser.add_argument('-n', '--trabajos', type=int, default=20, help="Total de trabajos")
+    parser.add_argument('-c', '--concurrencia', type=int, default=4, help="Clientes concurrentes")
+    parser.add_argument('--exportar', action='store_true', help="Pedir también la exportación JSON")
+    parser.add_argument('--sondeo', type=float, default=0.05, help="Segundos entre consultas de estado")
+    parser.add_argument('--iniciar', action='store_true', help="Iniciar una instancia local del servicio")
+    parser.add_argument('--workers', type=int, default=None, help="Workers de la instancia iniciada")
+    parser.add_argument('--max-cola', type=int, default=None, help="Cola de la instancia iniciada")
+    args = parser.parse_args()
+
+    with open(args.archivo, 'rb') as f:
+        contenido = f.read()
+    nombre = os.path.basename(args.archivo)
+
+    proceso = None
+    if args.iniciar:
+        puerto = args.url.rsplit(':', 1)[-1].strip('/')
+        comando = [sys.executable, os.path.join(RAIZ, 'servicio_http.py'), '--puerto', puerto]
+        if args.workers:
+            comando += ['--workers', str(args.workers)]
+        if args.max_cola:
+            comando += ['--max-cola', str(args.max_cola)]
+        proceso = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _esperar_servicio(args.url)
+        _, salud = _pedir(f"{args.url}/salud")
+        print(f"Servicio: {salud['workers']} worker(s), cola de {salud['max_cola']}")
+        print(f"Enviando {args.trabajos} trabajo(s) de {nombre} ({len(contenido) / 1024:.0f} KB) "
+              f"con {args.concurrencia} cliente(s)...")
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrencia) as clientes:
+            resultados = list(clientes.map(
+                lambda _: ejecutar_trabajo(args.url, contenido, nombre, args.exportar, args.sondeo),
+                range(args.trabajos)
+            ))
+        total_s = time.perf_counter() - inicio
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+
+    correctos = [r for r in resultados if r['ok']]
+    latencias = [r['latencia_s'] for r in resultados]
+    print(f"\nTotal: {total_s:.2f}s  ->  {len(resultados) / total_s:.2f} trabajos/s")
+    print(f"Correctos: {len(correctos)}/{len(resultados)}  Rechazos 503 (reintentados): "
+          f"{sum(r['rechazos'] for r in resultados)}")
+    print(f"Latencia: mediana {statistics.median(latencias):.2f}s  p95 {_percentil(latencias, 95):.2f}s")
+    if correctos:
+        print(f"En cola: mediana {statistics.median(r['espera_s'] for r in correctos):.2f}s  "
+              f"Validación: mediana {statistics.median(r['duracion_s'] for r in correctos):.2f}s")
+    sys.exit(0 if len(correctos) == len(resultados) else 1)
+
+
+if __name__ == '__main__':
+    main()
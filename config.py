@@ -1,5 +1,7 @@
 # Configuración de validación para archivos Excel de semilla
 
+import os
+
 # Hojas requeridas en el Excel
 HOJAS_REQUERIDAS = [
     "Instrucciones",
@@ -176,3 +178,22 @@ COLUMNAS_REQUERIDAS = {
         "Aprobó"
     ]
 }
+
+# Exportación: nivel de compresión del ZIP (0-9)
+NIVEL_COMPRESION_ZIP = int(os.environ.get('SEED_NIVEL_COMPRESION_ZIP', 6))
+
+# Servicio HTTP de validación (servicio_http.py): procesos de trabajo, trabajos
+# en espera, tamaño máximo de carga y segundos que se conservan los resultados
+SERVICIO_WORKERS = int(os.environ.get('SEED_SERVICIO_WORKERS', min(4, os.cpu_count() or 1)))
+SERVICIO_MAX_COLA = int(os.environ.get('SEED_SERVICIO_MAX_COLA', 32))
+SERVICIO_MAX_MB = int(os.environ.get('SEED_SERVICIO_MAX_MB', 100))
+SERVICIO_RETENCION_S = int(os.environ.get('SEED_SERVICIO_RETENCION_S', 3600))
+
+# Métricas Prometheus de la app web (metricas.py): puerto de /metrics (0 = desactivadas)
+# y dirección de escucha (solo local por defecto)
+METRICAS_PUERTO = int(os.environ.get('SEED_METRICAS_PUERTO', 0))
+METRICAS_HOST = os.environ.get('SEED_METRICAS_HOST', '127.0.0.1')
+
+# Tipo de las columnas de texto al leer las hojas (tipos_texto.py): '' = el de pandas,
+# 'object' o 'pyarrow' (string[pyarrow])
+TIPO_TEXTO = os.environ.get('SEED_TIPO_TEXTO', '')
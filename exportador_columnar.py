@@ -0,0 +1,315 @@
+"""
+Exportador columnar (Parquet / Arrow IPC) de las hojas validadas
+Incluye cada hoja de HOJAS_REQUERIDAS y las tablas derivadas de estudiantes
+y calificaciones, con esquemas declarados para que las cargas posteriores no
+tengan que inferir tipos ni parsear JSON.
+
+Requiere pyarrow (dependencia opcional).
+"""
+import io
+import os
+from datetime import datetime
+from typing import Dict, Any
+
+import pandas as pd
+
+from config import HOJAS_REQUERIDAS, COLUMNAS_REQUERIDAS
+from serializador_json import a_valor_json, nombre_seguro
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional
+    pa = None
+
+# Formatos soportados y extensión de archivo
+FORMATOS_COLUMNARES = {
+    'parquet': '.parquet',
+    'arrow': '.arrow'
+}
+
+# Columnas con tipo distinto de texto (el resto de columnas se declara como string,
+# y las columnas cuyo nombre empieza por "Fecha" como timestamp)
+TIPOS_COLUMNAS = {
+    'Grados': {'Nivel': 'int64'},
+    'Grupos': {'Capacidad': 'int64'}
+}
+
+
+def _requerir_pyarrow():
+    if pa is None:
+        raise ImportError("La exportación columnar requiere instalar pyarrow (pip install pyarrow)")
+
+
+def _a_texto(valor: Any):
+    """Convierte un valor de celda a texto estable (2024.0 -> '2024', NaN -> None)"""
+    valor = a_valor_json(valor)
+    if valor is None:
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    return str(valor).strip()
+
+
+def _tipo_columna(nombre_hoja: str, columna: str) -> str:
+    if columna in TIPOS_COLUMNAS.get(nombre_hoja, {}):
+        return TIPOS_COLUMNAS[nombre_hoja][columna]
+    if str(columna).startswith('Fecha'):
+        return 'timestamp'
+    return 'string'
+
+
+def _arreglo(serie: pd.Series, tipo: str):
+    """Convierte una columna de pandas al arreglo Arrow del tipo declarado"""
+    if tipo == 'int64':
+        numeros = pd.to_numeric(serie, errors='coerce')
+        enteros = numeros.where(numeros.notna() & (numeros % 1 == 0))
+        return pa.array(enteros.astype('Int64'), type=pa.int64(), from_pandas=True)
+    if tipo == 'float64':
+        return pa.array(pd.to_numeric(serie, errors='coerce'), type=pa.float64(), from_pandas=True)
+    if tipo == 'timestamp':
+        fechas = pd.to_datetime(serie, errors='coerce')
+        return pa.array(fechas.astype('datetime64[ms]'), type=pa.timestamp('ms'), from_pandas=True)
+    return pa.array(serie.map(_a_texto).tolist(), type=pa.string(), from_pandas=True)
+
+
+_TIPOS_ARROW = {
+    'string': lambda: pa.string(),
+    'int64': lambda: pa.int64(),
+    'float64': lambda: pa.float64(),
+    'timestamp': lambda: pa.timestamp('ms'),
+    'bool': lambda: pa.bool_()
+}
+
+
+def esquema_hoja(nombre_hoja: str, columnas=None):
+    """
+    Esquema Arrow declarado para una hoja
+
+    Args:
+        nombre_hoja: Nombre de la hoja
+        columnas: Columnas a incluir (por defecto las de COLUMNAS_REQUERIDAS)
+    """
+    _requerir_pyarrow()
+    columnas = columnas if columnas is not None else COLUMNAS_REQUERIDAS[nombre_hoja]
+    return pa.schema([
+        pa.field(str(col), _TIPOS_ARROW[_tipo_columna(nombre_hoja, col)]())
+        for col in columnas
+    ])
+
+
+def tabla_hoja(nombre_hoja: str, df: pd.DataFrame):
+    """
+    Convierte una hoja (leída con header=1) en una tabla Arrow con su esquema declarado
+
+    Las columnas requeridas que falten se agregan vacías para que el esquema sea
+    siempre el mismo; las columnas adicionales se conservan como texto.
+    """
+    _requerir_pyarrow()
+    requeridas = COLUMNAS_REQUERIDAS.get(nombre_hoja, [])
+    extra = [col for col in df.columns if col not in requeridas and not str(col).startswith('Unnamed')]
+    columnas = list(requeridas) + extra
+
+    arreglos = []
+    for col in columnas:
+        serie = df[col] if col in df.columns else pd.Series([None] * len(df), dtype=object)
+        arreglos.append(_arreglo(serie, _tipo_columna(nombre_hoja, col)))
+    return pa.Table.from_arrays(arreglos, schema=esquema_hoja(nombre_hoja, columnas))
+
+
+def tabla_sede_principal(df: pd.DataFrame):
+    """Convierte la hoja transpuesta 'Sede principal' (leída con header=None) en pares Campo/Valor"""
+    _requerir_pyarrow()
+    campos, valores = [], []
+    for _, row in df.iterrows():
+        etiqueta = _a_texto(row.iloc[0])
+        if etiqueta is None or etiqueta.upper() == 'SEDE PRINCIPAL':
+            continue
+        campos.append(etiqueta)
+        valores.append(_a_texto(row.iloc[1]) if len(row) > 1 else None)
+    esquema = pa.schema([pa.field('Campo', pa.string()), pa.field('Valor', pa.string())])
+    return pa.Table.from_arrays([pa.array(campos, pa.string()), pa.array(valores, pa.string())], schema=esquema)
+
+
+# Esquemas de las tablas derivadas del exportador JSON
+ESQUEMA_ESTUDIANTES = [
+    ('Nombres', 'string'),
+    ('Apellidos', 'string'),
+    ('Correo', 'string'),
+    ('Tipo de documento', 'string'),
+    ('Numero de documento', 'string'),
+    ('Grado', 'int64'),
+    ('Sexo', 'string'),
+    ('Fecha de nacimiento', 'string'),
+    ('Direccion', 'string'),
+    ('Tipo de sangre', 'string'),
+    ('NOMBRE SEDE', 'string'),
+    ('AULA DE ESTUDIO', 'string'),
+    ('CEDULA ACUDIENTE', 'string'),
+    ('Telefono', 'string'),
+    ('CURSO', 'string')
+]
+
+ESQUEMA_CALIFICACIONES = [
+    ('Clave', 'string'),
+    ('Nombre del estudiante', 'string'),
+    ('Año escolar', 'string'),
+    ('Sede asignada', 'string'),
+    ('Tipo de nota', 'string'),
+    ('Aprobó', 'string'),
+    ('Nombre de la asignatura', 'string'),
+    ('Promedio anual', 'float64'),
+    ('Promedio anual (texto)', 'string')
+]
+
+
+def _tabla_desde_registros(registros, esquema):
+    df = pd.DataFrame.from_records(registros, columns=[nombre for nombre, _ in esquema])
+    arreglos = [_arreglo(df[nombre], tipo) for nombre, tipo in esquema]
+    return pa.Table.from_arrays(arreglos, schema=pa.schema([
+        pa.field(nombre, _TIPOS_ARROW[tipo]()) for nombre, tipo in esquema
+    ]))
+
+
+def tabla_estudiantes(exporter):
+    """Tabla derivada de estudiantes (mismos campos que estudiantes.json)"""
+    _requerir_pyarrow()
+    return _tabla_desde_registros(exporter.iter_estudiantes(), ESQUEMA_ESTUDIANTES)
+
+
+def tabla_calificaciones(exporter):
+    """Tabla derivada de calificaciones: una fila por estudiante (clave) y asignatura"""
+    _requerir_pyarrow()
+
+    def filas():
+        for clave, datos in exporter.iter_calificaciones():
+            for calificacion in datos['calificaciones']:
+                yield {
+                    'Clave': clave,
+                    'Nombre del estudiante': datos['Nombre del estudiante'],
+                    'Año escolar': datos['Año escolar'],
+                    'Sede asignada': datos['Sede asignada'],
+                    'Tipo de nota': datos['Tipo de nota'],
+                    'Aprobó': datos['Aprobó'],
+                    'Nombre de la asignatura': calificacion['Nombre de la asignatura'],
+                    'Promedio anual': calificacion['Promedio anual'],
+                    'Promedio anual (texto)': calificacion['Promedio anual']
+                }
+
+    return _tabla_desde_registros(filas(), ESQUEMA_CALIFICACIONES)
+
+
+def construir_tablas(excel_file: pd.ExcelFile = None, exporter=None) -> Dict[str, Any]:
+    """
+    Construye todas las tablas columnares
+    
+    Args:
+        excel_file: pd.ExcelFile validado (opcional si se indica exporter)
+        exporter: ExcelToJSONExporter a reutilizar para las tablas derivadas (opcional);
+            sin excel_file, las hojas se toman del propio exporter (sin volver a leer el archivo)
+        
+    Returns:
+        Dict nombre_tabla -> pyarrow.Table (una por hoja + 'derivado_estudiantes'
+        y 'derivado_calificaciones')
+    """
+    _requerir_pyarrow()
+    from exportador_json import ExcelToJSONExporter
+    
+    exporter = exporter or ExcelToJSONExporter(excel_file)
+    libro = excel_file if excel_file is not None else exporter
+    
+    tablas = {}
+    for hoja in HOJAS_REQUERIDAS:
+        if hoja == "Instrucciones" or hoja not in libro.sheet_names:
+            continue
+        if hoja == "Sede principal":
+            tablas[nombre_seguro(hoja)] = tabla_sede_principal(libro.parse(hoja, header=None))
+        else:
+            tablas[nombre_seguro(hoja)] = tabla_hoja(hoja, libro.parse(hoja, header=1))
+    
+    tablas['derivado_estudiantes'] = tabla_estudiantes(exporter)
+    tablas['derivado_calificaciones'] = tabla_calificaciones(exporter)
+    return tablas
+
+
+def escribir_tabla(tabla, destino, formato: str = 'parquet') -> None:
+    """Escribe una tabla Arrow en una ruta o archivo binario abierto"""
+    _requerir_pyarrow()
+    if formato == 'parquet':
+        pq.write_table(tabla, destino, compression='zstd')
+    elif formato == 'arrow':
+        feather.write_feather(tabla, destino, compression='zstd')
+    else:
+        raise ValueError(f"Formato columnar desconocido: {formato}. Opciones: {', '.join(FORMATOS_COLUMNARES)}")
+
+
+def escribir_zip_columnar(excel_file: pd.ExcelFile, zip_file, formato: str = 'parquet', exporter=None) -> None:
+    """
+    Escribe todas las tablas columnares en un ZIP abierto (entradas sin recomprimir)
+
+    Args:
+        excel_file: pd.ExcelFile validado (None = usar las hojas del exporter)
+        zip_file: zipfile.ZipFile abierto en modo escritura
+        formato: 'parquet' o 'arrow'
+        exporter: ExcelToJSONExporter a reutilizar (opcional)
+    """
+    import zipfile
+    for nombre, tabla in construir_tablas(excel_file, exporter).items():
+        buffer = io.BytesIO()
+        escribir_tabla(tabla, buffer, formato)
+        # Parquet/Arrow ya van comprimidos con zstd
+        zip_file.writestr(f'{nombre}{FORMATOS_COLUMNARES[formato]}', buffer.getvalue(),
+                          compress_type=zipfile.ZIP_STORED)
+
+
+def _guardar_tablas(tablas: Dict[str, Any], output_dir: str, formato: str) -> Dict[str, str]:
+    """Escribe cada tabla como <nombre><extensión> en output_dir y devuelve sus rutas"""
+    os.makedirs(output_dir, exist_ok=True)
+    rutas = {}
+    for nombre, tabla in tablas.items():
+        ruta = os.path.join(output_dir, f'{nombre}{FORMATOS_COLUMNARES[formato]}')
+        escribir_tabla(tabla, ruta, formato)
+        rutas[nombre] = ruta
+    return rutas
+
+
+def _validar_formato(formato: str) -> None:
+    _requerir_pyarrow()
+    if formato not in FORMATOS_COLUMNARES:
+        raise ValueError(f"Formato columnar desconocido: {formato}. Opciones: {', '.join(FORMATOS_COLUMNARES)}")
+
+
+def export_columnar(exporter, output_dir: str = 'output/columnar', formato: str = 'parquet'):
+    """
+    Exporta las hojas y tablas derivadas de un exportador ya creado (ej. con las
+    hojas validadas), sin volver a leer el archivo
+
+    Args:
+        exporter: ExcelToJSONExporter del que se toman hojas y tablas derivadas
+        output_dir: Directorio de salida
+        formato: 'parquet' o 'arrow'
+
+    Returns:
+        Dict con rutas de los archivos generados
+    """
+    _validar_formato(formato)
+    return _guardar_tablas(construir_tablas(exporter=exporter), output_dir, formato)
+
+
+def export_excel_to_columnar(excel_path: str, output_dir: str = 'output/columnar', formato: str = 'parquet'):
+    """
+    Exporta las hojas de un archivo Excel y las tablas derivadas a Parquet o Arrow IPC
+
+    Args:
+        excel_path: Ruta al archivo Excel
+        output_dir: Directorio de salida
+        formato: 'parquet' o 'arrow'
+
+    Returns:
+        Dict con rutas de los archivos generados
+    """
+    _validar_formato(formato)
+    return _guardar_tablas(construir_tablas(pd.ExcelFile(excel_path)), output_dir, formato)
@@ -0,0 +1,231 @@
+"""
+Exportación incremental (delta) contra una exportación anterior
+Compara registro a registro (por clave natural y hash del contenido) la
+exportación actual con los JSON de una exportación previa y escribe solo los
+registros insertados, actualizados y eliminados, junto con un resumen.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+import pandas as pd
+
+from exportador_json import ExcelToJSONExporter
+from serializador_json import iter_valor_json, escribir_json, default_json
+
+
+def _clave_calificacion(clave: str, datos: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Obtiene (documento, año escolar, sede) de una entrada de calificaciones_anuales.json"""
+    año = str(datos.get('Año escolar', ''))
+    sede = str(datos.get('Sede asignada', ''))
+    sufijo = f"_{año}_{sede}"
+    documento = clave[:-len(sufijo)] if clave.endswith(sufijo) else clave
+    return documento, año, sede
+
+
+# Entidades comparadas: documento de origen, cómo obtener sus registros y su clave natural
+ENTIDADES_DELTA = {
+    'admins': {
+        'documento': 'config',
+        'registros': lambda doc: doc.get('admins', []),
+        'clave': lambda r: (str(r.get('documentNumber', '')),)
+    },
+    'coordinators': {
+        'documento': 'config',
+        'registros': lambda doc: doc.get('coordinators', []),
+        'clave': lambda r: (str(r.get('documentNumber', '')),)
+    },
+    'profesores': {
+        'documento': 'profesores',
+        'registros': lambda registros: registros,
+        'clave': lambda r: (str(r.get('Numero de documento', '')),)
+    },
+    'estudiantes': {
+        'documento': 'estudiantes',
+        'registros': lambda registros: registros,
+        'clave': lambda r: (str(r.get('Numero de documento', '')),)
+    },
+    'calificaciones_anuales': {
+        'documento': 'calificaciones_anuales',
+        # Recibe pares (clave, datos); se conserva la clave original del JSON en 'Clave'
+        'registros': lambda pares: ({'Clave': clave, **datos} for clave, datos in pares),
+        'clave': lambda r: _clave_calificacion(r['Clave'], r)
+    }
+}
+
+# Secciones de config que no son listas de registros y se comparan completas
+SECCIONES_CONFIG_EXCLUIDAS = {'admins', 'coordinators'}
+
+
+def hash_registro(registro: Any) -> str:
+    """Hash estable del contenido de un registro (independiente del orden de las claves)"""
+    canonico = json.dumps(registro, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=default_json)
+    return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+
+def _indexar(registros: Iterable[Dict[str, Any]], clave: Callable) -> Tuple[Dict[tuple, Tuple[str, Dict]], int]:
+    """
+    Indexa registros por clave natural -> (hash, registro)
+
+    Si una clave se repite, las siguientes apariciones se distinguen con su
+    número de ocurrencia para no perder registros.
+    """
+    indice = {}
+    ocurrencias = {}
+    duplicadas = 0
+    for registro in registros:
+        k = clave(registro)
+        n = ocurrencias.get(k, 0)
+        ocurrencias[k] = n + 1
+        if n:
+            duplicadas += 1
+            k = k + (f'#{n + 1}',)
+        indice[k] = (hash_registro(registro), registro)
+    return indice, duplicadas
+
+
+def _clave_a_dict(entidad: str, clave: tuple) -> Dict[str, Any]:
+    """Representación legible de una clave natural para la lista de eliminados"""
+    if entidad == 'calificaciones_anuales':
+        resultado = {'Numero de documento': clave[0], 'Año escolar': clave[1], 'Sede asignada': clave[2]}
+        extra = clave[3:]
+    else:
+        resultado = {'Numero de documento': clave[0]}
+        extra = clave[1:]
+    if extra:
+        resultado['Ocurrencia'] = extra[0]
+    return resultado
+
+
+def comparar_registros(entidad: str, anteriores: Iterable[Dict], actuales: Iterable[Dict]) -> Dict[str, Any]:
+    """
+    Compara dos colecciones de registros de una entidad
+
+    Returns:
+        Dict con 'insertados', 'actualizados', 'eliminados' y 'resumen'
+    """
+    clave = ENTIDADES_DELTA[entidad]['clave']
+    indice_anterior, duplicadas_anterior = _indexar(anteriores, clave)
+    indice_actual, duplicadas_actual = _indexar(actuales, clave)
+
+    insertados, actualizados = [], []
+    sin_cambios = 0
+    for k, (hash_actual, registro) in indice_actual.items():
+        previo = indice_anterior.get(k)
+        if previo is None:
+            insertados.append(registro)
+        elif previo[0] != hash_actual:
+            actualizados.append(registro)
+        else:
+            sin_cambios += 1
+    eliminados = [_clave_a_dict(entidad, k) for k in indice_anterior if k not in indice_actual]
+
+    return {
+        'insertados': insertados,
+        'actualizados': actualizados,
+        'eliminados': eliminados,
+        'resumen': {
+            'insertados': len(insertados),
+            'actualizados': len(actualizados),
+            'eliminados': len(eliminados),
+            'sin_cambios': sin_cambios,
+            'claves_duplicadas': duplicadas_anterior + duplicadas_actual
+        }
+    }
+
+
+def _leer_documento(directorio: str, documento: str):
+    ruta = os.path.join(directorio, f'{documento}.json')
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _normalizar(valor: Any) -> Any:
+    """Pasa un valor por JSON para compararlo igual que el leído del disco (ej. claves int -> str)"""
+    return json.loads(json.dumps(valor, ensure_ascii=False, default=default_json))
+
+
+def export_delta(exporter: ExcelToJSONExporter, directorio_anterior: str, output_dir: str = 'output/delta') -> Dict[str, Any]:
+    """
+    Genera la exportación delta respecto a una exportación anterior
+
+    Escribe en output_dir un archivo <entidad>.json por entidad con
+    'insertados', 'actualizados' y 'eliminados', config.json con las
+    secciones de configuración que cambiaron y resumen.json.
+
+    Args:
+        exporter: ExcelToJSONExporter del archivo actual
+        directorio_anterior: Directorio con los JSON de la exportación anterior
+        output_dir: Directorio de salida del delta
+
+    Returns:
+        Dict con el resumen por entidad
+    """
+    if not os.path.isdir(directorio_anterior):
+        raise FileNotFoundError(f"No existe el directorio de la exportación anterior: {directorio_anterior}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Fuentes de registros actuales (generadores: cada documento se construye al compararlo)
+    config_actual = _normalizar(exporter.export_config())
+    fuentes_actuales = {
+        'config': lambda: config_actual,
+        'profesores': exporter.export_profesores,
+        'estudiantes': exporter.iter_estudiantes,
+        'calificaciones_anuales': exporter.iter_calificaciones
+    }
+
+    resumen = {
+        'generado': datetime.now().isoformat(timespec='seconds'),
+        'exportacion_anterior': os.path.abspath(directorio_anterior),
+        'entidades': {}
+    }
+
+    for entidad, definicion in ENTIDADES_DELTA.items():
+        documento = definicion['documento']
+        anterior = _leer_documento(directorio_anterior, documento)
+        if anterior is None:
+            anterior = {} if documento in ('config', 'calificaciones_anuales') else []
+        if documento == 'calificaciones_anuales':
+            anterior = anterior.items()
+        anteriores = definicion['registros'](anterior)
+        actuales = definicion['registros'](fuentes_actuales[documento]())
+
+        delta = comparar_registros(entidad, anteriores, actuales)
+        resumen['entidades'][entidad] = delta.pop('resumen')
+        with open(os.path.join(output_dir, f'{entidad}.json'), 'w', encoding='utf-8') as f:
+            escribir_json(iter_valor_json(delta), f)
+
+    # Secciones de config (sede principal, grados, cursos, ...) que cambiaron
+    config_anterior = _leer_documento(directorio_anterior, 'config') or {}
+    secciones = {
+        seccion: valor for seccion, valor in config_actual.items()
+        if seccion not in SECCIONES_CONFIG_EXCLUIDAS and config_anterior.get(seccion) != valor
+    }
+    resumen['config'] = {'secciones_modificadas': sorted(secciones)}
+    with open(os.path.join(output_dir, 'config.json'), 'w', encoding='utf-8') as f:
+        escribir_json(iter_valor_json(secciones), f)
+
+    with open(os.path.join(output_dir, 'resumen.json'), 'w', encoding='utf-8') as f:
+        escribir_json(iter_valor_json(resumen), f)
+    return resumen
+
+
+def export_excel_to_delta(excel_path: str, directorio_anterior: str, output_dir: str = 'output/delta'):
+    """
+    Exporta solo los cambios de un archivo Excel respecto a una exportación anterior
+
+    Args:
+        excel_path: Ruta al archivo Excel
+        directorio_anterior: Directorio con los JSON de la exportación anterior
+        output_dir: Directorio de salida del delta
+
+    Returns:
+        Dict con el resumen por entidad
+    """
+    excel_file = pd.ExcelFile(excel_path)
+    exporter = ExcelToJSONExporter(excel_file)
+    return export_delta(exporter, directorio_anterior, output_dir)
@@ -1,18 +1,293 @@
 """
 Exportador de Excel a formato JSON compatible con ModularSchoolConfig
 """
+import numpy as np
 import pandas as pd
-import json
+import threading
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from instrumentacion import instrumentar, medir
+from tipos_texto import convertir_texto
+from serializador_json import (
+    iter_lista_json, iter_objeto_json, iter_valor_json, escribir_json, escribir_json_zip,
+    obtener_serializador, a_valor_json,
+    EscritorNDJSON, describir_archivo
+)
+
+# Documentos generados por el exportador (cada uno se guarda como <nombre>.json)
+DOCUMENTOS = ['config', 'profesores', 'estudiantes', 'calificaciones_anuales']
+
+# Tablas de consulta derivadas que el exportador memoiza y las hojas de las que dependen
+TABLAS_DERIVADAS = {
+    'grados': ('Grados',),
+    'niveles_grado': ('Grados',),
+    'nivel_por_nombre_grado': ('Grados',),
+    'asignaturas_validas': ('Asignaturas',),
+    'asignaturas_por_area': ('Asignaturas',)
+}
+
+
+def _mapear_valores_unicos(serie: pd.Series, funcion) -> pd.Series:
+    """
+    Aplica funcion una vez por valor distinto de la serie (en lugar de una vez por fila)
+    
+    En columnas object con tipos mezclados se aplica fila a fila, porque factorize
+    trataría como iguales valores como 1, 1.0 y True cuyo str() es distinto.
+    """
+    nulos = serie.isna()
+    if serie.dtype == object:
+        mezclada = pd.api.types.infer_dtype(serie, skipna=True) not in ('string', 'empty')
+        if mezclada or not all(isinstance(v, float) for v in serie[nulos]):
+            return serie.map(funcion)
+    codigos, unicos = pd.factorize(serie)
+    # El código -1 (valor nulo) toma el último elemento
+    valor_nulo = serie[nulos].astype(object).iloc[0] if nulos.any() else None
+    resultados = np.array([funcion(v) for v in unicos] + [funcion(valor_nulo)], dtype=object)
+    return pd.Series(resultados[codigos], index=serie.index, dtype=object)
+
+
+def _columna(df: pd.DataFrame, columna: str, funcion, defecto) -> pd.Series:
+    """Equivalente vectorizado de funcion(row.get(columna)) para todas las filas"""
+    if columna not in df.columns:
+        return pd.Series(defecto, index=df.index, dtype=object)
+    return _mapear_valores_unicos(df[columna], funcion)
+
+
+def _texto(valor) -> str:
+    return str(valor).strip()
+
+
+def _año_texto(valor) -> str:
+    """Año escolar como texto sin decimales (2024.0 -> '2024')"""
+    if isinstance(valor, (int, float)) and not pd.isna(valor):
+        return str(int(valor))
+    return str(valor).strip()
+
+
+def _texto_o_none(valor):
+    return str(valor) if pd.notna(valor) else None
+
+
+def agrupar_calificaciones(df: pd.DataFrame, asignaturas_validas: set) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Agrupa la hoja Calificaciones anuales por estudiante (documento + año escolar + sede)
+    
+    Pasos vectorizados: normalizar columnas -> filtrar asignaturas válidas ->
+    drop_duplicates por (estudiante, asignatura) conservando el último valor -> groupby.
+    
+    Semántica:
+    - Los datos del estudiante (nombre, tipo de nota, aprobó) salen de su primera fila.
+    - Cada asignatura aparece una vez, en el orden de su primera aparición, con el
+      último promedio registrado.
+    - La clave es el número de documento si el estudiante tiene una sola
+      combinación año/sede, o "documento_año_sede" si tiene varias.
+    
+    Args:
+        df: Hoja Calificaciones anuales (header=1)
+        asignaturas_validas: Asignaturas permitidas (vacío = no filtrar)
+        
+    Yields:
+        Pares (clave, datos del estudiante con sus calificaciones)
+    """
+    if df.empty:
+        return
+    
+    datos = pd.DataFrame({
+        'asignatura': _columna(df, 'Nombre de la asignatura', _texto, ''),
+        'año': _columna(df, 'Año escolar', _año_texto, ''),
+        'documento': _columna(df, 'Número de documento del estudiante', _texto, ''),
+        'nombre': _columna(df, 'Nombre del estudiante', _texto, ''),
+        'sede': _columna(df, 'Sede asignada', _texto, ''),
+        'tipo_nota': _columna(df, 'Tipo de nota', _texto, ''),
+        'aprobo': _columna(df, 'Aprobó', _texto_o_none, None),
+        # Convertir escalares numpy y NaN a tipos nativos (NaN -> null)
+        'promedio': _columna(df, 'Promedio anual', a_valor_json, None)
+    })
+    
+    # Filtrar registros con asignaturas inválidas
+    if asignaturas_validas:
+        datos = datos[datos['asignatura'].isin(asignaturas_validas)]
+        if datos.empty:
+            return
+    
+    datos = datos.reset_index(drop=True)
+    datos['clave_base'] = datos['documento'] + '_' + datos['año'] + '_' + datos['sede']
+    datos['grupo'] = datos.groupby('clave_base', sort=False).ngroup()
+    
+    # Orden de cada asignatura dentro del estudiante = primera aparición; valor = última
+    datos['orden_asignatura'] = datos.groupby(['grupo', 'asignatura'], sort=False).ngroup()
+    ultimas = datos.drop_duplicates(['grupo', 'asignatura'], keep='last').sort_values(
+        ['grupo', 'orden_asignatura'], kind='stable'
+    )
+    
+    # Una fila por estudiante (la primera) con sus campos descriptivos
+    estudiantes = datos.drop_duplicates('grupo', keep='first').set_index('grupo')
+    grupos_por_documento = estudiantes.groupby('documento', sort=False)['documento'].transform('size')
+    # Los estudiantes se emiten agrupados por documento, en orden de primera aparición
+    estudiantes['orden_documento'] = estudiantes.groupby('documento', sort=False).ngroup()
+    estudiantes['clave'] = estudiantes['documento'].where(
+        grupos_por_documento == 1,
+        estudiantes['documento'] + '_' + estudiantes['año'] + '_' + estudiantes['sede']
+    )
+    estudiantes = estudiantes.sort_values('orden_documento', kind='stable')
+    
+    # Listas de calificaciones por grupo
+    calificaciones = {}
+    for grupo, asignatura, promedio in zip(ultimas['grupo'].tolist(), ultimas['asignatura'].tolist(),
+                                           ultimas['promedio'].tolist()):
+        calificaciones.setdefault(grupo, []).append({
+            'Nombre de la asignatura': asignatura,
+            'Promedio anual': promedio
+        })
+    
+    columnas = ['clave', 'nombre', 'año', 'sede', 'tipo_nota', 'aprobo']
+    for grupo, (clave, nombre, año, sede, tipo_nota, aprobo) in zip(
+            estudiantes.index.tolist(), estudiantes[columnas].itertuples(index=False, name=None)):
+        yield clave, {
+            'Nombre del estudiante': nombre,
+            'Año escolar': año,
+            'Sede asignada': sede,
+            'Tipo de nota': tipo_nota,
+            'Aprobó': aprobo,
+            'calificaciones': calificaciones[grupo]
+        }
+
+
+def _celda_texto(valor):
+    """Texto de una celda como lo da read_excel(dtype=str) (NaN se conserva)"""
+    if pd.isna(valor):
+        return np.nan
+    if isinstance(valor, float) and valor.is_integer():
+        # read_excel entrega los números enteros como int; solo se ven como float
+        # cuando la columna tiene vacíos
+        return str(int(valor))
+    return str(valor)
+
+
+def _texto_o_vacio(valor) -> str:
+    """Texto de una celda ('' si está vacía); los enteros leídos como float pierden el '.0'"""
+    texto = _celda_texto(valor)
+    return '' if pd.isna(texto) else texto.strip()
+
+
+def _fecha_texto(valor) -> str:
+    """Fecha de una celda como AAAA-MM-DD si Excel la guardó como fecha; si no, su texto"""
+    if isinstance(valor, datetime):
+        return valor.strftime('%Y-%m-%d')
+    return _texto_o_vacio(valor)
+
+
+def _hoja_como_texto(df: pd.DataFrame) -> pd.DataFrame:
+    """Equivalente a volver a leer la hoja con dtype=str"""
+    return df.apply(lambda columna: columna.astype(object).map(_celda_texto)).astype(object)
+
+
+def _hoja_sin_encabezado(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reconstruye una hoja leída con header=None a partir de la leída con header=1
+    
+    La fila de encabezado vuelve a ser la primera fila de datos; la fila de título
+    (la primera de la hoja, ej. "SEDE PRINCIPAL") no forma parte de la lectura con header=1.
+    """
+    encabezado = [np.nan if str(col).startswith('Unnamed') else col for col in df.columns]
+    return pd.DataFrame([encabezado] + df.astype(object).values.tolist())
 
 
 class ExcelToJSONExporter:
     """Convierte un archivo Excel validado a formato JSON para el backend"""
     
-    def __init__(self, excel_file: pd.ExcelFile):
+    def __init__(self, excel_file: pd.ExcelFile = None, serializador: str = 'json',
+                 hojas: Dict[str, pd.DataFrame] = None, contexto: Dict[str, Any] = None):
+        """
+        Args:
+            excel_file: pd.ExcelFile con el archivo validado
+            serializador: Codificador JSON ('json', 'orjson' o 'auto'), ver serializador_json
+            hojas: DataFrames ya leídos y validados (validador_core.leer_hojas); si se
+                indican, la exportación no vuelve a leer el archivo
+            contexto: Catálogo de referencia de validador_core.construir_contexto
+                (se reutilizan las asignaturas válidas)
+        """
+        if excel_file is None and hojas is None:
+            raise ValueError("Se requiere excel_file o hojas")
         self.excel_file = excel_file
+        self.hojas = hojas
+        self.contexto = contexto or {}
+        self.serializador = obtener_serializador(serializador)
+        # openpyxl no admite lecturas concurrentes del mismo libro
+        self._parse_lock = threading.Lock()
+        # Tablas derivadas memoizadas: nombre -> (versiones de sus hojas, valor)
+        self._tablas = {}
+        self._versiones_hojas = {}
+        self._tablas_lock = threading.RLock()
+    
+    @property
+    def sheet_names(self) -> List[str]:
+        """Hojas disponibles (del archivo o de los DataFrames recibidos)"""
+        if self.hojas is not None:
+            return list(self.hojas)
+        return self.excel_file.sheet_names
+    
+    def parse(self, hoja: str, header=1, dtype=None) -> pd.DataFrame:
+        """
+        Lee una hoja (misma interfaz que pd.ExcelFile.parse; seguro para varios hilos)
+        
+        Con DataFrames ya leídos (header=1) no hay lectura del archivo: dtype=str y
+        header=None se obtienen a partir de ellos. Al leer del archivo, las columnas
+        de texto toman el tipo de config.TIPO_TEXTO (ver tipos_texto.py).
+        """
+        if self.hojas is None:
+            with self._parse_lock:
+                df = self.excel_file.parse(hoja, header=header, dtype=dtype)
+            return df if dtype is str else convertir_texto(df)
+        
+        df = self.hojas[hoja]
+        if header is None:
+            return _hoja_sin_encabezado(df)
+        if header != 1:
+            raise ValueError(f"Solo se pueden reutilizar hojas leídas con header=1: {hoja}")
+        return _hoja_como_texto(df) if dtype is str else df
+    
+    def _tabla(self, nombre: str) -> Any:
+        """
+        Devuelve una tabla de TABLAS_DERIVADAS, construyéndola solo la primera vez
+        o cuando cambió alguna de sus hojas (no modificar el valor devuelto)
+        """
+        with self._tablas_lock:
+            versiones = tuple(self._versiones_hojas.get(hoja, 0) for hoja in TABLAS_DERIVADAS[nombre])
+            entrada = self._tablas.get(nombre)
+            if entrada is None or entrada[0] != versiones:
+                with medir('tabla_derivada', nombre):
+                    entrada = (versiones, getattr(self, f'_construir_{nombre}')())
+                self._tablas[nombre] = entrada
+            return entrada[1]
+    
+    def invalidar(self, hoja: str = None) -> None:
+        """
+        Descarta las tablas derivadas de una hoja (o todas si hoja es None)
+        
+        Args:
+            hoja: Nombre de la hoja que cambió
+        """
+        with self._tablas_lock:
+            if hoja is None:
+                self._tablas.clear()
+            else:
+                self._versiones_hojas[hoja] = self._versiones_hojas.get(hoja, 0) + 1
+    
+    def actualizar_hoja(self, hoja: str, df: pd.DataFrame) -> None:
+        """
+        Reemplaza el DataFrame de una hoja e invalida las tablas derivadas de ella
         
+        Args:
+            hoja: Nombre de la hoja
+            df: Nuevo DataFrame (header=1)
+        """
+        if self.hojas is None:
+            raise ValueError("actualizar_hoja requiere un exportador creado con hojas=...")
+        self.hojas[hoja] = df
+        self.invalidar(hoja)
+    
+    @instrumentar('exportacion')
     def export_all(self) -> Dict[str, Any]:
         """
         Exporta todas las hojas a JSONs separados
@@ -27,6 +302,7 @@ class ExcelToJSONExporter:
             'calificaciones_anuales': self.export_calificaciones()
         }
     
+    @instrumentar('exportacion')
     def export_config(self) -> Dict[str, Any]:
         """Exporta la configuración principal de la escuela"""
         config = {
@@ -48,11 +324,11 @@ class ExcelToJSONExporter:
     
     def _export_sede_principal(self) -> Dict[str, Any]:
         """Exporta datos de la sede principal desde estructura transpuesta"""
-        if 'Sede principal' not in self.excel_file.sheet_names:
+        if 'Sede principal' not in self.sheet_names:
             return self._get_default_school()
         
         # Leer sin header para acceder a todos los datos
-        df = self.excel_file.parse('Sede principal', header=None)
+        df = self.parse('Sede principal', header=None)
         if df.empty:
             return self._get_default_school()
         
@@ -101,10 +377,10 @@ class ExcelToJSONExporter:
     
     def _export_sedes(self) -> List[Dict[str, Any]]:
         """Exporta sedes/campus con estructura exacta del ejemplo"""
-        if 'Sedes' not in self.excel_file.sheet_names:
+        if 'Sedes' not in self.sheet_names:
             return []
         
-        df = self.excel_file.parse('Sedes', header=1)
+        df = self.parse('Sedes', header=1)
         
         # Usar todos los grados del sistema
         todos_los_grados = self._export_grados()
@@ -148,11 +424,11 @@ class ExcelToJSONExporter:
     
     def _export_cursos_academicos(self) -> List[Dict[str, Any]]:
         """Exporta cursos académicos con sus períodos"""
-        if 'Cursos académicos' not in self.excel_file.sheet_names:
+        if 'Cursos académicos' not in self.sheet_names:
             return []
         
-        df_cursos = self.excel_file.parse('Cursos académicos', header=1)
-        df_periodos = self.excel_file.parse('Periodos', header=1) if 'Periodos' in self.excel_file.sheet_names else pd.DataFrame()
+        df_cursos = self.parse('Cursos académicos', header=1)
+        df_periodos = self.parse('Periodos', header=1) if 'Periodos' in self.sheet_names else pd.DataFrame()
         
         cursos = []
         for _, row in df_cursos.iterrows():
@@ -193,19 +469,29 @@ class ExcelToJSONExporter:
     
     def _export_grados(self) -> List[int]:
         """Exporta lista de niveles de grados"""
-        if 'Grados' not in self.excel_file.sheet_names:
+        return list(self._tabla('niveles_grado'))
+    
+    def _construir_grados(self) -> Optional[pd.DataFrame]:
+        """Hoja Grados leída una sola vez para todas las tablas que dependen de ella"""
+        if 'Grados' not in self.sheet_names:
+            return None
+        return self.parse('Grados', header=1)
+    
+    def _construir_niveles_grado(self) -> List[int]:
+        """Niveles de grado distintos y ordenados de la hoja Grados"""
+        df = self._tabla('grados')
+        if df is None:
             return []
         
-        df = self.excel_file.parse('Grados', header=1)
         grados = df['Nivel'].unique().tolist() if 'Nivel' in df.columns else []
         return sorted([int(g) for g in grados if pd.notna(g)])
     
     def _export_enriched_grades(self) -> List[Dict[str, Any]]:
         """Exporta grados enriquecidos con gradeType e isCycleCompletion"""
-        if 'Grados' not in self.excel_file.sheet_names:
+        df = self._tabla('grados')
+        if df is None:
             return []
         
-        df = self.excel_file.parse('Grados', header=1)
         enriched = []
         
         for _, row in df.iterrows():
@@ -232,35 +518,13 @@ class ExcelToJSONExporter:
         
         return sorted(enriched, key=lambda x: x['level'])
     
-    def _get_grades_por_sede(self) -> Dict[str, List[int]]:
-        """Obtiene los niveles de grados disponibles por sede desde Grupos"""
-        if 'Grupos' not in self.excel_file.sheet_names:
-            return {}
-        
-        # Forzar lectura como texto para preservar nombres de grupo (ej. '6-1')
-        df = self.excel_file.parse('Grupos', header=1, dtype=str).fillna('')
-        grades_por_sede = {}
-        
-        for _, row in df.iterrows():
-            sede = str(row.get('Sedes asociadas', '')).strip()
-            nombre_grado = str(row.get('Nombre del grado', '')).strip()
-            nivel = self._extract_grade_level(nombre_grado)
-            
-            if nivel is not None:
-                if sede not in grades_por_sede:
-                    grades_por_sede[sede] = set()
-                grades_por_sede[sede].add(nivel)
-        
-        # Convertir sets a listas ordenadas
-        return {sede: sorted(list(grados)) for sede, grados in grades_por_sede.items()}
-    
     def _export_grupos(self) -> Dict[str, Dict[int, List[str]]]:
         """Exporta grupos/aulas organizados por sede y nivel de grado"""
-        if 'Grupos' not in self.excel_file.sheet_names:
+        if 'Grupos' not in self.sheet_names:
             return {}
         
         # Forzar lectura como texto para preservar nombres de grupo (ej. '6-1')
-        df_grupos = self.excel_file.parse('Grupos', header=1, dtype=str).fillna('')
+        df_grupos = self.parse('Grupos', header=1, dtype=str).fillna('')
         
         # Crear mapeo nombre_grado -> nivel desde la hoja Grados
         nombre_a_nivel = self._build_grade_name_to_level_map()
@@ -297,10 +561,10 @@ class ExcelToJSONExporter:
     
     def _export_asignaturas(self) -> Dict[str, List[int]]:
         """Exporta asignaturas con los grados donde se imparten"""
-        if 'Asignaturas' not in self.excel_file.sheet_names:
+        if 'Asignaturas' not in self.sheet_names:
             return {}
         
-        df = self.excel_file.parse('Asignaturas', header=1)
+        df = self.parse('Asignaturas', header=1)
         asignaturas = {}
         
         for _, row in df.iterrows():
@@ -324,11 +588,11 @@ class ExcelToJSONExporter:
     
     def _export_areas(self) -> Dict[str, List[str]]:
         """Exporta áreas académicas con sus asignaturas (relación desde hoja Asignaturas)"""
-        if 'Áreas' not in self.excel_file.sheet_names:
+        if 'Áreas' not in self.sheet_names:
             return {}
         
         # Primero leer todas las áreas
-        df_areas = self.excel_file.parse('Áreas', header=1)
+        df_areas = self.parse('Áreas', header=1)
         areas = {}
         
         for _, row in df_areas.iterrows():
@@ -336,25 +600,36 @@ class ExcelToJSONExporter:
             if nombre_area:
                 areas[nombre_area] = []
         
-        # Luego leer asignaturas y mapearlas a sus áreas
-        if 'Asignaturas' in self.excel_file.sheet_names:
-            df_asignaturas = self.excel_file.parse('Asignaturas', header=1)
-            
-            for _, row in df_asignaturas.iterrows():
-                nombre_asignatura = str(row.get('Nombre de la asignatura', '')).strip()
-                area_asociada = str(row.get('Área asociada', '')).strip()
-                
-                if area_asociada and area_asociada in areas and nombre_asignatura:
-                    areas[area_asociada].append(nombre_asignatura)
+        # Luego agregar las asignaturas de cada área (relación desde hoja Asignaturas)
+        for area_asociada, asignaturas in self._tabla('asignaturas_por_area').items():
+            if area_asociada in areas:
+                areas[area_asociada].extend(asignaturas)
         
         return areas
     
+    def _construir_asignaturas_por_area(self) -> Dict[str, List[str]]:
+        """Asignaturas de cada área asociada, en el orden de la hoja Asignaturas"""
+        if 'Asignaturas' not in self.sheet_names:
+            return {}
+        
+        df_asignaturas = self.parse('Asignaturas', header=1)
+        asignaturas_por_area = {}
+        
+        for _, row in df_asignaturas.iterrows():
+            nombre_asignatura = str(row.get('Nombre de la asignatura', '')).strip()
+            area_asociada = str(row.get('Área asociada', '')).strip()
+            
+            if area_asociada and nombre_asignatura:
+                asignaturas_por_area.setdefault(area_asociada, []).append(nombre_asignatura)
+        
+        return asignaturas_por_area
+    
     def _export_administradores(self) -> List[Dict[str, Any]]:
         """Exporta administradores"""
-        if 'Administradores' not in self.excel_file.sheet_names:
+        if 'Administradores' not in self.sheet_names:
             return []
         
-        df = self.excel_file.parse('Administradores', header=1)
+        df = self.parse('Administradores', header=1)
         admins = []
         
         for _, row in df.iterrows():
@@ -373,10 +648,10 @@ class ExcelToJSONExporter:
     
     def _export_coordinadores(self) -> List[Dict[str, Any]]:
         """Exporta coordinadores"""
-        if 'Coordinadores' not in self.excel_file.sheet_names:
+        if 'Coordinadores' not in self.sheet_names:
             return []
         
-        df = self.excel_file.parse('Coordinadores', header=1)
+        df = self.parse('Coordinadores', header=1)
         coordinadores = []
         
         for _, row in df.iterrows():
@@ -396,12 +671,13 @@ class ExcelToJSONExporter:
         
         return coordinadores
     
+    @instrumentar('exportacion', contar_filas=True)
     def export_profesores(self) -> List[Dict[str, Any]]:
         """Exporta profesores a JSON separado"""
-        if 'Profesores' not in self.excel_file.sheet_names:
+        if 'Profesores' not in self.sheet_names:
             return []
         
-        df = self.excel_file.parse('Profesores', header=1)
+        df = self.parse('Profesores', header=1)
         profesores = []
         
         for _, row in df.iterrows():
@@ -427,145 +703,77 @@ class ExcelToJSONExporter:
         
         return profesores
     
+    @instrumentar('exportacion', contar_filas=True)
     def export_estudiantes(self) -> List[Dict[str, Any]]:
         """Exporta estudiantes a JSON separado (desde Matrículas)"""
-        if 'Matrículas' not in self.excel_file.sheet_names:
-            return []
+        return list(self.iter_estudiantes())
+    
+    def iter_estudiantes(self) -> Iterator[Dict[str, Any]]:
+        """Genera los estudiantes uno a uno (desde Matrículas) para escritura incremental"""
+        if 'Matrículas' not in self.sheet_names:
+            return
         
-        df = self.excel_file.parse('Matrículas', header=1)
-        estudiantes = []
+        df = self.parse('Matrículas', header=1)
         
         for _, row in df.iterrows():
+            # Columnas de la hoja Matrículas (config.COLUMNAS_REQUERIDAS); el primer
+            # acudiente está en las columnas con sufijo '.1'
             estudiante = {
-                'Nombres': str(row.get('Nombres del estudiante', '')).strip(),
-                'Apellidos': str(row.get('Apellidos del estudiante', '')).strip(),
-                'Correo': str(row.get('Correo del estudiante', '')) if pd.notna(row.get('Correo del estudiante')) else '',
-                'Tipo de documento': str(row.get('Tipo de documento del estudiante', '')).strip(),
-                'Numero de documento': str(row.get('Número de documento del estudiante', '')),
-                'Grado': self._extract_grade_level(str(row.get('Nombre del grado', ''))) or 0,
-                'Sexo': str(row.get('Sexo del estudiante', '')).strip(),
-                'Fecha de nacimiento': str(row.get('Fecha de nacimiento del estudiante', '')),
-                'Direccion': None,
-                'Tipo de sangre': None,
+                'Nombres': _texto_o_vacio(row.get('Nombres')),
+                'Apellidos': _texto_o_vacio(row.get('Apellidos')),
+                'Correo': _texto_o_vacio(row.get('Correo electrónico')),
+                'Tipo de documento': _texto_o_vacio(row.get('Tipo de documento')),
+                'Numero de documento': _texto_o_vacio(row.get('Número de documento')),
+                'Grado': self._extract_grade_level(_texto_o_vacio(row.get('Grado'))) or 0,
+                'Sexo': _texto_o_vacio(row.get('Sexo')),
+                'Fecha de nacimiento': _fecha_texto(row.get('Fecha de nacimiento')),
+                'Direccion': _texto_o_vacio(row.get('Dirección')) or None,
+                'Tipo de sangre': _texto_o_vacio(row.get('Tipo de sangre')) or None,
                 'CODIGO DANE SEDE A LA QUE PERTENECE': 0,
-                'NOMBRE SEDE': str(row.get('Sede asociada', '')).strip(),
-                'AULA DE ESTUDIO': str(row.get('Nombre del grupo', '')).strip(),
-                'CEDULA ACUDIENTE': str(row.get('Número de documento del acudiente', '')) if pd.notna(row.get('Número de documento del acudiente')) else '',
-                'Telefono': None,
-                'CURSO': str(row.get('Nombre del año escolar', '')).strip()
+                'NOMBRE SEDE': _texto_o_vacio(row.get('Sede asignada')),
+                'AULA DE ESTUDIO': _texto_o_vacio(row.get('Grupo')),
+                'CEDULA ACUDIENTE': _texto_o_vacio(row.get('Número de documento.1')),
+                'Telefono': _texto_o_vacio(row.get('Teléfono')) or None,
+                'CURSO': _texto_o_vacio(row.get('Año escolar'))
             }
-            estudiantes.append(estudiante)
-        
-        return estudiantes
+            yield estudiante
     
+    @instrumentar('exportacion', contar_filas=True)
     def export_calificaciones(self) -> Dict[str, Dict[str, Any]]:
         """Exporta calificaciones anuales agrupadas por estudiante (filtrando asignaturas inválidas)"""
-        if 'Calificaciones anuales' not in self.excel_file.sheet_names:
-            return {}
-        
-        df = self.excel_file.parse('Calificaciones anuales', header=1)
-        
-        # Obtener asignaturas válidas del contexto
-        asignaturas_validas = set()
-        if 'Asignaturas' in self.excel_file.sheet_names:
-            df_asignaturas = self.excel_file.parse('Asignaturas', header=1)
-            if 'Nombre de la asignatura' in df_asignaturas.columns:
-                asignaturas_validas = set(df_asignaturas['Nombre de la asignatura'].dropna().unique())
-        
-        # Agrupar por estudiante (número de documento + año escolar + sede)
-        estudiantes_agrupados = {}
-        
-        for _, row in df.iterrows():
-            asignatura = str(row.get('Nombre de la asignatura', '')).strip()
-            
-            # Filtrar registros con asignaturas inválidas
-            if asignaturas_validas and asignatura not in asignaturas_validas:
-                continue
-            
-            # Convertir año escolar a string sin decimales si es número
-            año_escolar = row.get('Año escolar', '')
-            if isinstance(año_escolar, (int, float)) and not pd.isna(año_escolar):
-                año_escolar = str(int(año_escolar))
-            else:
-                año_escolar = str(año_escolar).strip()
-            
-            # Extraer campos
-            num_documento = str(row.get('Número de documento del estudiante', '')).strip()
-            nombre_estudiante = str(row.get('Nombre del estudiante', '')).strip()
-            sede_asignada = str(row.get('Sede asignada', '')).strip()
-            tipo_nota = str(row.get('Tipo de nota', '')).strip()
-            aprobo = str(row.get('Aprobó', '')) if pd.notna(row.get('Aprobó')) else None
-            promedio_anual = row.get('Promedio anual')
-            
-            # Crear clave compuesta si el estudiante tiene múltiples años o sedes
-            # Por ahora usamos solo documento + año escolar + sede para agrupar
-            clave_base = f"{num_documento}_{año_escolar}_{sede_asignada}"
-            
-            # Si el estudiante no existe, crearlo
-            if clave_base not in estudiantes_agrupados:
-                estudiantes_agrupados[clave_base] = {
-                    'numero_documento': num_documento,
-                    'año_escolar': año_escolar,
-                    'sede_asignada': sede_asignada,
-                    'Nombre del estudiante': nombre_estudiante,
-                    'Año escolar': año_escolar,
-                    'Sede asignada': sede_asignada,
-                    'Tipo de nota': tipo_nota,
-                    'Aprobó': aprobo,
-                    'calificaciones': [],
-                    'asignaturas_vistas': {}  # Para evitar duplicados
-                }
-            
-            # Agregar calificación solo si no existe ya esta asignatura
-            # Si existe, actualizar con el último valor (sobrescribir)
-            if asignatura not in estudiantes_agrupados[clave_base]['asignaturas_vistas']:
-                estudiantes_agrupados[clave_base]['calificaciones'].append({
-                    'Nombre de la asignatura': asignatura,
-                    'Promedio anual': promedio_anual
-                })
-                estudiantes_agrupados[clave_base]['asignaturas_vistas'][asignatura] = len(estudiantes_agrupados[clave_base]['calificaciones']) - 1
-            else:
-                # Ya existe, actualizar el valor en su posición
-                idx = estudiantes_agrupados[clave_base]['asignaturas_vistas'][asignatura]
-                estudiantes_agrupados[clave_base]['calificaciones'][idx]['Promedio anual'] = promedio_anual
-        
-        # Transformar a estructura final: usar solo documento si hay un solo año/sede por estudiante
-        calificaciones_finales = {}
-        
-        # Agrupar por número de documento para verificar cuántas combinaciones año/sede tiene cada estudiante
-        docs_agrupados = {}
-        for clave, datos in estudiantes_agrupados.items():
-            doc = datos['numero_documento']
-            if doc not in docs_agrupados:
-                docs_agrupados[doc] = []
-            docs_agrupados[doc].append((clave, datos))
-        
-        # Decidir clave final: solo documento o documento_año_sede
-        for doc, entradas in docs_agrupados.items():
-            if len(entradas) == 1:
-                # Un solo año/sede: usar solo el número de documento
-                clave, datos = entradas[0]
-                # Eliminar campos auxiliares
-                datos_finales = {k: v for k, v in datos.items() if k not in ['numero_documento', 'año_escolar', 'sede_asignada', 'asignaturas_vistas']}
-                calificaciones_finales[doc] = datos_finales
-            else:
-                # Múltiples años/sedes: usar clave compuesta
-                for clave, datos in entradas:
-                    clave_final = f"{doc}_{datos['año_escolar']}_{datos['sede_asignada']}"
-                    # Eliminar campos auxiliares
-                    datos_finales = {k: v for k, v in datos.items() if k not in ['numero_documento', 'año_escolar', 'sede_asignada', 'asignaturas_vistas']}
-                    calificaciones_finales[clave_final] = datos_finales
+        return dict(self.iter_calificaciones())
+    
+    def iter_calificaciones(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Genera pares (clave, calificaciones del estudiante) para escritura incremental"""
+        if 'Calificaciones anuales' not in self.sheet_names:
+            return
         
-        return calificaciones_finales
+        df = self.parse('Calificaciones anuales', header=1)
+        yield from agrupar_calificaciones(df, self._tabla('asignaturas_validas'))
     
     # Métodos auxiliares
     
+    def _construir_asignaturas_validas(self) -> set:
+        """Asignaturas válidas del contexto de validación (o de la hoja Asignaturas)"""
+        # El contexto deja de valer si la hoja Asignaturas se reemplazó después
+        if 'asignaturas' in self.contexto and not self._versiones_hojas.get('Asignaturas'):
+            return set(self.contexto['asignaturas'])
+        if 'Asignaturas' not in self.sheet_names:
+            return set()
+        df_asignaturas = self.parse('Asignaturas', header=1)
+        if 'Nombre de la asignatura' not in df_asignaturas.columns:
+            return set()
+        return set(df_asignaturas['Nombre de la asignatura'].dropna().unique())
+    
     def _build_grade_name_to_level_map(self) -> Dict[str, int]:
-        """Construye un mapeo de nombre de grado a nivel desde la hoja Grados"""
-        if 'Grados' not in self.excel_file.sheet_names:
+        """Mapeo de nombre de grado a nivel desde la hoja Grados"""
+        return self._tabla('nivel_por_nombre_grado')
+    
+    def _construir_nivel_por_nombre_grado(self) -> Dict[str, int]:
+        df = self._tabla('grados')
+        if df is None:
             return {}
         
-        df = self.excel_file.parse('Grados', header=1)
         mapeo = {}
         
         for _, row in df.iterrows():
@@ -670,9 +878,44 @@ class ExcelToJSONExporter:
         else:
             return 5  # Por defecto CC
     
+    def iter_json(self, documento: str) -> Iterator[str]:
+        """
+        Serializa un documento de forma incremental
+        
+        Args:
+            documento: Uno de DOCUMENTOS
+            
+        Returns:
+            Iterador de fragmentos de texto (con el serializador 'json' son idénticos
+            a json.dumps(..., ensure_ascii=False, indent=2))
+        """
+        if documento == 'config':
+            return iter_valor_json(self.export_config(), self.serializador)
+        if documento == 'profesores':
+            return iter_lista_json(self.export_profesores(), self.serializador)
+        if documento == 'estudiantes':
+            return iter_lista_json(self.iter_estudiantes(), self.serializador)
+        if documento == 'calificaciones_anuales':
+            return iter_objeto_json(self.iter_calificaciones(), self.serializador)
+        raise ValueError(f"Documento desconocido: {documento}")
+    
+    @instrumentar('exportacion')
+    def write_zip(self, zip_file):
+        """
+        Escribe los 4 documentos JSON en un ZIP abierto, cada uno de forma
+        incremental (sin construir el documento completo en memoria)
+        
+        Args:
+            zip_file: zipfile.ZipFile abierto en modo escritura (la compresión y su
+                nivel son los del propio zip_file)
+        """
+        for documento in DOCUMENTOS:
+            escribir_json_zip(self.iter_json(documento), zip_file, f'{documento}.json')
+    
+    @instrumentar('exportacion')
     def save_to_files(self, output_dir: str = 'output'):
         """
-        Guarda los JSONs en archivos separados
+        Guarda los JSONs en archivos separados (escritura incremental)
         
         Args:
             output_dir: Directorio donde guardar los archivos
@@ -680,44 +923,116 @@ class ExcelToJSONExporter:
         import os
         os.makedirs(output_dir, exist_ok=True)
         
-        data = self.export_all()
+        rutas = {}
+        for documento in DOCUMENTOS:
+            ruta = os.path.join(output_dir, f'{documento}.json')
+            with open(ruta, 'w', encoding='utf-8') as f:
+                escribir_json(self.iter_json(documento), f)
+            rutas[documento] = ruta
+        
+        return rutas
+    
+    @instrumentar('exportacion')
+    def save_to_ndjson(self, output_dir: str = 'output', por_sede: bool = False,
+                       registros_por_archivo: int = None) -> str:
+        """
+        Guarda estudiantes y calificaciones como NDJSON (un registro por línea),
+        opcionalmente en shards por sede y/o cada N registros, junto con un
+        manifest.json que lista shards, conteos y checksums SHA-256.
         
-        # Guardar config.json
-        with open(os.path.join(output_dir, 'config.json'), 'w', encoding='utf-8') as f:
-            json.dump(data['config'], f, ensure_ascii=False, indent=2)
+        config y profesores se guardan como JSON normal y también aparecen en el manifiesto.
+        En calificaciones cada línea incluye la clave del estudiante en el campo 'Clave'.
         
-        # Guardar profesores.json
-        with open(os.path.join(output_dir, 'profesores.json'), 'w', encoding='utf-8') as f:
-            json.dump(data['profesores'], f, ensure_ascii=False, indent=2)
+        Args:
+            output_dir: Directorio donde guardar los archivos
+            por_sede: Crear un shard por sede
+            registros_por_archivo: Máximo de registros por shard (None = sin límite)
+            
+        Returns:
+            Ruta del manifest.json
+        """
+        import os
+        os.makedirs(output_dir, exist_ok=True)
         
-        # Guardar estudiantes.json
-        with open(os.path.join(output_dir, 'estudiantes.json'), 'w', encoding='utf-8') as f:
-            json.dump(data['estudiantes'], f, ensure_ascii=False, indent=2)
+        documentos = {}
+        
+        # Documentos pequeños: JSON normal (config es un solo registro)
+        for documento, valor in [('config', self.export_config()), ('profesores', self.export_profesores())]:
+            ruta = os.path.join(output_dir, f'{documento}.json')
+            with open(ruta, 'w', encoding='utf-8') as f:
+                if isinstance(valor, list):
+                    escribir_json(iter_lista_json(valor, self.serializador), f)
+                else:
+                    escribir_json(iter_valor_json(valor, self.serializador), f)
+            documentos[documento] = {
+                'formato': 'json',
+                'registros': len(valor) if isinstance(valor, list) else 1,
+                'shards': [describir_archivo(ruta, f'{documento}.json')]
+            }
         
-        # Guardar calificaciones_anuales.json
-        with open(os.path.join(output_dir, 'calificaciones_anuales.json'), 'w', encoding='utf-8') as f:
-            json.dump(data['calificaciones_anuales'], f, ensure_ascii=False, indent=2)
+        # Documentos grandes: NDJSON particionado
+        fuentes = {
+            'estudiantes': ((e, e['NOMBRE SEDE']) for e in self.iter_estudiantes()),
+            'calificaciones_anuales': (({'Clave': clave, **datos}, datos['Sede asignada'])
+                                       for clave, datos in self.iter_calificaciones())
+        }
+        for documento, registros in fuentes.items():
+            with EscritorNDJSON(os.path.join(output_dir, documento), documento, self.serializador,
+                                registros_por_archivo) as escritor:
+                for registro, sede in registros:
+                    escritor.escribir(registro, sede if por_sede else None)
+            shards = [{**shard, 'archivo': f"{documento}/{shard['archivo']}"} for shard in escritor.shards]
+            documentos[documento] = {
+                'formato': 'ndjson',
+                'registros': sum(shard['registros'] for shard in shards),
+                'shards': sorted(shards, key=lambda shard: shard['archivo'])
+            }
         
-        return {
-            'config': os.path.join(output_dir, 'config.json'),
-            'profesores': os.path.join(output_dir, 'profesores.json'),
-            'estudiantes': os.path.join(output_dir, 'estudiantes.json'),
-            'calificaciones_anuales': os.path.join(output_dir, 'calificaciones_anuales.json')
+        manifiesto = {
+            'generado': datetime.now().isoformat(timespec='seconds'),
+            'particion': 'sede' if por_sede else None,
+            'registros_por_archivo': registros_por_archivo,
+            'documentos': documentos
         }
+        ruta_manifiesto = os.path.join(output_dir, 'manifest.json')
+        with open(ruta_manifiesto, 'w', encoding='utf-8') as f:
+            escribir_json(iter_valor_json(manifiesto), f)
+        return ruta_manifiesto
 
 
 # Función auxiliar para uso directo
-def export_excel_to_json(excel_path: str, output_dir: str = 'output'):
+def export_excel_to_json(excel_path: str, output_dir: str = 'output', serializador: str = 'json'):
     """
     Exporta un archivo Excel a formato JSON
     
     Args:
         excel_path: Ruta al archivo Excel
         output_dir: Directorio de salida
+        serializador: Codificador JSON ('json', 'orjson' o 'auto')
         
     Returns:
         Dict con rutas de los archivos generados
     """
     excel_file = pd.ExcelFile(excel_path)
-    exporter = ExcelToJSONExporter(excel_file)
+    exporter = ExcelToJSONExporter(excel_file, serializador)
     return exporter.save_to_files(output_dir)
+
+
+def export_excel_to_ndjson(excel_path: str, output_dir: str = 'output', por_sede: bool = False,
+                           registros_por_archivo: int = None, serializador: str = 'json'):
+    """
+    Exporta un archivo Excel a NDJSON particionado con manifiesto
+    
+    Args:
+        excel_path: Ruta al archivo Excel
+        output_dir: Directorio de salida
+        por_sede: Crear un shard por sede
+        registros_por_archivo: Máximo de registros por shard
+        serializador: Codificador JSON ('json', 'orjson' o 'auto')
+        
+    Returns:
+        Ruta del manifest.json generado
+    """
+    excel_file = pd.ExcelFile(excel_path)
+    exporter = ExcelToJSONExporter(excel_file, serializador)
+    return exporter.save_to_ndjson(output_dir, por_sede, registros_por_archivo)
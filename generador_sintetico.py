@@ -0,0 +1,500 @@
+"""
+Generador determinista de libros semilla sintéticos
+Escribe un Excel con todas las hojas de HOJAS_REQUERIDAS y las columnas de
+COLUMNAS_REQUERIDAS (título en la fila 1, encabezados en la fila 2 y "Sede
+principal" transpuesta), con referencias consistentes entre hojas, para medir
+la validación y la exportación sin datos reales de estudiantes.
+
+Matrículas y Calificaciones anuales se generan por bloques y se escriben fila a
+fila con un escritor de memoria constante (xlsxwriter en modo constant_memory
+si está instalado; si no, openpyxl en modo write_only), de modo que la memoria
+no crece con la escala (de 100 a 1M de filas). La misma semilla y los mismos
+parámetros producen siempre los mismos datos; con xlsxwriter también el mismo
+archivo byte a byte (openpyxl escribe la fecha de guardado en las propiedades
+del libro y en las entradas del ZIP).
+
+Los perfiles de errores (PERFILES_ERRORES) indican la fracción de filas con
+cada tipo de error inyectado:
+    duplicados   Números de documento repetidos (Matrículas; un profesor)
+    referencias  Sedes, años escolares o asignaturas inexistentes (Calificaciones)
+    fechas       Fechas de nacimiento futuras (Matrículas; un periodo con fecha inválida)
+    promedios    Promedios fuera de 0-5 o no numéricos (Calificaciones)
+
+Uso:
+    python generador_sintetico.py sintetico.xlsx --matriculas 100000
+    python generador_sintetico.py errores.xlsx -n 5000 --perfil severo
+    python generador_sintetico.py grande.xlsx -n 1000000 --calificaciones 1000000 --error promedios=0.01
+"""
+import argparse
+import math
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+from config import COLUMNAS_REQUERIDAS, HOJAS_REQUERIDAS
+
+TIPOS_ERROR = ('duplicados', 'referencias', 'fechas', 'promedios')
+
+PERFILES_ERRORES = {
+    'limpio': {},
+    'leve': {tipo: 0.001 for tipo in TIPOS_ERROR},
+    'severo': {tipo: 0.02 for tipo in TIPOS_ERROR}
+}
+
+# Filas de Matrículas / Calificaciones generadas por bloque
+TAMAÑO_BLOQUE = 50_000
+
+# Fecha fija en las propiedades del libro (con xlsxwriter el archivo no depende de cuándo se genera)
+FECHA_CREACION = datetime(2025, 1, 1)
+
+AÑO_ACTUAL = 2025
+CURSOS = [
+    (2024, '2024-01-22', '2024-11-29'),
+    (2025, '2025-01-20', '2025-11-28')
+]
+PERIODOS = [('P1', '01-20', '04-04'), ('P2', '04-14', '06-13'), ('P3', '07-07', '09-12'), ('P4', '09-15', '11-28')]
+
+NOMBRES_SEDES = ['Principal', 'Norte', 'Sur', 'Oriente', 'Occidente', 'Rural', 'Centro', 'La Loma', 'El Prado', 'Campestre']
+
+# (Nivel, Nombre del grado, Tipo de grado, ¿Último grado culminante?)
+GRADOS = [
+    (0, 'Transición', 'EDUCACION_PREESCOLAR', 'No'),
+    (1, 'Primero', 'EDUCACION_BASICA_PRIMARIA', 'No'),
+    (2, 'Segundo', 'EDUCACION_BASICA_PRIMARIA', 'No'),
+    (3, 'Tercero', 'EDUCACION_BASICA_PRIMARIA', 'No'),
+    (4, 'Cuarto', 'EDUCACION_BASICA_PRIMARIA', 'No'),
+    (5, 'Quinto', 'EDUCACION_BASICA_PRIMARIA', 'No'),
+    (6, 'Sexto', 'EDUCACION_BASICA_SECUNDARIA', 'No'),
+    (7, 'Séptimo', 'EDUCACION_BASICA_SECUNDARIA', 'No'),
+    (8, 'Octavo', 'EDUCACION_BASICA_SECUNDARIA', 'No'),
+    (9, 'Noveno', 'EDUCACION_BASICA_SECUNDARIA', 'No'),
+    (10, 'Décimo', 'EDUCACION_MEDIA', 'No'),
+    (11, 'Once', 'EDUCACION_MEDIA', 'Sí')
+]
+
+# Asignatura -> área
+ASIGNATURAS = {
+    'Matemáticas': 'Matemáticas',
+    'Lengua Castellana': 'Humanidades',
+    'Inglés': 'Humanidades',
+    'Ciencias Naturales': 'Ciencias Naturales',
+    'Ciencias Sociales': 'Ciencias Sociales',
+    'Educación Física': 'Educación Física',
+    'Educación Artística': 'Educación Artística',
+    'Tecnología e Informática': 'Tecnología',
+    'Ética y Valores': 'Ética',
+    'Religión': 'Religión'
+}
+
+NOMBRES = ['Ana', 'Luis', 'María', 'Juan', 'Sofía', 'Carlos', 'Valentina', 'Andrés', 'Camila', 'Jorge',
+           'Laura', 'Diego', 'Isabella', 'Mateo', 'Daniela', 'Santiago', 'Gabriela', 'Samuel', 'Paula', 'Tomás']
+APELLIDOS = ['Gómez', 'Rodríguez', 'Martínez', 'López', 'García', 'Pérez', 'Sánchez', 'Ramírez', 'Torres', 'Díaz',
+             'Vargas', 'Castro', 'Rojas', 'Moreno', 'Muñoz', 'Ortiz', 'Jiménez', 'Restrepo', 'Zapata', 'Ospina']
+
+SEDE_INEXISTENTE = 'Sede Inexistente'
+AÑO_INEXISTENTE = 1999
+ASIGNATURA_INEXISTENTE = 'Asignatura Inexistente'
+
+DOCUMENTO_BASE_ESTUDIANTE = 1_000_000_000
+DOCUMENTO_BASE_PROFESOR = 70_000_000
+
+
+def _encabezado(columna: str) -> str:
+    """Encabezado en Excel de una columna requerida ('Nombres.1' -> 'Nombres', como lo renombra pandas)"""
+    return re.sub(r'\.\d+$', '', columna)
+
+
+def _nombre_persona(i: int) -> str:
+    return NOMBRES[i % len(NOMBRES)]
+
+
+def _apellido_persona(i: int) -> str:
+    return APELLIDOS[(i // len(NOMBRES)) % len(APELLIDOS)]
+
+
+def resolver_errores(perfil: str = 'limpio', errores: Dict[str, float] = None) -> Dict[str, float]:
+    """
+    Tasas de error por tipo: las del perfil, reemplazadas por las indicadas en 'errores'
+
+    Raises:
+        ValueError: Si el perfil o algún tipo de error no existen, o una tasa no está entre 0 y 1
+    """
+    if perfil not in PERFILES_ERRORES:
+        raise ValueError(f"Perfil de errores desconocido: {perfil}. Disponibles: {', '.join(PERFILES_ERRORES)}")
+    tasas = {tipo: 0.0 for tipo in TIPOS_ERROR}
+    tasas.update(PERFILES_ERRORES[perfil])
+    for tipo, tasa in (errores or {}).items():
+        if tipo not in TIPOS_ERROR:
+            raise ValueError(f"Tipo de error desconocido: {tipo}. Disponibles: {', '.join(TIPOS_ERROR)}")
+        if not 0 <= tasa <= 1:
+            raise ValueError(f"La tasa de '{tipo}' debe estar entre 0 y 1: {tasa}")
+        tasas[tipo] = tasa
+    return tasas
+
+
+class _LibroXlsxwriter:
+    """Escritor de memoria constante con xlsxwriter (cada fila se vuelca al pasar a la siguiente)"""
+
+    def __init__(self, ruta: str):
+        import xlsxwriter
+
+        self.libro = xlsxwriter.Workbook(ruta, {'constant_memory': True})
+        self.libro.set_properties({'created': FECHA_CREACION})
+
+    def hoja(self, nombre: str):
+        hoja = self.libro.add_worksheet(nombre)
+        fila = 0
+
+        def agregar(valores):
+            nonlocal fila
+            hoja.write_row(fila, 0, valores)
+            fila += 1
+        return agregar
+
+    def cerrar(self) -> None:
+        self.libro.close()
+
+
+class _LibroOpenpyxl:
+    """Escritor de memoria constante con openpyxl (write_only)"""
+
+    def __init__(self, ruta: str):
+        from openpyxl import Workbook
+
+        self.ruta = ruta
+        self.libro = Workbook(write_only=True)
+        self.libro.properties.created = FECHA_CREACION
+
+    def hoja(self, nombre: str):
+        return self.libro.create_sheet(nombre).append
+
+    def cerrar(self) -> None:
+        self.libro.save(self.ruta)
+
+
+MOTORES = {
+    'xlsxwriter': _LibroXlsxwriter,
+    'openpyxl': _LibroOpenpyxl
+}
+
+
+def _abrir_libro(ruta: str, motor: str = None):
+    if motor is None:
+        try:
+            import xlsxwriter  # noqa: F401
+            motor = 'xlsxwriter'
+        except ImportError:
+            motor = 'openpyxl'
+    return MOTORES[motor](ruta)
+
+
+class GeneradorLibro:
+    """
+    Datos de un libro sintético a partir de la escala, las tasas de error y la semilla
+
+    Las hojas de referencia (sedes, grados, grupos, profesores, ...) crecen con la
+    cantidad de matrículas; cada estudiante queda en una sede, grado y grupo
+    existentes, y sus calificaciones usan sus mismos documento, nombre y sede.
+    """
+
+    def __init__(self, matriculas: int, calificaciones: int, tasas: Dict[str, float], semilla: int):
+        self.matriculas = matriculas
+        self.calificaciones = calificaciones
+        self.tasas = tasas
+        # Flujos separados: cambiar las tasas de error no cambia los datos base
+        self.rng_datos = np.random.default_rng([semilla, 0])
+        self.rng_errores = np.random.default_rng([semilla, 1])
+        self.errores_inyectados = {tipo: 0 for tipo in TIPOS_ERROR}
+
+        self.sedes = [f"Sede {nombre}" for nombre in NOMBRES_SEDES[:min(len(NOMBRES_SEDES), 2 + matriculas // 100_000)]]
+        self.grupos_por_grado = max(1, math.ceil(matriculas / (len(self.sedes) * len(GRADOS) * 35)))
+        self.profesores = max(5, matriculas // 30)
+
+    def _grupo(self, nivel: int, indice: int) -> str:
+        return f"{nivel}{indice + 1:02d}"
+
+    def _mascara_errores(self, tipo: str, n: int) -> np.ndarray:
+        tasa = self.tasas[tipo]
+        if tasa <= 0:
+            return np.zeros(n, dtype=bool)
+        mascara = self.rng_errores.random(n) < tasa
+        self.errores_inyectados[tipo] += int(mascara.sum())
+        return mascara
+
+    # Hojas de referencia
+
+    def sede_principal(self) -> List[List[Any]]:
+        return [
+            ['SEDE PRINCIPAL', None],
+            ['Nombre de la institución', 'INSTITUCIÓN EDUCATIVA PABLO NERUDA'],
+            ['Departamento', 'Antioquia'],
+            ['Municipio', 'Medellín'],
+            ['Código DANE', '105001000001'],
+            ['NIT', '900123456-1'],
+            ['Teléfono', '6044444444'],
+            ['Correo electrónico', 'rectoria@pabloneruda.edu.co'],
+            ['Dirección', 'Calle 10 # 20-30']
+        ]
+
+    def filas_referencia(self, hoja: str) -> List[List[Any]]:
+        if hoja == 'Sedes':
+            return [[sede, f"Carrera {10 + i} # {i + 1}-20", 6040000000 + i, f"sede{i}@pabloneruda.edu.co",
+                     105001000100 + i] for i, sede in enumerate(self.sedes)]
+        if hoja == 'Administradores':
+            return [[_nombre_persona(i), _apellido_persona(i), f"admin{i}@pabloneruda.edu.co", 'CC',
+                     50_000_000 + i, 3000000000 + i] for i in range(2)]
+        if hoja == 'Coordinadores':
+            return [[_nombre_persona(i + 3), _apellido_persona(i + 3), f"coordinador{i}@pabloneruda.edu.co", 'CC',
+                     60_000_000 + i, 3010000000 + i, sede, 'ACADEMIC', 'Sí'] for i, sede in enumerate(self.sedes)]
+        if hoja == 'Cursos académicos':
+            return [list(curso) for curso in CURSOS]
+        if hoja == 'Periodos':
+            filas = [[nombre, f"{año}-{inicio}", f"{año}-{fin}", año]
+                     for año, _, _ in CURSOS for nombre, inicio, fin in PERIODOS]
+            if self.tasas['fechas'] > 0:
+                filas[-1][2] = f"{AÑO_ACTUAL}-13-45"
+            return filas
+        if hoja == 'Grados':
+            return [list(grado) for grado in GRADOS]
+        if hoja == 'Grupos':
+            return [[self._grupo(nivel, g), nombre, sede, 40]
+                    for sede in self.sedes for nivel, nombre, _, _ in GRADOS for g in range(self.grupos_por_grado)]
+        if hoja == 'Áreas':
+            return [[area] for area in dict.fromkeys(ASIGNATURAS.values())]
+        if hoja == 'Asignaturas':
+            todos_los_grados = ', '.join(nombre for _, nombre, _, _ in GRADOS)
+            return [[asignatura, area, todos_los_grados] for asignatura, area in ASIGNATURAS.items()]
+        if hoja == 'Profesores':
+            return self._profesores()
+        if hoja == 'Clases':
+            return self._clases()
+        raise KeyError(hoja)
+
+    def _profesores(self) -> List[List[Any]]:
+        asignaturas = list(ASIGNATURAS)
+        filas = []
+        for j in range(self.profesores):
+            filas.append([
+                _nombre_persona(j + 7), _apellido_persona(j + 7), 'CC', DOCUMENTO_BASE_PROFESOR + j,
+                3100000000 + j, f"Calle {j % 100} # {j % 50}-{j % 30}", f"profesor{j}@pabloneruda.edu.co",
+                self.sedes[j % len(self.sedes)],
+                f"{asignaturas[j % len(asignaturas)]}, {asignaturas[(j + 1) % len(asignaturas)]}"
+            ])
+        if self.tasas['duplicados'] > 0:
+            filas[-1][3] = filas[0][3]
+            self.errores_inyectados['duplicados'] += 1
+        return filas
+
+    def _clases(self) -> List[List[Any]]:
+        """Tres clases por grupo, del año actual, con un profesor asignado en rotación"""
+        asignaturas = list(ASIGNATURAS)
+        periodos = ', '.join(nombre for nombre, _, _ in PERIODOS)
+        filas = []
+        for sede in self.sedes:
+            for nivel, grado, _, _ in GRADOS:
+                for g in range(self.grupos_por_grado):
+                    for a in range(3):
+                        j = len(filas) % self.profesores
+                        filas.append([
+                            asignaturas[(nivel + a) % len(asignaturas)], grado, self._grupo(nivel, g), sede,
+                            AÑO_ACTUAL, periodos, 'Mañana' if g % 2 == 0 else 'Tarde',
+                            f"{_nombre_persona(j + 7)} {_apellido_persona(j + 7)}", DOCUMENTO_BASE_PROFESOR + j
+                        ])
+        return filas
+
+    # Hojas grandes (por bloques)
+
+    def _ubicacion_estudiantes(self, indices: np.ndarray):
+        """Sede, nivel y grupo (índices) de cada estudiante"""
+        n_sedes = len(self.sedes)
+        sede = indices % n_sedes
+        nivel = (indices // n_sedes) % len(GRADOS)
+        grupo = (indices // (n_sedes * len(GRADOS))) % self.grupos_por_grado
+        return sede, nivel, grupo
+
+    def bloques_matriculas(self):
+        """Filas de Matrículas (solo las columnas con datos; el resto queda vacío)"""
+        for inicio in range(0, self.matriculas, TAMAÑO_BLOQUE):
+            indices = np.arange(inicio, min(inicio + TAMAÑO_BLOQUE, self.matriculas))
+            n = len(indices)
+            sede, nivel, grupo = self._ubicacion_estudiantes(indices)
+
+            documentos = DOCUMENTO_BASE_ESTUDIANTE + indices
+            duplicados = self._mascara_errores('duplicados', n) & (indices > 0)
+            documentos = np.where(duplicados, documentos - 1, documentos)
+
+            # Edad acorde al grado: nace entre 6 y 7 años antes del año escolar, menos el nivel
+            nacimiento = (np.datetime64(f'{AÑO_ACTUAL - 7}-01-01') - (nivel * 365).astype('timedelta64[D]') +
+                          self.rng_datos.integers(0, 365, n).astype('timedelta64[D]'))
+            fechas = np.datetime_as_string(nacimiento, unit='D').astype(object)
+            futuras = self._mascara_errores('fechas', n)
+            fechas[futuras] = f"{AÑO_ACTUAL + 5}-06-15"
+
+            tipos_documento = np.where(nivel < 1, 'RC', 'TI')
+            sexos = self.rng_datos.choice(['F', 'M'], n)
+            jornadas = np.where(grupo % 2 == 0, 'Mañana', 'Tarde')
+
+            for k in range(n):
+                i = int(indices[k])
+                s, nv, g = int(sede[k]), int(nivel[k]), int(grupo[k])
+                yield [
+                    int(documentos[k]), tipos_documento[k], _nombre_persona(i), _apellido_persona(i),
+                    fechas[k], self.sedes[s], AÑO_ACTUAL, GRADOS[nv][1], self._grupo(nv, g),
+                    f"estudiante{i}@correo.edu.co", 3200000000 + i, f"M{i:07d}", f"{AÑO_ACTUAL}-01-15",
+                    jornadas[k], sexos[k], 'Medellín', f"Calle {i % 100} # {i % 70}-{i % 40}"
+                ]
+
+    def bloques_calificaciones(self):
+        """
+        Filas de Calificaciones anuales: la fila k es de la asignatura k // matrículas
+        del estudiante k % matrículas (sin combinaciones repetidas mientras alcancen
+        las asignaturas; luego se pasa al año anterior)
+        """
+        asignaturas = list(ASIGNATURAS)
+        por_año = self.matriculas * len(asignaturas)
+        for inicio in range(0, self.calificaciones, TAMAÑO_BLOQUE):
+            indices = np.arange(inicio, min(inicio + TAMAÑO_BLOQUE, self.calificaciones))
+            n = len(indices)
+            estudiantes = indices % self.matriculas
+            sede, _, _ = self._ubicacion_estudiantes(estudiantes)
+
+            promedios = np.round(self.rng_datos.uniform(1.0, 5.0, n), 1).astype(object)
+            aprobo = np.where(promedios.astype(float) >= 3.0, 'Sí', 'No')
+            fuera_rango = self._mascara_errores('promedios', n)
+            promedios[fuera_rango] = self.rng_errores.choice([7.5, -1.0, 'Sin nota'], int(fuera_rango.sum()))
+
+            # Referencias inexistentes: sede, año escolar o asignatura (esta última es advertencia)
+            referencias = self._mascara_errores('referencias', n)
+            tipo_referencia = self.rng_errores.integers(0, 3, n)
+
+            for k in range(n):
+                i = int(estudiantes[k])
+                año = AÑO_ACTUAL - (int(indices[k]) // por_año) % len(CURSOS)
+                sede_fila = self.sedes[int(sede[k])]
+                asignatura = asignaturas[(int(indices[k]) // self.matriculas) % len(asignaturas)]
+                if referencias[k]:
+                    if tipo_referencia[k] == 0:
+                        sede_fila = SEDE_INEXISTENTE
+                    elif tipo_referencia[k] == 1:
+                        año = AÑO_INEXISTENTE
+                    else:
+                        asignatura = ASIGNATURA_INEXISTENTE
+                yield [
+                    DOCUMENTO_BASE_ESTUDIANTE + i, f"{_nombre_persona(i)} {_apellido_persona(i)}", asignatura,
+                    año, sede_fila, 'Cuantitativa (Números)', promedios[k], aprobo[k]
+                ]
+
+
+def generar_libro(ruta: str, matriculas: int = 1000, calificaciones: int = None, perfil: str = 'limpio',
+                  errores: Dict[str, float] = None, semilla: int = 42, motor: str = None) -> Dict[str, Any]:
+    """
+    Escribe un libro semilla sintético
+
+    Args:
+        ruta: Archivo .xlsx de destino
+        matriculas: Filas de Matrículas (un estudiante por fila)
+        calificaciones: Filas de Calificaciones anuales (por defecto, las mismas que matrículas)
+        perfil: Perfil de errores de PERFILES_ERRORES
+        errores: Tasas por tipo de error que reemplazan las del perfil (ej. {'promedios': 0.05})
+        semilla: Semilla de los datos (misma semilla y parámetros -> mismos datos)
+        motor: 'xlsxwriter' u 'openpyxl' (por defecto xlsxwriter si está instalado)
+
+    Returns:
+        dict: 'ruta', 'filas' (por hoja), 'tasas', 'errores_inyectados' (filas por tipo) y 'duracion_s'
+    """
+    if matriculas < 1:
+        raise ValueError("Se necesita al menos una matrícula")
+    calificaciones = matriculas if calificaciones is None else calificaciones
+    tasas = resolver_errores(perfil, errores)
+    generador = GeneradorLibro(matriculas, calificaciones, tasas, semilla)
+
+    inicio = time.perf_counter()
+    filas = {}
+    libro = _abrir_libro(ruta, motor)
+    try:
+        for hoja in HOJAS_REQUERIDAS:
+            agregar = libro.hoja(hoja)
+            if hoja == 'Instrucciones':
+                agregar(['Libro semilla sintético generado con generador_sintetico.py (datos ficticios)'])
+                agregar([f"Semilla: {semilla} · Matrículas: {matriculas} · Calificaciones: {calificaciones}"])
+                continue
+            if hoja == 'Sede principal':
+                for fila in generador.sede_principal():
+                    agregar(fila)
+                filas[hoja] = len(generador.sede_principal()) - 1
+                continue
+
+            # Fila 1: título, fila 2: encabezados
+            agregar([hoja.upper()])
+            agregar([_encabezado(columna) for columna in COLUMNAS_REQUERIDAS[hoja]])
+            if hoja == 'Matrículas':
+                contenido = generador.bloques_matriculas()
+            elif hoja == 'Calificaciones anuales':
+                contenido = generador.bloques_calificaciones()
+            else:
+                contenido = generador.filas_referencia(hoja)
+            total = 0
+            for fila in contenido:
+                agregar(fila)
+                total += 1
+            filas[hoja] = total
+    finally:
+        libro.cerrar()
+
+    return {
+        'ruta': ruta,
+        'filas': filas,
+        'tasas': tasas,
+        'errores_inyectados': generador.errores_inyectados,
+        'duracion_s': time.perf_counter() - inicio
+    }
+
+
+def _tasa_error(texto: str):
+    """'promedios=0.05' -> ('promedios', 0.05)"""
+    tipo, separador, tasa = texto.partition('=')
+    if not separador:
+        raise argparse.ArgumentTypeError(f"Formato esperado tipo=tasa (ej. promedios=0.05): {texto}")
+    try:
+        return tipo.strip(), float(tasa)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tasa inválida: {texto}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('salida', help="Archivo .xlsx de destino")
+    parser.add_argument('-n', '--matriculas', type=int, default=1000, help="Filas de Matrículas (por defecto 1000)")
+    parser.add_argument('--calificaciones', type=int, default=None,
+                        help="Filas de Calificaciones anuales (por defecto, igual a --matriculas)")
+    parser.add_argument('--perfil', choices=sorted(PERFILES_ERRORES), default='limpio', help="Perfil de errores")
+    parser.add_argument('--error', type=_tasa_error, action='append', default=[], metavar='TIPO=TASA',
+                        help=f"Tasa de un tipo de error, reemplaza la del perfil ({', '.join(TIPOS_ERROR)})")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla (por defecto 42)")
+    parser.add_argument('--motor', choices=sorted(MOTORES), default=None,
+                        help="Escritor de Excel (por defecto xlsxwriter si está instalado)")
+    args = parser.parse_args()
+
+    try:
+        resumen = generar_libro(args.salida, args.matriculas, args.calificaciones, args.perfil,
+                                dict(args.error), args.semilla, args.motor)
+    except ValueError as e:
+        parser.error(str(e))
+
+    tamaño_mb = os.path.getsize(resumen['ruta']) / (1024 * 1024)
+    print(f"✓ {resumen['ruta']} ({tamaño_mb:.1f} MB) en {resumen['duracion_s']:.1f}s")
+    for hoja, total in resumen['filas'].items():
+        print(f"  {hoja}: {total} fila(s)")
+    inyectados = {tipo: total for tipo, total in resumen['errores_inyectados'].items() if total}
+    if inyectados:
+        print("  Errores inyectados: " + ', '.join(f"{tipo}={total}" for tipo, total in inyectados.items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Instrumentación opcional de las etapas de validación y exportación
+Mide duración, filas procesadas y memoria asignada (pico de tracemalloc) de la
+lectura de cada hoja, construir_contexto, validar_hoja y los métodos del
+exportador. Solo registra mientras hay un perfilado activo o un receptor
+suscrito (ej. las métricas de metricas.py); si no, cada punto instrumentado
+cuesta una consulta a una lista vacía.
+
+Uso:
+    with perfilar() as traza:
+        validar_libro('seed.xlsx')
+    print(formatear_resumen(traza.resumen()))
+    traza.guardar('traza.json')   # formato Trace Event (chrome://tracing, Perfetto)
+
+Con varios hilos la memoria de tracemalloc es del proceso completo: el pico de
+una etapa incluye lo que asignen en paralelo otros hilos. Tampoco es fiable con
+varios perfilados a la vez: tracemalloc.reset_peak() reinicia el pico de todo el
+proceso, de modo que cada etapa medida borra el pico que medía otra en curso.
+tracemalloc se inicia con el primer perfilado con memoria y se detiene al
+terminar el último.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+# Receptores de eventos: trazas activas y suscriptores (vacía = instrumentación desactivada)
+_receptores: List[Callable[[Dict[str, Any]], None]] = []
+_lock = threading.Lock()
+_local = threading.local()
+# Perfilados con memoria en curso y si tracemalloc lo inició este módulo
+_perfiles_memoria = 0
+_tracemalloc_propio = False
+
+
+class Traza:
+    """
+    Eventos registrados durante un perfilado
+
+    Args:
+        hilo: Registrar solo los eventos de este hilo (threading.get_ident()); None = todos
+    """
+
+    def __init__(self, hilo: int = None):
+        self.hilo = hilo
+        self.eventos: List[Dict[str, Any]] = []
+        self.inicio = time.perf_counter()
+        self.memoria = False
+
+    def _agregar(self, evento: Dict[str, Any]) -> None:
+        if self.hilo is None or self.hilo == evento['hilo']:
+            self.eventos.append(dict(evento, inicio_s=evento['inicio'] - self.inicio))
+
+    def resumen(self) -> List[Dict[str, Any]]:
+        """
+        Eventos agregados por etapa y nombre, en orden de primera aparición
+
+        Returns:
+            list: dicts con 'etapa', 'nombre', 'llamadas', 'duracion_ms', 'filas' y
+                'memoria_pico_kb' (máximo entre llamadas; None sin tracemalloc)
+        """
+        agregados = {}
+        for evento in self.eventos:
+            clave = (evento['etapa'], evento['nombre'])
+            agregado = agregados.setdefault(clave, {
+                'etapa': evento['etapa'], 'nombre': evento['nombre'], 'llamadas': 0,
+                'duracion_ms': 0.0, 'filas': None, 'memoria_pico_kb': None
+            })
+            agregado['llamadas'] += 1
+            agregado['duracion_ms'] += evento['duracion_ms']
+            if evento['filas'] is not None:
+                agregado['filas'] = (agregado['filas'] or 0) + evento['filas']
+            if evento['memoria_pico_kb'] is not None:
+                agregado['memoria_pico_kb'] = max(agregado['memoria_pico_kb'] or 0, evento['memoria_pico_kb'])
+        for agregado in agregados.values():
+            agregado['duracion_ms'] = round(agregado['duracion_ms'], 3)
+        return list(agregados.values())
+
+    def trace_events(self) -> Dict[str, Any]:
+        """Eventos en formato Trace Event de Chrome (eventos completos 'X', en microsegundos)"""
+        pid = os.getpid()
+        return {
+            'traceEvents': [{
+                'name': f"{evento['etapa']}:{evento['nombre']}" if evento['nombre'] else evento['etapa'],
+                'cat': evento['etapa'],
+                'ph': 'X',
+                'ts': round(evento['inicio_s'] * 1e6, 1),
+                'dur': round(evento['duracion_ms'] * 1e3, 1),
+                'pid': pid,
+                'tid': evento['hilo'],
+                'args': {'filas': evento['filas'], 'memoria_pico_kb': evento['memoria_pico_kb']}
+            } for evento in self.eventos],
+            'displayTimeUnit': 'ms',
+            'otherData': {'resumen': self.resumen()}
+        }
+
+    def guardar(self, ruta: str) -> None:
+        """Escribe la traza en JSON (se abre en chrome://tracing o ui.perfetto.dev)"""
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.trace_events(), f, ensure_ascii=False)
+
+
+def activa() -> bool:
+    """True si hay algún perfilado en curso o receptor suscrito"""
+    return bool(_receptores)
+
+
+def suscribir(receptor: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Registra una función que recibe cada evento medido, en el hilo que lo midió
+
+    El evento es un dict con 'etapa', 'nombre', 'duracion_ms', 'filas',
+    'memoria_pico_kb' (None sin tracemalloc), 'hilo' e 'inicio' (perf_counter).
+    """
+    with _lock:
+        _receptores.append(receptor)
+
+
+def cancelar_suscripcion(receptor: Callable[[Dict[str, Any]], None]) -> None:
+    with _lock:
+        if receptor in _receptores:
+            _receptores.remove(receptor)
+
+
+def _iniciar_memoria() -> None:
+    global _perfiles_memoria, _tracemalloc_propio
+    with _lock:
+        if _perfiles_memoria == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_propio = True
+        _perfiles_memoria += 1
+
+
+def _detener_memoria() -> None:
+    global _perfiles_memoria, _tracemalloc_propio
+    with _lock:
+        _perfiles_memoria -= 1
+        # tracemalloc es del proceso: se detiene solo al terminar el último perfilado
+        if _perfiles_memoria == 0 and _tracemalloc_propio:
+            tracemalloc.stop()
+            _tracemalloc_propio = False
+
+
+@contextmanager
+def perfilar(memoria: bool = True, solo_este_hilo: bool = False):
+    """
+    Activa la instrumentación dentro del bloque with
+
+    Args:
+        memoria: Medir la memoria asignada con tracemalloc (hace más lentas las etapas;
+            los picos no son fiables si hay otros perfilados en curso)
+        solo_este_hilo: Registrar solo los eventos del hilo actual (ej. un trabajo en
+            segundo plano de la app, sin mezclar los de otras sesiones)
+
+    Yields:
+        Traza: con los eventos registrados
+    """
+    traza = Traza(threading.get_ident() if solo_este_hilo else None)
+    if memoria:
+        _iniciar_memoria()
+    traza.memoria = tracemalloc.is_tracing()
+    suscribir(traza._agregar)
+    try:
+        yield traza
+    finally:
+        cancelar_suscripcion(traza._agregar)
+        if memoria:
+            _detener_memoria()
+
+
+def _pila() -> List[Dict[str, Any]]:
+    pila = getattr(_local, 'pila', None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+@contextmanager
+def medir(etapa: str, nombre: str = None, filas: int = None):
+    """
+    Mide un bloque si hay un perfilado activo
+
+    Yields:
+        dict: Registro del evento; el bloque puede asignar 'filas' al conocerlas
+    """
+    if not _receptores:
+        yield {}
+        return
+
+    memoria = tracemalloc.is_tracing()
+    pila = _pila()
+    registro = {'filas': filas, '_pico': 0, '_base': 0}
+    if memoria:
+        actual, pico = tracemalloc.get_traced_memory()
+        # El pico del bloque que nos contiene se conserva antes de reiniciarlo
+        if pila:
+            pila[-1]['_pico'] = max(pila[-1]['_pico'], pico)
+        tracemalloc.reset_peak()
+        registro['_base'] = actual
+    pila.append(registro)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        duracion = time.perf_counter() - inicio
+        pila.pop()
+        memoria_pico_kb = None
+        if memoria and tracemalloc.is_tracing():
+            pico = max(registro['_pico'], tracemalloc.get_traced_memory()[1])
+            memoria_pico_kb = round(max(0, pico - registro['_base']) / 1024, 1)
+            if pila:
+                pila[-1]['_pico'] = max(pila[-1]['_pico'], pico)
+        evento = {
+            'etapa': etapa,
+            'nombre': nombre,
+            'duracion_ms': duracion * 1000,
+            'filas': registro['filas'],
+            'memoria_pico_kb': memoria_pico_kb,
+            'hilo': threading.get_ident(),
+            'inicio': inicio
+        }
+        with _lock:
+            receptores = list(_receptores)
+        for receptor in receptores:
+            receptor(evento)
+
+
+def instrumentar(etapa: str, contar_filas: bool = False):
+    """
+    Decorador: mide cada llamada a la función (nombre = nombre de la función)
+
+    Args:
+        etapa: Etapa de los eventos (ej. 'exportacion')
+        contar_filas: Tomar como filas el largo del resultado (listas de registros,
+            diccionarios por estudiante, DataFrames)
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _receptores:
+                return funcion(*args, **kwargs)
+            with medir(etapa, funcion.__name__) as registro:
+                resultado = funcion(*args, **kwargs)
+                if contar_filas:
+                    registro['filas'] = len(resultado)
+                return resultado
+        return envoltura
+    return decorador
+
+
+def formatear_resumen(resumen: List[Dict[str, Any]]) -> str:
+    """Tabla de texto del resumen de una traza, para la consola"""
+    filas = [("Etapa", "Nombre", "Llamadas", "ms", "Filas", "Pico KB")]
+    for r in resumen:
+        filas.append((
+            r['etapa'], r['nombre'] or '', str(r['llamadas']), f"{r['duracion_ms']:.1f}",
+            '' if r['filas'] is None else str(r['filas']),
+            '' if r['memoria_pico_kb'] is None else f"{r['memoria_pico_kb']:,.0f}"
+        ))
+    anchos = [max(len(fila[i]) for fila in filas) for i in range(len(filas[0]))]
+    lineas = []
+    for n, fila in enumerate(filas):
+        lineas.append('  '.join(valor.ljust(ancho) if i < 2 else valor.rjust(ancho)
+                                for i, (valor, ancho) in enumerate(zip(fila, anchos))))
+        if n == 0:
+            lineas.append('  '.join('-' * ancho for ancho in anchos))
+    return '\n'.join(lineas)
@@ -0,0 +1,308 @@
+"""
+Métricas de operación en formato Prometheus
+Registro en memoria de contadores, medidores e histogramas del proceso de la
+aplicación web, y un servidor HTTP local (hilo de fondo) que los expone en
+/metrics para que Prometheus los recolecte. Solo usa la librería estándar.
+
+Se activa con SEED_METRICAS_PUERTO (ver config.py); app_streamlit.py llama a
+iniciar_servidor_metricas() en cada ejecución del script, y solo la primera
+levanta el servidor. Mientras está activo, las duraciones de lectura,
+validación y exportación se toman de los puntos de instrumentacion.py.
+
+Uso:
+    SEED_METRICAS_PUERTO=9464 python start.py
+    curl http://127.0.0.1:9464/metrics
+"""
+import bisect
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+from instrumentacion import suscribir
+
+# Límites de los histogramas: segundos (de 5 ms a 2 min) y bytes (de 10 KB a 200 MB)
+LIMITES_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+LIMITES_BYTES = (10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000,
+                 10_000_000, 25_000_000, 50_000_000, 100_000_000, 200_000_000)
+
+# Una sesión cuenta como activa si ejecutó el script en estos últimos segundos
+SESION_ACTIVA_S = 300
+
+_REGISTRO: List['_Familia'] = []
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatear_etiquetas(nombres: Tuple[str, ...], valores: Tuple[str, ...], extra: str = '') -> str:
+    pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _formatear_numero(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class _Familia:
+    """Métrica con nombre, ayuda y etiquetas; cada combinación de valores es una serie"""
+
+    tipo = None
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        _REGISTRO.append(self)
+
+    def _clave(self, etiquetas: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+
+    def _muestras(self) -> List[str]:
+        raise NotImplementedError
+
+    def exponer(self) -> str:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        lineas.extend(self._muestras())
+        return '\n'.join(lineas)
+
+
+class Contador(_Familia):
+    """Valor que solo aumenta (ej. aciertos de caché)"""
+
+    tipo = 'counter'
+
+    def inc(self, valor: float = 1, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + valor
+
+    def _muestras(self) -> List[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        return [f"{self.nombre}{_formatear_etiquetas(self.etiquetas, clave)} {_formatear_numero(valor)}"
+                for clave, valor in series]
+
+
+class Medidor(_Familia):
+    """
+    Valor que sube y baja (ej. validaciones en curso)
+
+    Con `funcion` el valor se calcula al exponer las métricas (sin etiquetas).
+    """
+
+    tipo = 'gauge'
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (),
+                 funcion: Callable[[], float] = None):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.funcion = funcion
+
+    def inc(self, valor: float = 1, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + valor
+
+    def dec(self, valor: float = 1, **etiquetas) -> None:
+        self.inc(-valor, **etiquetas)
+
+    def fijar(self, valor: float, **etiquetas) -> None:
+        with self._lock:
+            self._series[self._clave(etiquetas)] = valor
+
+    def _muestras(self) -> List[str]:
+        if self.funcion is not None:
+            valor = self.funcion()
+            return [] if valor is None else [f"{self.nombre} {_formatear_numero(valor)}"]
+        with self._lock:
+            series = sorted(self._series.items())
+        return [f"{self.nombre}{_formatear_etiquetas(self.etiquetas, clave)} {_formatear_numero(valor)}"
+                for clave, valor in series]
+
+
+class Histograma(_Familia):
+    """Distribución de observaciones en cubetas acumuladas (ej. duraciones)"""
+
+    tipo = 'histogram'
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (),
+                 limites: Tuple[float, ...] = LIMITES_SEGUNDOS):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor: float, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        # Cubeta de la observación (la última es +Inf); se acumulan al exponer
+        indice = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = [[0] * (len(self.limites) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def _muestras(self) -> List[str]:
+        with self._lock:
+            series = sorted((clave, (list(cubetas), suma, total))
+                            for clave, (cubetas, suma, total) in self._series.items())
+        lineas = []
+        for clave, (cubetas, suma, total) in series:
+            acumulado = 0
+            for limite, cantidad in zip(self.limites + (float('inf'),), cubetas):
+                acumulado += cantidad
+                etiquetas = _formatear_etiquetas(self.etiquetas, clave, f'le="{_formatear_numero(limite)}"')
+                lineas.append(f"{self.nombre}_bucket{etiquetas} {acumulado}")
+            etiquetas = _formatear_etiquetas(self.etiquetas, clave)
+            lineas.append(f"{self.nombre}_sum{etiquetas} {_formatear_numero(suma)}")
+            lineas.append(f"{self.nombre}_count{etiquetas} {total}")
+        return lineas
+
+
+def memoria_residente_bytes():
+    """Memoria residente actual del proceso (None si la plataforma no la informa)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def memoria_residente_pico_bytes():
+    """Memoria residente pico del proceso (None si la plataforma no la informa)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+
+_sesiones: Dict[str, float] = {}
+_lock_sesiones = threading.Lock()
+
+
+def registrar_sesion(id_sesion: str) -> None:
+    """Marca una sesión de la app como activa (se llama en cada ejecución del script)"""
+    with _lock_sesiones:
+        _sesiones[id_sesion] = time.monotonic()
+
+
+def sesiones_activas() -> int:
+    """Sesiones que ejecutaron el script en los últimos SESION_ACTIVA_S segundos"""
+    limite = time.monotonic() - SESION_ACTIVA_S
+    with _lock_sesiones:
+        for id_sesion in [id_sesion for id_sesion, visto in _sesiones.items() if visto < limite]:
+            del _sesiones[id_sesion]
+        return len(_sesiones)
+
+
+# Métricas de la aplicación
+DURACION_LECTURA = Histograma('seed_lectura_segundos', "Lectura de cada hoja del Excel", ('hoja',))
+DURACION_VALIDACION = Histograma('seed_validacion_hoja_segundos', "Validación de cada hoja", ('hoja',))
+DURACION_EXPORTACION = Histograma('seed_exportacion_segundos', "Métodos del exportador", ('metodo',))
+DURACION_VALIDACION_ARCHIVO = Histograma('seed_validacion_archivo_segundos',
+                                         "Validación completa de un archivo, por resultado", ('resultado',))
+TAMAÑO_CARGA = Histograma('seed_carga_bytes', "Tamaño de los archivos cargados", limites=LIMITES_BYTES)
+VALIDACIONES_EN_CURSO = Medidor('seed_validaciones_en_curso', "Validaciones ejecutándose en segundo plano")
+VALIDACIONES_EN_CURSO.fijar(0)
+SESIONES_ACTIVAS = Medidor('seed_sesiones_activas',
+                           f"Sesiones con actividad en los últimos {SESION_ACTIVA_S} s", funcion=sesiones_activas)
+CACHE_ACIERTOS = Contador('seed_cache_aciertos_total', "Consultas resueltas desde la caché", ('cache',))
+CACHE_FALLOS = Contador('seed_cache_fallos_total', "Consultas que tuvieron que calcularse", ('cache',))
+MEMORIA_RESIDENTE = Medidor('process_resident_memory_bytes', "Memoria residente del proceso",
+                            funcion=memoria_residente_bytes)
+MEMORIA_RESIDENTE_PICO = Medidor('seed_memoria_residente_pico_bytes', "Memoria residente pico del proceso",
+                                 funcion=memoria_residente_pico_bytes)
+
+# Etapas de instrumentacion.py que alimentan cada histograma (etapa -> histograma, etiqueta)
+_HISTOGRAMAS_ETAPA = {
+    'lectura': (DURACION_LECTURA, 'hoja'),
+    'validar_hoja': (DURACION_VALIDACION, 'hoja'),
+    'exportacion': (DURACION_EXPORTACION, 'metodo'),
+}
+
+
+def _registrar_evento(evento: Dict[str, Any]) -> None:
+    destino = _HISTOGRAMAS_ETAPA.get(evento['etapa'])
+    if destino is not None:
+        histograma, etiqueta = destino
+        histograma.observar(evento['duracion_ms'] / 1000, **{etiqueta: evento['nombre']})
+
+
+_calculos = threading.local()
+
+
+def marcar_calculo() -> None:
+    """Se llama dentro de una función cacheada: la consulta en curso fue un fallo de caché"""
+    _calculos.calculado = True
+
+
+def consultar_cache(cache: str, funcion: Callable, *args, **kwargs):
+    """
+    Llama a una función cacheada (que llama a marcar_calculo() al calcular) y
+    cuenta la consulta como acierto o fallo de `cache`
+    """
+    _calculos.calculado = False
+    resultado = funcion(*args, **kwargs)
+    (CACHE_FALLOS if _calculos.calculado else CACHE_ACIERTOS).inc(cache=cache)
+    return resultado
+
+
+def exponer_metricas() -> str:
+    """Todas las métricas en el formato de texto de Prometheus (0.0.4)"""
+    return '\n'.join(familia.exponer() for familia in _REGISTRO) + '\n'
+
+
+class ManejadorMetricas(BaseHTTPRequestHandler):
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404, "Ruta no encontrada")
+            return
+        cuerpo = exponer_metricas().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+_servidor = None
+_lock_servidor = threading.Lock()
+
+
+def iniciar_servidor_metricas(puerto: int, host: str = '127.0.0.1'):
+    """
+    Levanta (una sola vez por proceso) el servidor de /metrics en un hilo de fondo
+
+    Args:
+        puerto: Puerto de escucha; 0 o None no inicia nada
+        host: Dirección de escucha (por defecto solo local)
+
+    Returns:
+        ThreadingHTTPServer o None si las métricas están desactivadas
+    """
+    global _servidor
+    if not puerto:
+        return None
+    with _lock_servidor:
+        if _servidor is None:
+            servidor = ThreadingHTTPServer((host, puerto), ManejadorMetricas)
+            servidor.daemon_threads = True
+            threading.Thread(target=servidor.serve_forever, name='metricas', daemon=True).start()
+            suscribir(_registrar_evento)
+            _servidor = servidor
+    return _servidor
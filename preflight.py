@@ -0,0 +1,207 @@
+"""
+Verificación rápida (solo encabezados) de archivos Excel de semilla
+Comprueba las hojas requeridas y la fila de encabezados (fila 2) de cada hoja
+leyendo directamente el XML del .xlsx con la librería estándar: no importa
+pandas ni openpyxl y no lee las filas de datos, por lo que tarda milisegundos
+incluso en archivos con cientos de miles de filas.
+"""
+import posixpath
+import re
+import zipfile
+from typing import Dict, List
+from xml.etree import ElementTree
+
+from config import HOJAS_REQUERIDAS, COLUMNAS_REQUERIDAS
+
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PAQUETE = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Fila de encabezados de las hojas (header=1 en pandas)
+FILA_ENCABEZADOS = 2
+
+
+def _indice_columna(referencia: str) -> int:
+    """'C2' -> 2 (base 0)"""
+    indice = 0
+    for letra in re.match(r'[A-Z]+', referencia).group():
+        indice = indice * 26 + ord(letra) - ord('A') + 1
+    return indice - 1
+
+
+def _rutas_hojas(libro: zipfile.ZipFile) -> Dict[str, str]:
+    """Nombre de hoja -> ruta del XML dentro del .xlsx, en el orden del libro"""
+    destinos = {}
+    with libro.open('xl/_rels/workbook.xml.rels') as f:
+        for relacion in ElementTree.parse(f).getroot().iter(f'{_NS_PAQUETE}Relationship'):
+            destino = relacion.get('Target')
+            destinos[relacion.get('Id')] = (destino.lstrip('/') if destino.startswith('/')
+                                            else posixpath.normpath(posixpath.join('xl', destino)))
+    rutas = {}
+    with libro.open('xl/workbook.xml') as f:
+        for hoja in ElementTree.parse(f).getroot().iter(f'{_NS}sheet'):
+            rutas[hoja.get('name')] = destinos.get(hoja.get(f'{_NS_REL}id'))
+    return rutas
+
+
+def _leer_fila(libro: zipfile.ZipFile, ruta: str, numero_fila: int) -> List[tuple]:
+    """
+    Lee una fila de una hoja sin recorrer el resto del archivo
+
+    Returns:
+        Lista de (tipo, valor) por columna; en las celdas de texto compartido el
+        valor es el índice en sharedStrings.xml
+    """
+    celdas = {}
+    with libro.open(ruta) as f:
+        for _, elemento in ElementTree.iterparse(f, events=('end',)):
+            if elemento.tag != f'{_NS}row':
+                continue
+            fila = int(elemento.get('r', 0))
+            if fila == numero_fila:
+                for posicion, celda in enumerate(elemento.iter(f'{_NS}c')):
+                    referencia = celda.get('r')
+                    columna = _indice_columna(referencia) if referencia else posicion
+                    tipo = celda.get('t', 'n')
+                    if tipo == 'inlineStr':
+                        valor = ''.join(t.text or '' for t in celda.iter(f'{_NS}t'))
+                    else:
+                        v = celda.find(f'{_NS}v')
+                        valor = v.text if v is not None else None
+                    celdas[columna] = (tipo, valor)
+            if fila >= numero_fila:
+                break
+            elemento.clear()
+    if not celdas:
+        return []
+    return [celdas.get(i, ('n', None)) for i in range(max(celdas) + 1)]
+
+
+def _textos_compartidos(libro: zipfile.ZipFile, indices: set) -> Dict[int, str]:
+    """Lee de sharedStrings.xml solo los textos indicados (se detiene en el mayor)"""
+    textos = {}
+    if not indices or 'xl/sharedStrings.xml' not in libro.namelist():
+        return textos
+    maximo = max(indices)
+    with libro.open('xl/sharedStrings.xml') as f:
+        indice = 0
+        for _, elemento in ElementTree.iterparse(f, events=('end',)):
+            if elemento.tag != f'{_NS}si':
+                continue
+            if indice in indices:
+                # Texto simple (<t>) o enriquecido (<r><t>); se omite la guía fonética (<rPh>)
+                textos[indice] = ''.join(
+                    t.text or '' for hijo in elemento if hijo.tag != f'{_NS}rPh'
+                    for t in ([hijo] if hijo.tag == f'{_NS}t' else hijo.iter(f'{_NS}t'))
+                )
+            if indice >= maximo:
+                break
+            indice += 1
+            elemento.clear()
+    return textos
+
+
+def leer_encabezados(archivo_excel, numero_fila: int = FILA_ENCABEZADOS) -> Dict[str, List[str]]:
+    """
+    Lee la fila de encabezados de todas las hojas de un .xlsx
+
+    Args:
+        archivo_excel: Ruta o archivo binario abierto (.xlsx)
+        numero_fila: Fila de encabezados (base 1)
+
+    Returns:
+        dict: Nombre de hoja -> lista de encabezados (texto; '' en celdas vacías)
+    """
+    with zipfile.ZipFile(archivo_excel) as libro:
+        filas = {hoja: _leer_fila(libro, ruta, numero_fila) if ruta else []
+                 for hoja, ruta in _rutas_hojas(libro).items()}
+        compartidos = _textos_compartidos(libro, {
+            int(valor) for fila in filas.values() for tipo, valor in fila if tipo == 's' and valor is not None
+        })
+
+    def texto(tipo, valor):
+        if valor is None:
+            return ''
+        if tipo == 's':
+            return compartidos.get(int(valor), '')
+        if tipo == 'n' and re.fullmatch(r'-?\d+\.0+', valor):
+            return valor.split('.')[0]
+        return valor
+
+    return {hoja: [texto(tipo, valor) for tipo, valor in fila] for hoja, fila in filas.items()}
+
+
+def firmas_hojas(archivo_excel) -> Dict[str, tuple]:
+    """
+    Huella de cada hoja de un .xlsx sin descomprimir nada: (CRC-32, tamaño) de su
+    XML según el directorio central del ZIP
+
+    Una hoja cuyos datos no cambian conserva su XML, y por tanto su huella, aunque
+    se edite otra hoja del libro.
+
+    Returns:
+        dict: Nombre de hoja -> (crc, tamaño)
+    """
+    with zipfile.ZipFile(archivo_excel) as libro:
+        firmas = {}
+        for hoja, ruta in _rutas_hojas(libro).items():
+            info = libro.getinfo(ruta) if ruta else None
+            firmas[hoja] = (info.CRC, info.file_size) if info else None
+        return firmas
+
+
+def verificar_encabezados(archivo_excel) -> Dict:
+    """
+    Verificación previa de un archivo: hojas requeridas y columnas de cada hoja
+
+    Args:
+        archivo_excel: Ruta o archivo binario abierto (.xlsx)
+
+    Returns:
+        dict: Resultado con 'valido', 'errores', 'advertencias' y 'hojas'
+            (por hoja: 'existe', 'estructura_valida', 'columnas_faltantes')
+    """
+    errores = []
+    advertencias = []
+    hojas = {}
+
+    try:
+        encabezados = leer_encabezados(archivo_excel)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        return {
+            'valido': False,
+            'errores': [f"No es un archivo .xlsx válido: {e}"],
+            'advertencias': advertencias,
+            'hojas': hojas
+        }
+
+    for hoja in HOJAS_REQUERIDAS:
+        if hoja == "Instrucciones":
+            continue
+        resultado_hoja = {'existe': hoja in encabezados, 'estructura_valida': False, 'columnas_faltantes': []}
+        if hoja not in encabezados:
+            errores.append(f"La hoja '{hoja}' no existe")
+        elif hoja == "Sede principal":
+            # Estructura transpuesta, solo se valida que existe
+            resultado_hoja['estructura_valida'] = True
+        else:
+            columnas_requeridas = COLUMNAS_REQUERIDAS[hoja]
+            presentes = encabezados[hoja]
+            resultado_hoja['estructura_valida'] = presentes[:len(columnas_requeridas)] == columnas_requeridas
+            if not resultado_hoja['estructura_valida']:
+                resultado_hoja['columnas_faltantes'] = [col for col in columnas_requeridas if col not in presentes]
+                detalle = (f"faltan: {', '.join(resultado_hoja['columnas_faltantes'])}"
+                           if resultado_hoja['columnas_faltantes'] else "columnas en otro orden")
+                errores.append(f"{hoja}: estructura de columnas incorrecta ({detalle})")
+        hojas[hoja] = resultado_hoja
+
+    hojas_extra = [hoja for hoja in encabezados if hoja not in HOJAS_REQUERIDAS]
+    if hojas_extra:
+        advertencias.append(f"Hay {len(hojas_extra)} hoja(s) adicional(es): {', '.join(hojas_extra)}")
+
+    return {
+        'valido': len(errores) == 0,
+        'errores': errores,
+        'advertencias': advertencias,
+        'hojas': hojas
+    }
@@ -0,0 +1,174 @@
+"""
+Reportes de incidencias legibles por máquina: JSONL y SARIF 2.1.0
+Los escritores reciben cada hoja al terminar de validarse (ver el parámetro
+al_validar_hoja de validador_core.validar_libro) y escriben sus incidencias de
+inmediato, sin acumular el reporte completo en memoria.
+
+Cada incidencia lleva archivo, hoja, fila, columna, regla, severidad y mensaje.
+Una incidencia que afecta varias filas se escribe una vez por fila; las que
+aplican a la hoja completa (ej. hoja vacía) se escriben con fila nula.
+
+Uso:
+    with abrir_reporte('jsonl', 'reporte.jsonl', 'seed.xlsx') as reporte:
+        validar_libro('seed.xlsx', al_validar_hoja=reporte.escribir_hoja)
+"""
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from config import COLUMNAS_REQUERIDAS
+from resultados import ResultadoHoja
+
+NOMBRE_HERRAMIENTA = "validador-seed"
+
+# Severidad de las incidencias -> nivel SARIF
+NIVELES_SARIF = {'error': 'error', 'advertencia': 'warning'}
+
+
+def iterar_registros(archivo: str, hoja: str, resultado_hoja: ResultadoHoja) -> Iterator[Dict[str, Any]]:
+    """
+    Registros planos (uno por fila afectada) de las incidencias de una hoja
+
+    Args:
+        archivo: Ruta del archivo validado
+        hoja: Nombre de la hoja
+        resultado_hoja: Resultado de validador_core.validar_hoja_completa
+
+    Yields:
+        dict: 'archivo', 'hoja', 'fila', 'columna', 'regla', 'severidad' y 'mensaje'
+    """
+    for incidencia in resultado_hoja.incidencias:
+        for fila in incidencia['filas'] or [None]:
+            yield {
+                'archivo': archivo,
+                'hoja': hoja,
+                'fila': fila,
+                'columna': incidencia['columna'],
+                'regla': incidencia['regla'],
+                'severidad': incidencia['severidad'],
+                'mensaje': incidencia['mensaje']
+            }
+
+
+def _letra_columna(indice: int) -> str:
+    """0 -> 'A', 27 -> 'AB'"""
+    letras = ''
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(ord('A') + resto) + letras
+    return letras
+
+
+def _indice_columna(hoja: str, columna: str):
+    """Posición (base 0) de una columna requerida en su hoja, o None"""
+    columnas = COLUMNAS_REQUERIDAS.get(hoja, [])
+    return columnas.index(columna) if columna in columnas else None
+
+
+class EscritorJSONL:
+    """Escribe una línea JSON por incidencia y fila afectada"""
+
+    def __init__(self, destino, archivo: str):
+        self.destino = destino
+        self.archivo = archivo
+        self.total = 0
+
+    def escribir_hoja(self, hoja: str, resultado_hoja: ResultadoHoja) -> None:
+        for registro in iterar_registros(self.archivo, hoja, resultado_hoja):
+            self.destino.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            self.total += 1
+        self.destino.flush()
+
+    def cerrar(self) -> None:
+        self.destino.flush()
+
+
+class EscritorSARIF:
+    """
+    Escribe un documento SARIF 2.1.0 de forma incremental
+
+    Los resultados se escriben a medida que llegan; las reglas usadas, que SARIF
+    declara en tool.driver.rules, se escriben al cerrar (el orden de las claves
+    de un objeto JSON no importa).
+    """
+
+    def __init__(self, destino, archivo: str):
+        self.destino = destino
+        self.archivo = archivo
+        self.total = 0
+        self.reglas = {}
+        self.destino.write('{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", '
+                           '"version": "2.1.0", "runs": [{"results": [\n')
+
+    def _resultado(self, registro: Dict[str, Any]) -> Dict[str, Any]:
+        region = {}
+        referencia = registro['hoja']
+        indice = _indice_columna(registro['hoja'], registro['columna'])
+        if registro['fila'] is not None:
+            region['startLine'] = registro['fila']
+            if indice is not None:
+                region['startColumn'] = indice + 1
+                referencia += f"!{_letra_columna(indice)}{registro['fila']}"
+            else:
+                referencia += f"!{registro['fila']}:{registro['fila']}"
+        ubicacion_fisica = {'artifactLocation': {'uri': self.archivo.replace(os.sep, '/')}}
+        if region:
+            ubicacion_fisica['region'] = region
+        return {
+            'ruleId': registro['regla'],
+            'level': NIVELES_SARIF.get(registro['severidad'], 'note'),
+            'message': {'text': registro['mensaje']},
+            'locations': [{
+                'physicalLocation': ubicacion_fisica,
+                'logicalLocations': [{'name': registro['hoja'], 'fullyQualifiedName': referencia}]
+            }],
+            'properties': {
+                'hoja': registro['hoja'],
+                'fila': registro['fila'],
+                'columna': registro['columna']
+            }
+        }
+
+    def escribir_hoja(self, hoja: str, resultado_hoja: ResultadoHoja) -> None:
+        for registro in iterar_registros(self.archivo, hoja, resultado_hoja):
+            self.reglas.setdefault(registro['regla'], {'id': registro['regla']})
+            separador = ',\n' if self.total else ''
+            self.destino.write(separador + json.dumps(self._resultado(registro), ensure_ascii=False))
+            self.total += 1
+        self.destino.flush()
+
+    def cerrar(self) -> None:
+        herramienta = {'driver': {'name': NOMBRE_HERRAMIENTA, 'rules': list(self.reglas.values())}}
+        self.destino.write('\n], "tool": ' + json.dumps(herramienta, ensure_ascii=False) +
+                           ', "artifacts": ' + json.dumps([{'location': {'uri': self.archivo.replace(os.sep, '/')}}],
+                                                          ensure_ascii=False) + '}]}\n')
+        self.destino.flush()
+
+
+ESCRITORES = {
+    'jsonl': EscritorJSONL,
+    'sarif': EscritorSARIF
+}
+
+
+@contextmanager
+def abrir_reporte(formato: str, ruta: str, archivo: str):
+    """
+    Abre un reporte de incidencias en disco
+
+    Args:
+        formato: 'jsonl' o 'sarif'
+        ruta: Archivo de destino
+        archivo: Ruta del Excel validado (se incluye en cada incidencia)
+
+    Yields:
+        EscritorJSONL o EscritorSARIF (se cierra al salir del bloque with)
+    """
+    with open(ruta, 'w', encoding='utf-8') as f:
+        escritor = ESCRITORES[formato](f, archivo)
+        try:
+            yield escritor
+        finally:
+            escritor.cerrar()
@@ -0,0 +1,146 @@
+"""
+Resultados de validación por hoja y por libro
+Los validadores de cada hoja (validadores/) siguen retornando dicts con
+'valido', 'errores', 'advertencias' e 'incidencias'; validador_core los reúne en
+un ResultadoHoja por hoja y en un ResultadoLibro por archivo, que usan la app
+web, los scripts de análisis, el CLI por lotes y los reportes.
+
+Son dataclasses con __slots__ (sin __dict__ por instancia) que se serializan con
+pickle como una tupla de campos, de modo que un proceso de trabajo puede
+devolver resultados sin más costo que el de sus mensajes e incidencias. Los
+resultados de partes de un libro (hojas validadas en procesos distintos, o
+bloques de filas de una misma hoja) se combinan con combinar().
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True)
+class ResultadoHoja:
+    """
+    Resultado de una hoja: existencia, estructura, contenido, mensajes e incidencias
+
+    'incidencias' tiene un registro por mensaje, con regla, columna y filas de
+    Excel (ver validadores/incidencias.py).
+    """
+    nombre: str
+    existe: bool = True
+    estructura_valida: bool = False
+    contenido_valido: bool = False
+    errores: List[str] = field(default_factory=list)
+    advertencias: List[str] = field(default_factory=list)
+    incidencias: List[Dict[str, Any]] = field(default_factory=list)
+    num_filas: int = 0
+
+    @property
+    def num_errores(self) -> int:
+        return len(self.errores)
+
+    @property
+    def num_advertencias(self) -> int:
+        return len(self.advertencias)
+
+    @property
+    def valida(self) -> bool:
+        """Sin errores, con la estructura y el contenido válidos"""
+        return not self.errores and self.estructura_valida and self.contenido_valido
+
+    def combinar(self, otro: 'ResultadoHoja') -> 'ResultadoHoja':
+        """
+        Une dos resultados de la misma hoja (ej. bloques de filas validados por separado)
+
+        Returns:
+            ResultadoHoja: Nuevo resultado; es válido solo si ambos lo son, los
+                mensajes e incidencias se concatenan y las filas se suman
+        """
+        if otro.nombre != self.nombre:
+            raise ValueError(f"No se pueden combinar resultados de hojas distintas: "
+                             f"'{self.nombre}' y '{otro.nombre}'")
+        return ResultadoHoja(
+            self.nombre,
+            self.existe and otro.existe,
+            self.estructura_valida and otro.estructura_valida,
+            self.contenido_valido and otro.contenido_valido,
+            self.errores + otro.errores,
+            self.advertencias + otro.advertencias,
+            self.incidencias + otro.incidencias,
+            self.num_filas + otro.num_filas
+        )
+
+    def a_dict(self, incidencias: bool = True) -> Dict[str, Any]:
+        """Campos como dict de tipos nativos (para los resúmenes JSON)"""
+        datos = {
+            'nombre': self.nombre,
+            'existe': self.existe,
+            'estructura_valida': self.estructura_valida,
+            'contenido_valido': self.contenido_valido,
+            'errores': self.errores,
+            'advertencias': self.advertencias,
+            'num_filas': self.num_filas
+        }
+        if incidencias:
+            datos['incidencias'] = self.incidencias
+        return datos
+
+    def __reduce__(self):
+        return (ResultadoHoja, (self.nombre, self.existe, self.estructura_valida, self.contenido_valido,
+                                self.errores, self.advertencias, self.incidencias, self.num_filas))
+
+
+@dataclass(slots=True)
+class ResultadoLibro:
+    """
+    Resultados de todas las hojas de un archivo, con los totales acumulados
+
+    'hojas' (DataFrames leídos) y 'contexto' se conservan para exportar sin
+    releer el archivo. Ninguno de los dos se serializa con pickle: un proceso de
+    trabajo devuelve solo los resultados, y los DataFrames y el contexto (con sus
+    vocabularios indexados) quedan en el proceso que los construyó.
+    """
+    detalles: Dict[str, ResultadoHoja] = field(default_factory=dict)
+    total_errores: int = 0
+    total_advertencias: int = 0
+    hojas: Dict[str, Any] = field(default_factory=dict)
+    contexto: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def valido(self) -> bool:
+        return self.total_errores == 0
+
+    @property
+    def hojas_validas(self) -> List[str]:
+        return [nombre for nombre, hoja in self.detalles.items() if hoja.valida]
+
+    @property
+    def hojas_con_errores(self) -> List[str]:
+        return [nombre for nombre, hoja in self.detalles.items() if hoja.errores]
+
+    def agregar(self, resultado_hoja: ResultadoHoja) -> None:
+        """
+        Agrega el resultado de una hoja y actualiza los totales; si la hoja ya
+        tenía resultado, se combinan (ver ResultadoHoja.combinar)
+        """
+        anterior = self.detalles.get(resultado_hoja.nombre)
+        if anterior is not None:
+            self.total_errores -= anterior.num_errores
+            self.total_advertencias -= anterior.num_advertencias
+            resultado_hoja = anterior.combinar(resultado_hoja)
+        self.detalles[resultado_hoja.nombre] = resultado_hoja
+        self.total_errores += resultado_hoja.num_errores
+        self.total_advertencias += resultado_hoja.num_advertencias
+
+    def combinar(self, otro: 'ResultadoLibro') -> 'ResultadoLibro':
+        """
+        Une los resultados de dos partes del mismo libro (ej. hojas validadas en procesos distintos)
+
+        Returns:
+            ResultadoLibro: Nuevo resultado con las hojas de ambos, en orden de
+                aparición; las hojas presentes en los dos se combinan
+        """
+        combinado = ResultadoLibro(hojas={**self.hojas, **otro.hojas}, contexto={**self.contexto, **otro.contexto})
+        for resultado_hoja in (*self.detalles.values(), *otro.detalles.values()):
+            combinado.agregar(resultado_hoja)
+        return combinado
+
+    def __reduce__(self):
+        return (ResultadoLibro, (self.detalles, self.total_errores, self.total_advertencias, {}, {}))
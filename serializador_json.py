@@ -0,0 +1,333 @@
+"""
+Serialización incremental de documentos JSON
+Con el serializador 'json' genera exactamente los mismos bytes que
+json.dump(..., ensure_ascii=False, indent=2), pero registro a registro,
+sin construir el texto completo en memoria.
+
+El codificador es intercambiable: 'json' (stdlib, por defecto) u 'orjson'
+(opcional, mucho más rápido; ver SERIALIZADORES).
+Ambos producen los mismos valores, salvo los float NaN sin normalizar: json
+escribe NaN (no es JSON válido) y orjson null; los exportadores los convierten
+antes con a_valor_json.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import unicodedata
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+INDENTACION = 2
+
+
+def a_valor_json(valor: Any) -> Any:
+    """
+    Convierte escalares numpy/pandas a tipos nativos de Python
+    
+    NaN, NaT y pd.NA se convierten en None para que el resultado sea JSON válido
+    y equivalente con cualquier codificador.
+    """
+    if valor is None or valor is pd.NaT or valor is pd.NA:
+        return None
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and valor != valor:
+        return None
+    return valor
+
+
+def default_json(valor: Any) -> Any:
+    """
+    Hook 'default' para tipos que los codificadores no soportan de forma nativa
+
+    Los escalares numpy y las fechas siempre pasan por aquí (también con orjson),
+    de modo que ambos codificadores producen los mismos valores.
+    """
+    if isinstance(valor, (np.generic, type(pd.NaT), type(pd.NA))):
+        valor = a_valor_json(valor)
+        # np.datetime64.item() devuelve datetime/date: se serializa igual que una fecha
+        if not isinstance(valor, (datetime, date)):
+            return valor
+    if isinstance(valor, (datetime, date)):
+        return str(valor)
+    raise TypeError(f"Object of type {type(valor).__name__} is not JSON serializable")
+
+
+class SerializadorStdlib:
+    """Codificador basado en el módulo json de la librería estándar"""
+    nombre = 'json'
+    
+    def __init__(self):
+        self._encoder = json.JSONEncoder(ensure_ascii=False, indent=INDENTACION, default=default_json)
+        self._encoder_linea = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=default_json)
+    
+    def encode(self, valor: Any) -> str:
+        return self._encoder.encode(valor)
+    
+    def encode_linea(self, valor: Any) -> bytes:
+        """Serializa en una sola línea compacta (UTF-8), para NDJSON"""
+        return self._encoder_linea.encode(valor).encode('utf-8')
+    
+    def iterencode(self, valor: Any) -> Iterator[str]:
+        return self._encoder.iterencode(valor)
+
+
+class SerializadorOrjson:
+    """
+    Codificador basado en orjson (misma indentación)
+
+    Los escalares numpy y las fechas se delegan en default_json en lugar de usar
+    la serialización nativa de orjson (que escribe fechas ISO con 'T' y float32
+    con otra precisión), para producir los mismos valores que 'json'.
+    """
+    nombre = 'orjson'
+    
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("El serializador 'orjson' requiere instalar el paquete orjson (pip install orjson)")
+        self._opciones_linea = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        self._opciones = orjson.OPT_INDENT_2 | self._opciones_linea
+    
+    def encode(self, valor: Any) -> str:
+        return orjson.dumps(valor, default=default_json, option=self._opciones).decode('utf-8')
+    
+    def encode_linea(self, valor: Any) -> bytes:
+        """Serializa en una sola línea compacta (UTF-8), para NDJSON"""
+        return orjson.dumps(valor, default=default_json, option=self._opciones_linea)
+    
+    def iterencode(self, valor: Any) -> Iterator[str]:
+        yield self.encode(valor)
+
+
+# Mapa de serializadores disponibles por nombre
+SERIALIZADORES = {
+    'json': SerializadorStdlib,
+    'orjson': SerializadorOrjson
+}
+
+
+def obtener_serializador(nombre: str = 'json'):
+    """
+    Devuelve una instancia del serializador pedido
+    
+    Args:
+        nombre: 'json', 'orjson' o 'auto' (orjson si está instalado, si no json)
+    """
+    if nombre == 'auto':
+        nombre = 'orjson' if orjson is not None else 'json'
+    if nombre not in SERIALIZADORES:
+        raise ValueError(f"Serializador desconocido: {nombre}. Opciones: {', '.join(SERIALIZADORES)}, auto")
+    return SERIALIZADORES[nombre]()
+
+
+_serializador_defecto = SerializadorStdlib()
+
+
+def _dumps_anidado(valor: Any, serializador) -> str:
+    """Serializa un valor ya indentado un nivel dentro de su contenedor"""
+    texto = serializador.encode(valor)
+    # Los codificadores escapan los saltos de línea dentro de strings, así que
+    # los '\n' reales solo pueden ser parte de la estructura
+    return texto.replace('\n', '\n' + ' ' * INDENTACION)
+
+
+def _clave_json(clave: Any) -> str:
+    """Serializa una clave de objeto igual que json (claves no string se convierten)"""
+    if not isinstance(clave, str):
+        clave = str(clave)
+    return json.dumps(clave, ensure_ascii=False)
+
+
+def iter_lista_json(registros: Iterable[Any], serializador=None) -> Iterator[str]:
+    """
+    Serializa una lista JSON registro a registro
+
+    Args:
+        registros: Iterable (puede ser un generador) de registros serializables
+        serializador: Serializador a usar (por defecto json de la librería estándar)
+
+    Yields:
+        Fragmentos de texto que concatenados forman la lista completa
+    """
+    serializador = serializador or _serializador_defecto
+    vacia = True
+    for registro in registros:
+        yield ('[\n  ' if vacia else ',\n  ') + _dumps_anidado(registro, serializador)
+        vacia = False
+    yield '[]' if vacia else '\n]'
+
+
+def iter_objeto_json(pares: Iterable[Tuple[Any, Any]], serializador=None) -> Iterator[str]:
+    """
+    Serializa un objeto JSON par a par
+
+    Args:
+        pares: Iterable (puede ser un generador) de tuplas (clave, valor)
+        serializador: Serializador a usar (por defecto json de la librería estándar)
+
+    Yields:
+        Fragmentos de texto que concatenados forman el objeto completo
+    """
+    serializador = serializador or _serializador_defecto
+    vacio = True
+    for clave, valor in pares:
+        yield ('{\n  ' if vacio else ',\n  ') + _clave_json(clave) + ': ' + _dumps_anidado(valor, serializador)
+        vacio = False
+    yield '{}' if vacio else '\n}'
+
+
+def iter_valor_json(valor: Any, serializador=None) -> Iterator[str]:
+    """Serializa un valor ya construido con el codificador incremental del serializador"""
+    return (serializador or _serializador_defecto).iterencode(valor)
+
+
+def escribir_json(fragmentos: Iterable[str], destino) -> None:
+    """
+    Escribe fragmentos JSON en un archivo de texto abierto
+
+    Args:
+        fragmentos: Iterable de fragmentos de texto
+        destino: Archivo abierto en modo texto (UTF-8)
+    """
+    for fragmento in fragmentos:
+        destino.write(fragmento)
+
+
+def escribir_json_zip(fragmentos: Iterable[str], zip_file, nombre_archivo: str) -> None:
+    """
+    Escribe fragmentos JSON directamente en una entrada de un ZIP abierto
+
+    Args:
+        fragmentos: Iterable de fragmentos de texto
+        zip_file: zipfile.ZipFile abierto en modo escritura
+        nombre_archivo: Nombre de la entrada dentro del ZIP
+    """
+    with zip_file.open(nombre_archivo, 'w') as entrada:
+        with io.TextIOWrapper(entrada, encoding='utf-8', newline='') as texto:
+            escribir_json(fragmentos, texto)
+
+
+def nombre_seguro(texto: str) -> str:
+    """Convierte un texto (ej. nombre de sede) en un fragmento seguro para nombres de archivo"""
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    texto = re.sub(r'[^A-Za-z0-9]+', '_', texto).strip('_').lower()
+    return texto or 'sin_valor'
+
+
+class EscritorNDJSON:
+    """
+    Escribe registros como JSON delimitado por saltos de línea (NDJSON), opcionalmente
+    repartidos en varios archivos (shards) por partición (ej. sede) y/o cada N registros.
+    
+    Cada shard se describe con su archivo, número de registros, tamaño y SHA-256,
+    de forma que el backend pueda cargarlos en paralelo y reintentar uno solo.
+    """
+    
+    def __init__(self, output_dir: str, prefijo: str, serializador=None,
+                 registros_por_archivo: Optional[int] = None):
+        """
+        Args:
+            output_dir: Directorio donde se crean los shards
+            prefijo: Prefijo de los archivos (ej. 'estudiantes')
+            serializador: Serializador a usar (por defecto json de la librería estándar)
+            registros_por_archivo: Máximo de registros por shard (None = sin límite)
+        """
+        self.output_dir = output_dir
+        self.prefijo = prefijo
+        self.serializador = serializador or _serializador_defecto
+        self.registros_por_archivo = registros_por_archivo
+        self._abiertos = {}   # partición -> shard abierto
+        self._slugs = {}      # partición -> fragmento de nombre de archivo único
+        self._contadores = {}  # partición -> número de shards creados
+        self.shards = []
+        os.makedirs(output_dir, exist_ok=True)
+    
+    def _nombre_shard(self, particion) -> str:
+        if particion not in self._slugs:
+            slug = nombre_seguro(particion) if particion is not None else None
+            # Evitar que dos particiones distintas generen el mismo nombre (ej. 'Sede 1'
+            # y 'sede-1'); el sufijo se prueba contra todos los nombres ya usados
+            if slug is not None:
+                usados = set(self._slugs.values())
+                base, n = slug, 1
+                while slug in usados:
+                    n += 1
+                    slug = f"{base}_{n}"
+            self._slugs[particion] = slug
+        self._contadores[particion] = self._contadores.get(particion, 0) + 1
+        partes = [self.prefijo]
+        if self._slugs[particion] is not None:
+            partes.append(self._slugs[particion])
+        partes.append(f"{self._contadores[particion]:05d}")
+        return '-'.join(partes) + '.ndjson'
+    
+    def _abrir(self, particion) -> Dict[str, Any]:
+        nombre = self._nombre_shard(particion)
+        shard = {
+            'archivo': nombre,
+            'particion': particion,
+            'registros': 0,
+            'bytes': 0,
+            'sha256': hashlib.sha256(),
+            'f': open(os.path.join(self.output_dir, nombre), 'wb')
+        }
+        self._abiertos[particion] = shard
+        return shard
+    
+    def _cerrar_shard(self, particion) -> None:
+        shard = self._abiertos.pop(particion)
+        shard['f'].close()
+        self.shards.append({
+            'archivo': shard['archivo'],
+            'particion': shard['particion'],
+            'registros': shard['registros'],
+            'bytes': shard['bytes'],
+            'sha256': shard['sha256'].hexdigest()
+        })
+    
+    def escribir(self, registro: Any, particion: Any = None) -> None:
+        """Escribe un registro en el shard de su partición (None = sin partición)"""
+        shard = self._abiertos.get(particion) or self._abrir(particion)
+        linea = self.serializador.encode_linea(registro) + b'\n'
+        shard['f'].write(linea)
+        shard['sha256'].update(linea)
+        shard['registros'] += 1
+        shard['bytes'] += len(linea)
+        if self.registros_por_archivo and shard['registros'] >= self.registros_por_archivo:
+            self._cerrar_shard(particion)
+    
+    def cerrar(self) -> List[Dict[str, Any]]:
+        """Cierra los shards abiertos y retorna su descripción para el manifiesto"""
+        for particion in list(self._abiertos):
+            self._cerrar_shard(particion)
+        return sorted(self.shards, key=lambda s: s['archivo'])
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def describir_archivo(ruta: str, nombre: str) -> Dict[str, Any]:
+    """Describe un archivo ya escrito (tamaño y SHA-256) con el formato de los shards"""
+    sha256 = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(bloque)
+    return {
+        'archivo': nombre,
+        'particion': None,
+        'bytes': os.path.getsize(ruta),
+        'sha256': sha256.hexdigest()
+    }
@@ -0,0 +1,403 @@
+"""
+Servicio HTTP local de validación y exportación de archivos Excel de semilla
+Recibe archivos por HTTP, los guarda en disco a medida que llegan y los valida
+(y opcionalmente exporta a JSON) en un pool de procesos, con una cola acotada
+de trabajos en espera. Solo usa la librería estándar.
+
+Uso:
+    python servicio_http.py --puerto 8000 --workers 4 --max-cola 32
+
+Endpoints:
+    POST   /trabajos?nombre=seed.xlsx&exportar=1   Cuerpo: el archivo (.xlsx) tal cual.
+                                                   202 con el id del trabajo; 503 si la cola está llena
+    GET    /trabajos/<id>                          Estado: en_cola, procesando, terminado o fallo
+    GET    /trabajos/<id>/resultado                Resumen de validación (409 si aún no termina)
+    GET    /trabajos/<id>/archivos/<archivo>.json  Archivo exportado (con exportar=1 y archivo válido)
+    DELETE /trabajos/<id>                          Elimina el trabajo y sus archivos
+    GET    /salud                                  Workers, trabajos en cola y en proceso, reinicios del pool
+
+La validación de cada trabajo es la de validar_lote.procesar_archivo
+(construir_contexto, validadores por hoja y ExcelToJSONExporter).
+"""
+import argparse
+import json
+import os
+import queue
+import re
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlsplit
+
+from config import SERVICIO_WORKERS, SERVICIO_MAX_COLA, SERVICIO_MAX_MB, SERVICIO_RETENCION_S
+from validar_lote import procesar_archivo
+
+TAMAÑO_BLOQUE = 1024 * 1024
+
+EN_COLA = 'en_cola'
+PROCESANDO = 'procesando'
+TERMINADO = 'terminado'
+FALLO = 'fallo'
+
+
+class ColaLlena(Exception):
+    """No hay espacio en la cola de trabajos"""
+
+
+class ServicioValidacion:
+    """
+    Cola acotada de trabajos y pool de procesos que los valida
+
+    Cada uno de los `workers` hilos despachadores toma un trabajo de la cola, lo
+    envía al pool y espera el resultado, de modo que el estado 'procesando' es
+    exacto y el pool nunca tiene más trabajos que procesos.
+
+    Si un proceso del pool muere (ej. sin memoria con un archivo muy grande), el
+    pool queda inutilizable: los trabajos en curso terminan en fallo y el pool se
+    reemplaza por uno nuevo para los siguientes (ver salud()).
+    """
+
+    def __init__(self, directorio: str, workers: int = SERVICIO_WORKERS,
+                 max_cola: int = SERVICIO_MAX_COLA, retencion_s: int = SERVICIO_RETENCION_S):
+        self.directorio = directorio
+        self.workers = max(1, workers)
+        self.retencion_s = retencion_s
+        self.trabajos = {}
+        self._lock = threading.Lock()
+        self._cola = queue.Queue(maxsize=max(1, max_cola))
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.reinicios_pool = 0
+        self.ultimo_reinicio_pool = None
+        self._despachadores = [threading.Thread(target=self._despachar, daemon=True) for _ in range(self.workers)]
+        for hilo in self._despachadores:
+            hilo.start()
+
+    def nuevo_trabajo(self, nombre: str, exportar: bool) -> Dict[str, Any]:
+        """Registra un trabajo y crea su directorio (el archivo se guarda después con encolar)"""
+        self._purgar()
+        id_trabajo = uuid.uuid4().hex
+        directorio = os.path.join(self.directorio, id_trabajo)
+        os.makedirs(directorio)
+        trabajo = {
+            'id': id_trabajo,
+            'nombre': nombre,
+            'estado': EN_COLA,
+            'exportar': exportar,
+            'creado': time.time(),
+            'inicio': None,
+            'fin': None,
+            'directorio': directorio,
+            'archivo': os.path.join(directorio, nombre),
+            'resultado': None
+        }
+        return trabajo
+
+    def cola_llena(self) -> bool:
+        return self._cola.full()
+
+    def encolar(self, trabajo: Dict[str, Any]) -> None:
+        """
+        Pone en cola un trabajo cuyo archivo ya está en disco
+
+        Raises:
+            ColaLlena: si hay SERVICIO_MAX_COLA trabajos esperando
+        """
+        with self._lock:
+            self.trabajos[trabajo['id']] = trabajo
+        try:
+            self._cola.put_nowait(trabajo['id'])
+        except queue.Full:
+            self.eliminar(trabajo['id'])
+            raise ColaLlena()
+
+    def _despachar(self) -> None:
+        while True:
+            id_trabajo = self._cola.get()
+            if id_trabajo is None:
+                return
+            with self._lock:
+                trabajo = self.trabajos.get(id_trabajo)
+                if trabajo is None:  # eliminado mientras esperaba
+                    continue
+                trabajo['estado'] = PROCESANDO
+                trabajo['inicio'] = time.time()
+                pool = self._pool
+            exportacion = os.path.join(trabajo['directorio'], 'exportacion') if trabajo['exportar'] else None
+            try:
+                resultado = pool.submit(procesar_archivo, trabajo['archivo'], exportacion).result()
+            except BrokenProcessPool:
+                self._reemplazar_pool(pool)
+                resultado = {'estado': 'fallo', 'error': "El proceso de validación terminó de forma inesperada "
+                                                         "(ej. sin memoria); vuelva a enviar el archivo"}
+            except Exception as e:
+                resultado = {'estado': 'fallo', 'error': f"{type(e).__name__}: {e}"}
+            resultado['archivo'] = trabajo['nombre']
+            with self._lock:
+                trabajo['resultado'] = resultado
+                trabajo['estado'] = FALLO if resultado['estado'] == 'fallo' else TERMINADO
+                trabajo['fin'] = time.time()
+                eliminado = id_trabajo not in self.trabajos
+            if eliminado:  # DELETE mientras se procesaba
+                shutil.rmtree(trabajo['directorio'], ignore_errors=True)
+
+    def _reemplazar_pool(self, roto: ProcessPoolExecutor) -> None:
+        """Crea un pool nuevo si roto sigue siendo el actual (otro despachador pudo reemplazarlo ya)"""
+        with self._lock:
+            if self._pool is not roto:
+                return
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self.reinicios_pool += 1
+            self.ultimo_reinicio_pool = time.time()
+        roto.shutdown(wait=False, cancel_futures=True)
+
+    def estado(self, trabajo: Dict[str, Any]) -> Dict[str, Any]:
+        """Vista pública del estado de un trabajo"""
+        with self._lock:
+            estado = {
+                'id': trabajo['id'],
+                'nombre': trabajo['nombre'],
+                'estado': trabajo['estado'],
+                'creado': datetime.fromtimestamp(trabajo['creado']).isoformat(timespec='seconds'),
+                'espera_s': round((trabajo['inicio'] or time.time()) - trabajo['creado'], 3),
+                'duracion_s': round(trabajo['fin'] - trabajo['inicio'], 3) if trabajo['fin'] else None
+            }
+            if trabajo['resultado'] is not None:
+                estado['valido'] = trabajo['resultado']['estado'] == 'valido'
+                estado['total_errores'] = trabajo['resultado'].get('total_errores', 0)
+                estado['total_advertencias'] = trabajo['resultado'].get('total_advertencias', 0)
+        return estado
+
+    def obtener(self, id_trabajo: str):
+        with self._lock:
+            return self.trabajos.get(id_trabajo)
+
+    def eliminar(self, id_trabajo: str) -> bool:
+        with self._lock:
+            trabajo = self.trabajos.pop(id_trabajo, None)
+        if trabajo is None:
+            return False
+        if trabajo['estado'] != PROCESANDO:
+            shutil.rmtree(trabajo['directorio'], ignore_errors=True)
+        return True
+
+    def _purgar(self) -> None:
+        """Elimina los trabajos terminados hace más de retencion_s segundos"""
+        limite = time.time() - self.retencion_s
+        with self._lock:
+            vencidos = [id_trabajo for id_trabajo, trabajo in self.trabajos.items()
+                        if trabajo['fin'] is not None and trabajo['fin'] < limite]
+        for id_trabajo in vencidos:
+            self.eliminar(id_trabajo)
+
+    def salud(self) -> Dict[str, Any]:
+        with self._lock:
+            estados = [trabajo['estado'] for trabajo in self.trabajos.values()]
+            reinicios, ultimo_reinicio = self.reinicios_pool, self.ultimo_reinicio_pool
+        return {
+            'workers': self.workers,
+            'max_cola': self._cola.maxsize,
+            'en_cola': estados.count(EN_COLA),
+            'procesando': estados.count(PROCESANDO),
+            'terminados': estados.count(TERMINADO) + estados.count(FALLO),
+            # Veces que un proceso del pool murió y el pool se reemplazó
+            'reinicios_pool': reinicios,
+            'ultimo_reinicio_pool': (datetime.fromtimestamp(ultimo_reinicio).isoformat(timespec='seconds')
+                                     if ultimo_reinicio else None)
+        }
+
+    def cerrar(self) -> None:
+        for _ in self._despachadores:
+            self._cola.put(None)
+        with self._lock:
+            pool = self._pool
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _nombre_seguro(nombre: str) -> str:
+    """Nombre de archivo sin rutas ni caracteres raros (para guardarlo en disco)"""
+    nombre = re.sub(r'[^\w.\- ]', '_', os.path.basename(nombre or '')).strip(' .')
+    return nombre or 'archivo.xlsx'
+
+
+class ManejadorHTTP(BaseHTTPRequestHandler):
+    servicio: ServicioValidacion = None
+    max_bytes = SERVICIO_MAX_MB * 1024 * 1024
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, formato, *args):
+        sys.stderr.write(f"[{datetime.now():%H:%M:%S}] {self.address_string()} {formato % args}\n")
+
+    def _responder(self, codigo: int, datos: Dict[str, Any], encabezados: Dict[str, str] = None) -> None:
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        for clave, valor in (encabezados or {}).items():
+            self.send_header(clave, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _error(self, codigo: int, mensaje: str, encabezados: Dict[str, str] = None) -> None:
+        self._responder(codigo, {'error': mensaje}, encabezados)
+
+    def _descartar_cuerpo(self, longitud: int) -> None:
+        # Consumir el cuerpo no leído para poder reutilizar la conexión
+        while longitud > 0:
+            leido = self.rfile.read(min(TAMAÑO_BLOQUE, longitud))
+            if not leido:
+                break
+            longitud -= len(leido)
+
+    def _ruta(self):
+        partes = urlsplit(self.path)
+        return [parte for parte in partes.path.split('/') if parte], parse_qs(partes.query)
+
+    def do_POST(self):
+        segmentos, parametros = self._ruta()
+        longitud = self.headers.get('Content-Length')
+        if segmentos != ['trabajos']:
+            self._descartar_cuerpo(int(longitud or 0))
+            return self._error(404, "Ruta no encontrada")
+        if longitud is None:
+            self.close_connection = True
+            return self._error(411, "Se requiere Content-Length")
+        longitud = int(longitud)
+        if longitud > self.max_bytes:
+            self.close_connection = True
+            return self._error(413, f"El archivo supera {self.max_bytes // (1024 * 1024)} MB")
+
+        servicio = self.servicio
+        if servicio.cola_llena():
+            # Rechazar antes de recibir el archivo
+            self.close_connection = True
+            return self._error(503, "La cola de trabajos está llena, intente más tarde", {'Retry-After': '1'})
+        trabajo = servicio.nuevo_trabajo(
+            _nombre_seguro(parametros.get('nombre', ['archivo.xlsx'])[0]),
+            parametros.get('exportar', ['0'])[0].lower() in ('1', 'true', 'si', 'sí')
+        )
+        # El archivo se escribe en disco por bloques, sin tenerlo completo en memoria
+        pendiente = longitud
+        with open(trabajo['archivo'], 'wb') as f:
+            while pendiente > 0:
+                bloque = self.rfile.read(min(TAMAÑO_BLOQUE, pendiente))
+                if not bloque:
+                    break
+                f.write(bloque)
+                pendiente -= len(bloque)
+        if pendiente > 0:
+            shutil.rmtree(trabajo['directorio'], ignore_errors=True)
+            self.close_connection = True
+            return self._error(400, "Carga incompleta")
+
+        try:
+            servicio.encolar(trabajo)
+        except ColaLlena:
+            return self._error(503, "La cola de trabajos está llena, intente más tarde", {'Retry-After': '1'})
+        estado = servicio.estado(trabajo)
+        estado['url_estado'] = f"/trabajos/{trabajo['id']}"
+        estado['url_resultado'] = f"/trabajos/{trabajo['id']}/resultado"
+        self._responder(202, estado, {'Location': estado['url_estado']})
+
+    def do_GET(self):
+        segmentos, _ = self._ruta()
+        servicio = self.servicio
+        if segmentos == ['salud']:
+            return self._responder(200, servicio.salud())
+        if len(segmentos) < 2 or segmentos[0] != 'trabajos':
+            return self._error(404, "Ruta no encontrada")
+        trabajo = servicio.obtener(segmentos[1])
+        if trabajo is None:
+            return self._error(404, "Trabajo no encontrado")
+
+        if len(segmentos) == 2:
+            return self._responder(200, servicio.estado(trabajo))
+        if segmentos[2:] == ['resultado']:
+            if trabajo['estado'] not in (TERMINADO, FALLO):
+                return self._error(409, f"El trabajo está {trabajo['estado']}", {'Retry-After': '1'})
+            resultado = dict(trabajo['resultado'])
+            if resultado.get('exportacion'):
+                resultado['exportacion'] = {
+                    nombre: f"/trabajos/{trabajo['id']}/archivos/{os.path.basename(ruta)}"
+                    for nombre, ruta in resultado['exportacion'].items()
+                }
+            return self._responder(200, resultado)
+        if len(segmentos) == 4 and segmentos[2] == 'archivos' and trabajo['estado'] == TERMINADO:
+            ruta = os.path.join(trabajo['directorio'], 'exportacion', os.path.basename(segmentos[3]))
+            if os.path.isfile(ruta):
+                return self._enviar_archivo(ruta)
+        return self._error(404, "Ruta no encontrada")
+
+    def _enviar_archivo(self, ruta: str) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(os.path.getsize(ruta)))
+        self.end_headers()
+        with open(ruta, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, TAMAÑO_BLOQUE)
+
+    def do_DELETE(self):
+        segmentos, _ = self._ruta()
+        if len(segmentos) == 2 and segmentos[0] == 'trabajos' and self.servicio.eliminar(segmentos[1]):
+            return self._responder(200, {'eliminado': segmentos[1]})
+        self._error(404, "Trabajo no encontrado")
+
+
+def crear_servidor(host: str = '127.0.0.1', puerto: int = 8000, workers: int = SERVICIO_WORKERS,
+                   max_cola: int = SERVICIO_MAX_COLA, directorio: str = None) -> ThreadingHTTPServer:
+    """
+    Crea el servidor (sin iniciarlo); servidor.servicio es el ServicioValidacion
+
+    Args:
+        host, puerto: Dirección de escucha
+        workers: Procesos de validación en paralelo
+        max_cola: Trabajos que pueden esperar en cola (más allá, 503)
+        directorio: Directorio de trabajo para cargas y resultados (por defecto, uno temporal)
+    """
+    directorio = directorio or tempfile.mkdtemp(prefix='servicio_seed_')
+    os.makedirs(directorio, exist_ok=True)
+    servicio = ServicioValidacion(directorio, workers, max_cola)
+    manejador = type('Manejador', (ManejadorHTTP,), {'servicio': servicio})
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    servidor.servicio = servicio
+    return servidor
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de validación de archivos Excel de semilla")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección de escucha (por defecto 127.0.0.1)")
+    parser.add_argument('--puerto', type=int, default=8000, help="Puerto (por defecto 8000)")
+    parser.add_argument('-j', '--workers', type=int, default=SERVICIO_WORKERS,
+                        help=f"Procesos de validación (por defecto {SERVICIO_WORKERS}; SEED_SERVICIO_WORKERS)")
+    parser.add_argument('--max-cola', type=int, default=SERVICIO_MAX_COLA,
+                        help=f"Trabajos en espera antes de responder 503 (por defecto {SERVICIO_MAX_COLA})")
+    parser.add_argument('--directorio', default=None,
+                        help="Directorio para cargas y resultados (por defecto, uno temporal)")
+    args = parser.parse_args(argv)
+
+    servidor = crear_servidor(args.host, args.puerto, args.workers, args.max_cola, args.directorio)
+    # SIGTERM (docker stop, kill) cierra igual que Ctrl+C, sin dejar procesos del pool huérfanos
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Servicio de validación en http://{args.host}:{servidor.server_address[1]} "
+          f"({servidor.servicio.workers} worker(s), cola de {args.max_cola}; Ctrl+C para salir)", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servidor.servicio.cerrar()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Tabla de incidencias para explorarlas por páginas
+Convierte las 'incidencias' de cada hoja (ver validadores/incidencias.py) en un
+DataFrame con una fila por incidencia, y ofrece el filtrado (hoja, regla y
+severidad) y la paginación que usa app_streamlit.py: la interfaz solo envía al
+navegador las filas de la página visible, sin importar cuántas incidencias haya.
+
+También arma la vista previa de celdas de una hoja: una matriz de niveles
+(fila x columna) construida con operaciones de numpy a partir de las filas y la
+columna de cada incidencia, de la que se muestran solo las filas afectadas de
+la página visible, con sus celdas resaltadas.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from resultados import ResultadoHoja
+from validadores.incidencias import FILA_PRIMER_DATO
+
+COLUMNAS = ['hoja', 'severidad', 'regla', 'columna', 'mensaje', 'num_filas', 'filas']
+
+# Orden de las severidades (los errores primero, como en el reporte CSV)
+SEVERIDADES = ['error', 'advertencia']
+
+# Nivel de cada celda en la vista previa (el error prevalece sobre la advertencia)
+NIVELES_CELDA = {'advertencia': 1, 'error': 2}
+ESTILOS_CELDA = np.array(['', 'background-color: #fff3cd', 'background-color: #f8d7da'], dtype=object)
+
+# Filas de Excel listadas por incidencia; el resto se resume como "(+N)"
+MAX_FILAS_LISTADAS = 20
+
+
+def _resumir_filas(filas) -> str:
+    """[3, 4, 5] -> '3, 4, 5'; las listas largas se recortan a MAX_FILAS_LISTADAS"""
+    texto = ', '.join(map(str, filas[:MAX_FILAS_LISTADAS]))
+    if len(filas) > MAX_FILAS_LISTADAS:
+        texto += f" … (+{len(filas) - MAX_FILAS_LISTADAS})"
+    return texto
+
+
+def construir_tabla_incidencias(detalles: Dict[str, ResultadoHoja]) -> pd.DataFrame:
+    """
+    Una fila por incidencia de todas las hojas
+
+    Args:
+        detalles: Resultado por hoja, ej. resultados.detalles
+
+    Returns:
+        pd.DataFrame: Columnas COLUMNAS; 'hoja', 'severidad' y 'regla' son categóricas
+            para filtrar rápido. 'filas' resume las filas de Excel afectadas y
+            'num_filas' las cuenta.
+    """
+    registros = []
+    for hoja, detalle in detalles.items():
+        incidencias = sorted(detalle.incidencias,
+                             key=lambda incidencia: incidencia['severidad'] != 'error')
+        for incidencia in incidencias:
+            registros.append((
+                hoja,
+                incidencia['severidad'],
+                incidencia['regla'],
+                incidencia['columna'] or '',
+                incidencia['mensaje'],
+                len(incidencia['filas']),
+                _resumir_filas(incidencia['filas'])
+            ))
+
+    tabla = pd.DataFrame.from_records(registros, columns=COLUMNAS)
+    tabla['hoja'] = pd.Categorical(tabla['hoja'], categories=list(detalles))
+    tabla['severidad'] = pd.Categorical(tabla['severidad'], categories=SEVERIDADES)
+    tabla['regla'] = tabla['regla'].astype('category')
+    tabla['num_filas'] = tabla['num_filas'].astype('int64')
+    return tabla
+
+
+def filtrar_incidencias(tabla: pd.DataFrame, hojas: Iterable[str] = None,
+                        reglas: Iterable[str] = None, severidades: Iterable[str] = None) -> pd.DataFrame:
+    """
+    Filtra la tabla por hoja, regla y severidad (un filtro vacío o None no filtra)
+
+    Returns:
+        pd.DataFrame: Filas que cumplen todos los filtros, en el orden original
+    """
+    mascara = pd.Series(True, index=tabla.index)
+    for columna, valores in (('hoja', hojas), ('regla', reglas), ('severidad', severidades)):
+        if valores:
+            mascara &= tabla[columna].isin(list(valores))
+    return tabla[mascara]
+
+
+def paginar(tabla: pd.DataFrame, pagina: int, tamaño: int) -> Tuple[pd.DataFrame, int]:
+    """
+    Filas de una página
+
+    Args:
+        tabla: Tabla (ya filtrada)
+        pagina: Número de página (base 1); se ajusta al rango válido
+        tamaño: Filas por página
+
+    Returns:
+        tuple: (filas de la página, total de páginas, al menos 1)
+    """
+    total_paginas = max(1, -(-len(tabla) // tamaño))
+    pagina = min(max(1, pagina), total_paginas)
+    inicio = (pagina - 1) * tamaño
+    return tabla.iloc[inicio:inicio + tamaño], total_paginas
+
+
+def mascara_incidencias(df: pd.DataFrame, incidencias: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Nivel de incidencia de cada celda de una hoja
+
+    Las filas de cada incidencia se convierten en posiciones del DataFrame y se
+    marcan de una vez; si la incidencia no tiene columna (o no está en la hoja),
+    se marca la fila completa. Las filas fuera de los datos (ej. encabezados) se ignoran.
+
+    Args:
+        df: Hoja leída con header=1 (índice 0 = fila 3 de Excel)
+        incidencias: 'incidencias' del resultado de la hoja
+
+    Returns:
+        np.ndarray: int8 de forma df.shape; 0 sin incidencia, 1 advertencia, 2 error
+    """
+    mascara = np.zeros(df.shape, dtype=np.int8)
+    for incidencia in incidencias:
+        posiciones = np.asarray(incidencia['filas'], dtype=np.int64) - FILA_PRIMER_DATO
+        posiciones = posiciones[(posiciones >= 0) & (posiciones < len(df))]
+        if posiciones.size == 0:
+            continue
+        nivel = NIVELES_CELDA.get(incidencia['severidad'], 1)
+        columna = incidencia['columna']
+        if columna in df.columns:
+            j = df.columns.get_loc(columna)
+            mascara[posiciones, j] = np.maximum(mascara[posiciones, j], nivel)
+        else:
+            mascara[posiciones] = np.maximum(mascara[posiciones], nivel)
+    return mascara
+
+
+def vista_previa(df: pd.DataFrame, mascara: np.ndarray, pagina: int, tamaño: int):
+    """
+    Página de filas con incidencias y el estilo CSS de cada una de sus celdas
+
+    Args:
+        df: Hoja leída con header=1
+        mascara: Resultado de mascara_incidencias(df, ...)
+        pagina: Número de página (base 1); se ajusta al rango válido
+        tamaño: Filas por página
+
+    Returns:
+        tuple: (filas de la página, con el número de fila de Excel como índice;
+            estilos, DataFrame de CSS con la misma forma, para Styler.apply(axis=None);
+            total de filas con incidencias; total de páginas)
+    """
+    afectadas = np.flatnonzero(mascara.any(axis=1))
+    total_paginas = max(1, -(-len(afectadas) // tamaño))
+    pagina = min(max(1, pagina), total_paginas)
+    posiciones = afectadas[(pagina - 1) * tamaño:pagina * tamaño]
+
+    filas = df.iloc[posiciones].copy()
+    filas.index = pd.Index(posiciones + FILA_PRIMER_DATO, name='Fila')
+    estilos = pd.DataFrame(ESTILOS_CELDA[mascara[posiciones]], index=filas.index, columns=filas.columns)
+    return filas, estilos, len(afectadas), total_paginas
@@ -0,0 +1,38 @@
+"""
+Fixtures compartidas: libros semilla sintéticos (generador_sintetico.py) y sus hojas leídas
+"""
+import os
+import sys
+import warnings
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generador_sintetico import generar_libro  # noqa: E402
+from validador_core import construir_contexto, leer_hojas  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _sin_advertencias_openpyxl():
+    # openpyxl advierte por la validación de datos de los libros generados
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+        yield
+
+
+@pytest.fixture(scope='session')
+def libro(tmp_path_factory):
+    """Libro sintético limpio de 200 matrículas y 600 calificaciones"""
+    ruta = str(tmp_path_factory.mktemp('libros') / 'limpio.xlsx')
+    generar_libro(ruta, 200, 600, semilla=7)
+    return ruta
+
+
+@pytest.fixture
+def hojas(libro):
+    """Hojas leídas del libro sintético y su contexto (copias nuevas en cada prueba)"""
+    excel_file = pd.ExcelFile(libro)
+    hojas = leer_hojas(excel_file)
+    return hojas, construir_contexto(excel_file, libro, hojas)
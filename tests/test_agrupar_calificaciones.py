@@ -0,0 +1,142 @@
+"""
+agrupar_calificaciones (groupby) contra la implementación anterior fila a fila
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from exportador_json import agrupar_calificaciones
+from serializador_json import a_valor_json
+
+ASIGNATURAS = ['Matemáticas', 'Español', 'Ciencias Naturales', 'Sociales', 'Inglés']
+AUXILIARES = ['numero_documento', 'año_escolar', 'sede_asignada', 'asignaturas_vistas']
+
+
+def agrupar_fila_a_fila(df, asignaturas_validas):
+    """Implementación anterior de iter_calificaciones (iterrows + diccionarios)"""
+    estudiantes_agrupados = {}
+    for _, row in df.iterrows():
+        asignatura = str(row.get('Nombre de la asignatura', '')).strip()
+        if asignaturas_validas and asignatura not in asignaturas_validas:
+            continue
+        año_escolar = row.get('Año escolar', '')
+        if isinstance(año_escolar, (int, float)) and not pd.isna(año_escolar):
+            año_escolar = str(int(año_escolar))
+        else:
+            año_escolar = str(año_escolar).strip()
+        num_documento = str(row.get('Número de documento del estudiante', '')).strip()
+        sede_asignada = str(row.get('Sede asignada', '')).strip()
+        promedio_anual = a_valor_json(row.get('Promedio anual'))
+        clave_base = f"{num_documento}_{año_escolar}_{sede_asignada}"
+        if clave_base not in estudiantes_agrupados:
+            estudiantes_agrupados[clave_base] = {
+                'numero_documento': num_documento,
+                'año_escolar': año_escolar,
+                'sede_asignada': sede_asignada,
+                'Nombre del estudiante': str(row.get('Nombre del estudiante', '')).strip(),
+                'Año escolar': año_escolar,
+                'Sede asignada': sede_asignada,
+                'Tipo de nota': str(row.get('Tipo de nota', '')).strip(),
+                'Aprobó': str(row.get('Aprobó', '')) if pd.notna(row.get('Aprobó')) else None,
+                'calificaciones': [],
+                'asignaturas_vistas': {}
+            }
+        grupo = estudiantes_agrupados[clave_base]
+        if asignatura not in grupo['asignaturas_vistas']:
+            grupo['calificaciones'].append({'Nombre de la asignatura': asignatura, 'Promedio anual': promedio_anual})
+            grupo['asignaturas_vistas'][asignatura] = len(grupo['calificaciones']) - 1
+        else:
+            grupo['calificaciones'][grupo['asignaturas_vistas'][asignatura]]['Promedio anual'] = promedio_anual
+
+    docs_agrupados = {}
+    for datos in estudiantes_agrupados.values():
+        docs_agrupados.setdefault(datos['numero_documento'], []).append(datos)
+    resultado = []
+    for doc, entradas in docs_agrupados.items():
+        for datos in entradas:
+            clave = doc if len(entradas) == 1 else f"{doc}_{datos['año_escolar']}_{datos['sede_asignada']}"
+            resultado.append((clave, {k: v for k, v in datos.items() if k not in AUXILIARES}))
+    return resultado
+
+
+def _fila(documento, asignatura, promedio, año=2024, sede='Sede Principal', aprobo='Sí', nombre=None):
+    return {
+        'Número de documento del estudiante': documento,
+        'Nombre del estudiante': nombre or f'Estudiante {documento}',
+        'Nombre de la asignatura': asignatura,
+        'Año escolar': año,
+        'Sede asignada': sede,
+        'Tipo de nota': 'Cuantitativa (Números)',
+        'Promedio anual': promedio,
+        'Aprobó': aprobo
+    }
+
+
+def _comparar(df, asignaturas_validas):
+    esperado = agrupar_fila_a_fila(df, asignaturas_validas)
+    assert list(agrupar_calificaciones(df, asignaturas_validas)) == esperado
+    return esperado
+
+
+def test_duplicados_nan_y_claves_compuestas():
+    df = pd.DataFrame([
+        _fila(1, 'Matemáticas', 3.5),
+        _fila(1, 'Español', np.nan),                   # promedio vacío -> None
+        _fila(1, 'Matemáticas', 4.0),                  # duplicado: gana el último, conserva la posición
+        _fila(2, 'Inventada', 4.2),                    # asignatura inválida: se omite
+        _fila(2, 'Sociales', 2.0, aprobo=np.nan),      # Aprobó vacío -> None
+        _fila(3, 'Inglés', 4.1, año=2024),
+        _fila(3, 'Inglés', 3.9, año=2025),             # dos años -> claves documento_año_sede
+        _fila(1, 'Español', 3.0, nombre='Otro nombre'),  # el nombre sale de la primera fila
+        _fila(4, ' Matemáticas ', np.nan),             # espacios alrededor de la asignatura
+        _fila(4, 'Matemáticas', np.nan),
+    ])
+    esperado = _comparar(df, set(ASIGNATURAS))
+
+    claves = [clave for clave, _ in esperado]
+    assert claves == ['1', '2', '3_2024_Sede Principal', '3_2025_Sede Principal', '4']
+    estudiante_1 = dict(esperado)['1']
+    assert estudiante_1['calificaciones'] == [
+        {'Nombre de la asignatura': 'Matemáticas', 'Promedio anual': 4.0},
+        {'Nombre de la asignatura': 'Español', 'Promedio anual': 3.0}
+    ]
+    assert dict(esperado)['4']['calificaciones'] == [{'Nombre de la asignatura': 'Matemáticas', 'Promedio anual': None}]
+
+
+def test_años_con_vacios_y_promedios_mixtos():
+    df = pd.DataFrame([
+        _fila(10, 'Matemáticas', 'Sin nota', año=2024.0),
+        _fila(10, 'Español', 4.5, año=np.nan),
+        _fila(11, 'Matemáticas', 3, año='2025 '),
+        _fila(11, 'Matemáticas', np.nan, año='2025'),
+    ])
+    _comparar(df, set(ASIGNATURAS))
+    _comparar(df, set())
+
+
+@pytest.mark.parametrize('semilla', [0, 1, 2])
+def test_hoja_aleatoria_con_duplicados_y_nan(semilla):
+    rng = np.random.default_rng(semilla)
+    filas = 3000
+    documentos = rng.integers(1000, 1400, filas)
+    promedios = np.round(rng.uniform(1, 5, filas), 1)
+    promedios[rng.random(filas) < 0.1] = np.nan
+    df = pd.DataFrame({
+        'Número de documento del estudiante': documentos,
+        'Nombre del estudiante': np.char.add('Estudiante ', documentos.astype(str)),
+        'Nombre de la asignatura': rng.choice(ASIGNATURAS + ['Inventada'], filas),
+        'Año escolar': rng.choice([2024, 2025], filas, p=[0.9, 0.1]),
+        'Sede asignada': rng.choice(['Sede Principal', 'Sede Rural'], filas, p=[0.95, 0.05]),
+        'Tipo de nota': 'Cuantitativa (Números)',
+        'Promedio anual': promedios,
+        'Aprobó': rng.choice(['Sí', 'No', None], filas)
+    })
+    esperado = _comparar(df, set(ASIGNATURAS))
+    assert any('_' in clave for clave, _ in esperado)
+    assert any(c['Promedio anual'] is None for _, datos in esperado for c in datos['calificaciones'])
+
+
+def test_hoja_vacia_o_sin_asignaturas_validas():
+    assert list(agrupar_calificaciones(pd.DataFrame(), set(ASIGNATURAS))) == []
+    df = pd.DataFrame([_fila(1, 'Inventada', 3.0)])
+    assert _comparar(df, set(ASIGNATURAS)) == []
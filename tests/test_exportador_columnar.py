@@ -0,0 +1,29 @@
+"""
+Exportación columnar desde las hojas validadas, sin releer el archivo
+"""
+import os
+
+import pytest
+
+from exportador_columnar import export_columnar, export_excel_to_columnar
+from exportador_json import ExcelToJSONExporter
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def test_export_columnar_desde_hojas_igual_que_desde_archivo(libro, hojas, tmp_path):
+    hojas, contexto = hojas
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+    desde_hojas = export_columnar(exporter, str(tmp_path / 'hojas'))
+    desde_archivo = export_excel_to_columnar(libro, str(tmp_path / 'archivo'))
+
+    assert list(desde_hojas) == list(desde_archivo)
+    for nombre, ruta in desde_hojas.items():
+        assert os.path.basename(ruta) == f'{nombre}.parquet'
+        assert pq.read_table(ruta).equals(pq.read_table(desde_archivo[nombre])), nombre
+
+
+def test_formato_desconocido(hojas, tmp_path):
+    hojas, contexto = hojas
+    with pytest.raises(ValueError, match='Formato columnar desconocido'):
+        export_columnar(ExcelToJSONExporter(hojas=hojas, contexto=contexto), str(tmp_path), 'csv')
@@ -0,0 +1,45 @@
+"""
+Exportación delta: los registros se comparan por clave natural, no por posición
+"""
+import pandas as pd
+
+from exportador_delta import export_delta
+from exportador_json import ExcelToJSONExporter
+
+
+def test_insertar_una_matricula_agrega_solo_ese_estudiante(hojas, tmp_path):
+    hojas, contexto = hojas
+    anterior = str(tmp_path / 'anterior')
+    ExcelToJSONExporter(hojas=dict(hojas), contexto=contexto).save_to_files(anterior)
+
+    # Nuevo estudiante en medio de la hoja: todas las filas siguientes cambian de posición
+    matriculas = hojas['Matrículas']
+    nuevo = matriculas.iloc[[0]].copy()
+    nuevo['Número de documento'] = matriculas['Número de documento'].max() + 1
+    nuevo['Nombres'] = 'Estudiante Nuevo'
+    mitad = len(matriculas) // 2
+    hojas['Matrículas'] = pd.concat([matriculas.iloc[:mitad], nuevo, matriculas.iloc[mitad:]], ignore_index=True)
+
+    resumen = export_delta(ExcelToJSONExporter(hojas=hojas, contexto=contexto), anterior, str(tmp_path / 'delta'))
+
+    assert resumen['entidades']['estudiantes'] == {
+        'insertados': 1,
+        'actualizados': 0,
+        'eliminados': 0,
+        'sin_cambios': len(matriculas),
+        'claves_duplicadas': 0
+    }
+    for entidad in ('profesores', 'calificaciones_anuales'):
+        assert resumen['entidades'][entidad]['insertados'] == 0
+        assert resumen['entidades'][entidad]['actualizados'] == 0
+
+
+def test_estudiantes_exportados_con_datos_de_matriculas(hojas):
+    hojas, contexto = hojas
+    estudiantes = ExcelToJSONExporter(hojas=hojas, contexto=contexto).export_estudiantes()
+    matriculas = hojas['Matrículas']
+
+    assert [e['Numero de documento'] for e in estudiantes] == matriculas['Número de documento'].astype(str).tolist()
+    assert [e['Nombres'] for e in estudiantes] == matriculas['Nombres'].str.strip().tolist()
+    assert [e['NOMBRE SEDE'] for e in estudiantes] == matriculas['Sede asignada'].str.strip().tolist()
+    assert all(e['CURSO'] and e['Fecha de nacimiento'] for e in estudiantes)
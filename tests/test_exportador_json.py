@@ -0,0 +1,77 @@
+"""
+Exportación JSON: ZIP, archivos y NDJSON sobre un libro sintético
+"""
+import json
+import os
+import zipfile
+
+import pandas as pd
+
+from exportador_json import DOCUMENTOS, ExcelToJSONExporter
+from serializador_json import EscritorNDJSON
+
+
+def test_write_zip_contiene_los_documentos_completos(hojas, tmp_path):
+    hojas, contexto = hojas
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+    ruta = tmp_path / 'seed.zip'
+    with zipfile.ZipFile(ruta, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        exporter.write_zip(zip_file)
+
+    with zipfile.ZipFile(ruta) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == [f'{documento}.json' for documento in DOCUMENTOS]
+        for documento in DOCUMENTOS:
+            assert zip_file.read(f'{documento}.json').decode('utf-8') == ''.join(exporter.iter_json(documento))
+
+
+def test_save_to_files_igual_que_iter_json(hojas, tmp_path):
+    hojas, contexto = hojas
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+    rutas = exporter.save_to_files(str(tmp_path))
+    for documento in DOCUMENTOS:
+        assert os.path.basename(rutas[documento]) == f'{documento}.json'
+        with open(rutas[documento], encoding='utf-8') as f:
+            texto = f.read()
+        assert texto == ''.join(exporter.iter_json(documento))
+        json.loads(texto)
+
+
+def test_manifiesto_ndjson_cuenta_registros_de_todos_los_documentos(hojas, tmp_path):
+    hojas, contexto = hojas
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+    with open(exporter.save_to_ndjson(str(tmp_path), por_sede=True, registros_por_archivo=50), encoding='utf-8') as f:
+        documentos = json.load(f)['documentos']
+
+    assert documentos['config']['registros'] == 1
+    assert documentos['profesores']['registros'] == len(exporter.export_profesores())
+    assert documentos['estudiantes']['registros'] == len(hojas['Matrículas'])
+    assert documentos['calificaciones_anuales']['registros'] == len(exporter.export_calificaciones())
+    for documento in ('estudiantes', 'calificaciones_anuales'):
+        assert documentos[documento]['registros'] == sum(s['registros'] for s in documentos[documento]['shards'])
+
+
+def test_shards_de_particiones_con_el_mismo_nombre_seguro_no_se_pisan(tmp_path):
+    # 'Sede 1', 'sede-1' y 'SEDE 1!' dan 'sede_1'; 'sede_1_2' ya está usado cuando llega 'sede-1'
+    particiones = ['Sede 1', 'sede_1_2', 'sede-1', 'SEDE 1!', None]
+    with EscritorNDJSON(str(tmp_path), 'estudiantes') as escritor:
+        for particion in particiones:
+            escritor.escribir({'particion': particion}, particion)
+
+    archivos = [shard['archivo'] for shard in escritor.shards]
+    assert len(set(archivos)) == len(particiones)
+    assert sorted(os.listdir(tmp_path)) == sorted(archivos)
+    for shard in escritor.shards:
+        with open(tmp_path / shard['archivo'], encoding='utf-8') as f:
+            assert json.loads(f.readline())['particion'] == shard['particion']
+
+
+def test_hoja_grados_se_lee_una_sola_vez(libro, monkeypatch):
+    exporter = ExcelToJSONExporter(pd.ExcelFile(libro))
+    lecturas = []
+    parse = exporter.excel_file.parse
+    monkeypatch.setattr(exporter.excel_file, 'parse', lambda hoja, **kw: lecturas.append(hoja) or parse(hoja, **kw))
+    exporter.export_all()
+
+    assert lecturas.count('Grados') == 1
+    assert exporter.export_config()['grades'] == exporter._tabla('niveles_grado')
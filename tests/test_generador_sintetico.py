@@ -0,0 +1,41 @@
+"""
+Generador sintético: cada perfil de errores se valida de principio a fin
+"""
+import pandas as pd
+import pytest
+
+from generador_sintetico import PERFILES_ERRORES, generar_libro
+from validador_core import validar_libro
+
+
+@pytest.mark.parametrize('perfil', sorted(PERFILES_ERRORES))
+def test_perfil_se_valida_completo(perfil, tmp_path):
+    ruta = str(tmp_path / f'{perfil}.xlsx')
+    generado = generar_libro(ruta, 2000, perfil=perfil)
+    resultado = validar_libro(ruta)
+
+    assert set(resultado.detalles) == set(generado['filas'])
+    if perfil == 'limpio':
+        assert resultado.total_errores == 0
+    else:
+        assert all(generado['errores_inyectados'].values())
+        for hoja in ('Matrículas', 'Calificaciones anuales'):
+            assert resultado.detalles[hoja].num_errores > 0, hoja
+
+
+def test_misma_semilla_mismo_archivo_con_xlsxwriter(tmp_path):
+    pytest.importorskip('xlsxwriter')
+    rutas = [tmp_path / 'a.xlsx', tmp_path / 'b.xlsx']
+    for ruta in rutas:
+        generar_libro(str(ruta), 300, perfil='severo', motor='xlsxwriter')
+    assert rutas[0].read_bytes() == rutas[1].read_bytes()
+
+
+def test_misma_semilla_mismos_datos_con_openpyxl(tmp_path):
+    rutas = [str(tmp_path / 'a.xlsx'), str(tmp_path / 'b.xlsx')]
+    for ruta in rutas:
+        generar_libro(ruta, 300, perfil='severo', motor='openpyxl')
+    hojas_a, hojas_b = (pd.read_excel(ruta, sheet_name=None, header=None) for ruta in rutas)
+    assert list(hojas_a) == list(hojas_b)
+    for hoja in hojas_a:
+        pd.testing.assert_frame_equal(hojas_a[hoja], hojas_b[hoja])
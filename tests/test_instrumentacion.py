@@ -0,0 +1,44 @@
+"""
+Instrumentación: tracemalloc compartido entre perfilados simultáneos
+"""
+import tracemalloc
+
+from instrumentacion import medir, perfilar
+
+
+def test_tracemalloc_sigue_activo_hasta_terminar_el_ultimo_perfilado():
+    assert not tracemalloc.is_tracing()
+    primero, segundo = perfilar(), perfilar()
+    traza_primero = primero.__enter__()
+    traza_segundo = segundo.__enter__()
+    # El primero termina antes que el segundo (ej. dos sesiones de la app)
+    primero.__exit__(None, None, None)
+    assert tracemalloc.is_tracing()
+
+    with medir('etapa', 'segundo'):
+        datos = [bytes(1024) for _ in range(100)]
+    segundo.__exit__(None, None, None)
+
+    assert not tracemalloc.is_tracing()
+    assert traza_primero.eventos == []
+    assert traza_segundo.eventos[0]['memoria_pico_kb'] >= 100
+    del datos
+
+
+def test_no_detiene_tracemalloc_iniciado_fuera():
+    tracemalloc.start()
+    try:
+        with perfilar() as traza:
+            pass
+        assert traza.memoria
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_perfilado_sin_memoria_no_inicia_tracemalloc():
+    with perfilar(memoria=False) as traza, medir('etapa'):
+        pass
+    assert not traza.memoria
+    assert traza.eventos[0]['memoria_pico_kb'] is None
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,200 @@
+"""
+Referencias entre hojas (vocabularios.py) contra las comprobaciones anteriores
+fila a fila, sobre un libro con referencias inexistentes inyectadas
+"""
+import pandas as pd
+import pytest
+
+from config import COLUMNAS_REQUERIDAS
+from generador_sintetico import generar_libro
+from validador_core import construir_contexto, leer_hojas, validar_hoja
+from validadores.incidencias import incidencia
+
+HOJAS = ['Grupos', 'Profesores', 'Asignaturas', 'Coordinadores', 'Periodos', 'Calificaciones anuales']
+
+
+def _filas_con_valores(serie, valores, separador=None, normalizar=None):
+    """validadores.incidencias.filas_con_valores, antes de los vocabularios"""
+    valores = set(valores)
+    normalizar = normalizar or (lambda valor: str(valor).strip())
+
+    def contiene(valor):
+        if pd.isna(valor):
+            return False
+        if separador is None:
+            return normalizar(valor) in valores
+        return any(normalizar(parte) in valores for parte in str(valor).split(separador))
+
+    return serie[serie.map(contiene).astype(bool)]
+
+
+def _simple(df, col, validos):
+    """Valores distintos que no están en la lista (Grupos, Profesores, Asignaturas, ...)"""
+    asignados = df[df[col].notna()][col].unique()
+    invalidos = [valor for valor in asignados if valor not in validos]
+    return invalidos, df[df[col].isin(invalidos)]
+
+
+def _lista(df, col, validos):
+    """Listas separadas por coma recorridas con iterrows"""
+    encontrados = set()
+    for _, row in df.iterrows():
+        if pd.notna(row[col]):
+            for valor in [parte.strip() for parte in str(row[col]).split(',')]:
+                if valor and valor not in validos:
+                    encontrados.add(valor)
+    return encontrados, _filas_con_valores(df[col], encontrados, ',')
+
+
+def _año_texto(valor):
+    return str(int(valor)) if isinstance(valor, (int, float)) else str(valor).strip()
+
+
+def _referencias_anteriores(hoja, df, contexto):
+    """Incidencias 'referencia_inexistente' de los validadores anteriores, en el mismo orden"""
+    columnas = COLUMNAS_REQUERIDAS[hoja]
+    listas = {clave: list(valores) for clave, valores in contexto.items()}
+    resultado = []
+
+    def error(mensaje, col, filas):
+        resultado.append(incidencia('error', 'referencia_inexistente', mensaje, col, filas))
+
+    if hoja == 'Grupos':
+        invalidos, filas = _simple(df, columnas[1], listas['grados'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} grado(s) asignado(s) que no existen: {', '.join(str(x) for x in invalidos)}",
+                  columnas[1], filas)
+        invalidos, filas = _lista(df, columnas[2], listas['sedes'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} sede(s) asociada(s) que no existen: {', '.join(sorted(invalidos))}",
+                  columnas[2], filas)
+    elif hoja == 'Profesores':
+        invalidos, filas = _simple(df, columnas[7], listas['sedes'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} sede(s) asignada(s) que no existen: {', '.join(invalidos)}", columnas[7], filas)
+        invalidos, filas = _lista(df, columnas[8], listas['asignaturas'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} asignatura(s) a cargo que no existen: {', '.join(sorted(invalidos))}",
+                  columnas[8], filas)
+    elif hoja == 'Asignaturas':
+        invalidos, filas = _simple(df, columnas[1], listas['areas'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} área(s) asociada(s) que no existen: {', '.join(invalidos)}", columnas[1], filas)
+        invalidos, filas = _lista(df, columnas[2], listas['grados'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} grado(s) asociado(s) que no existen: {', '.join(sorted(invalidos))}",
+                  columnas[2], filas)
+    elif hoja == 'Coordinadores':
+        invalidos, filas = _simple(df, columnas[6], listas['sedes'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} sede(s) asignada(s) que no existen: {', '.join(invalidos)}", columnas[6], filas)
+    elif hoja == 'Periodos':
+        invalidos, filas = _simple(df, columnas[3], listas['cursos_academicos'])
+        if invalidos:
+            error(f"Hay {len(invalidos)} año(s) escolar(es) asociado(s) que no existen: {', '.join(invalidos)}",
+                  columnas[3], filas)
+    elif hoja == 'Calificaciones anuales':
+        col_año, col_sede, col_asignatura = columnas[3], columnas[4], columnas[2]
+        años = set()
+        for _, row in df.iterrows():
+            if pd.notna(row[col_año]):
+                año = _año_texto(row[col_año])
+                if año and año not in listas['cursos_academicos']:
+                    años.add(año)
+        if años:
+            error(f"Hay {len(años)} año(s) escolar(es) que no existen: {', '.join(sorted(años))}",
+                  col_año, _filas_con_valores(df[col_año], años, normalizar=_año_texto))
+        sedes = set()
+        for _, row in df.iterrows():
+            if pd.notna(row[col_sede]):
+                sede = str(row[col_sede]).strip()
+                if sede and sede not in listas['sedes']:
+                    sedes.add(sede)
+        if sedes:
+            error(f"Hay {len(sedes)} sede(s) asignada(s) que no existen: {', '.join(sorted(sedes))}",
+                  col_sede, _filas_con_valores(df[col_sede], sedes))
+        registros = df[df[col_asignatura].notna() & ~df[col_asignatura].isin(listas['asignaturas'])]
+        if not registros.empty:
+            total = len(df[df[col_asignatura].notna()])
+            unicas = sorted(registros[col_asignatura].unique())
+            mensaje = (f"⚠️ Hay {len(registros)} registro(s) ({len(registros) / total * 100:.1f}%) con asignaturas inválidas. "
+                       f"{len(unicas)} asignatura(s) única(s) no existen: {', '.join(unicas)}. "
+                       f"Estos registros serán omitidos en la exportación.")
+            resultado.append(incidencia('advertencia', 'referencia_inexistente', mensaje, col_asignatura, registros))
+    return resultado
+
+
+def _esperadas(hoja, df, contexto):
+    try:
+        return _referencias_anteriores(hoja, df, contexto)
+    except TypeError:
+        # Mensajes con valores no textuales (ej. años numéricos en Periodos): validar_hoja
+        # reintenta el validador sin contexto, es decir, sin comprobar referencias
+        return []
+
+
+def _inyectar(df, columna, valores, como_texto=False):
+    """Reemplaza filas alternas de una columna (como object, para mezclar tipos)"""
+    df[columna] = df[columna].astype(str if como_texto else object)
+    for i, valor in enumerate(valores):
+        df.loc[df.index[i * 2 % len(df)], columna] = valor
+
+
+@pytest.fixture(scope='module')
+def libro_severo(tmp_path_factory):
+    ruta = str(tmp_path_factory.mktemp('referencias') / 'severo.xlsx')
+    generar_libro(ruta, 300, 900, perfil='severo', semilla=11)
+    return ruta
+
+
+@pytest.fixture
+def hojas_con_referencias_rotas(libro_severo):
+    excel_file = pd.ExcelFile(libro_severo)
+    hojas = leer_hojas(excel_file)
+    contexto = construir_contexto(excel_file, libro_severo, hojas)
+    c = {hoja: COLUMNAS_REQUERIDAS[hoja] for hoja in HOJAS}
+    _inyectar(hojas['Grupos'], c['Grupos'][1], ['Grado Inventado', 7, None, ' Primero'])
+    _inyectar(hojas['Grupos'], c['Grupos'][2], ['Sede Principal, Sede Fantasma', 'Sede Norte,,', ' , Otra Sede ', None])
+    _inyectar(hojas['Profesores'], c['Profesores'][7], ['Sede Fantasma', None, 'sede principal'])
+    _inyectar(hojas['Profesores'], c['Profesores'][8], ['Matemáticas, Astrología', 'Inglés ,Alquimia,', None])
+    _inyectar(hojas['Asignaturas'], c['Asignaturas'][1], ['Área Inventada', None, 'Humanidades '])
+    _inyectar(hojas['Asignaturas'], c['Asignaturas'][2], ['Primero, Grado 13', ' ,Segundo', None, 'Once, Once'])
+    _inyectar(hojas['Coordinadores'], c['Coordinadores'][6], ['Sede Fantasma'])
+    _inyectar(hojas['Periodos'], c['Periodos'][3], ['1999', '2025 ', None, 'dos mil'], como_texto=True)
+    calificaciones = c['Calificaciones anuales']
+    _inyectar(hojas['Calificaciones anuales'], calificaciones[3], [2030, 2024.0, ' 2025 ', '', None, 'dos mil'])
+    _inyectar(hojas['Calificaciones anuales'], calificaciones[4], [' Sede Principal ', 'Sede Fantasma', '', '  ', None])
+    _inyectar(hojas['Calificaciones anuales'], calificaciones[2], ['Astrología', None, ' Inglés', 'Astrología'])
+    return hojas, contexto
+
+
+@pytest.mark.parametrize('hoja', HOJAS)
+def test_referencias_iguales_a_la_validacion_anterior(hoja, hojas_con_referencias_rotas):
+    hojas, contexto = hojas_con_referencias_rotas
+    esperadas = _esperadas(hoja, hojas[hoja], contexto)
+    resultado = validar_hoja(hoja, hojas[hoja], contexto)
+    obtenidas = [i for i in resultado['incidencias'] if i['regla'] == 'referencia_inexistente']
+
+    assert esperadas, hoja
+    assert obtenidas == esperadas
+    mensajes = resultado['errores'] + resultado['advertencias']
+    assert all(i['mensaje'] in mensajes for i in obtenidas)
+
+
+def test_valores_no_textuales_omiten_la_comprobacion_como_antes(hojas_con_referencias_rotas):
+    hojas, contexto = hojas_con_referencias_rotas
+    periodos = hojas['Periodos']
+    _inyectar(periodos, COLUMNAS_REQUERIDAS['Periodos'][3], [1999, 2024])
+    assert _esperadas('Periodos', periodos, contexto) == []
+    resultado = validar_hoja('Periodos', periodos, contexto)
+    assert not [i for i in resultado['incidencias'] if i['regla'] == 'referencia_inexistente']
+
+
+def test_sin_referencias_rotas_no_hay_incidencias(libro):
+    excel_file = pd.ExcelFile(libro)
+    hojas = leer_hojas(excel_file)
+    contexto = construir_contexto(excel_file, libro, hojas)
+    for hoja in HOJAS:
+        assert _esperadas(hoja, hojas[hoja], contexto) == []
+        resultado = validar_hoja(hoja, hojas[hoja], contexto)
+        assert not [i for i in resultado['incidencias'] if i['regla'] == 'referencia_inexistente'], hoja
@@ -0,0 +1,123 @@
+"""
+Reportes JSONL y SARIF: cada línea/resultado corresponde a una incidencia y fila
+del resultado de la validación
+"""
+import io
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from config import COLUMNAS_REQUERIDAS
+from generador_sintetico import generar_libro
+from reporte_incidencias import EscritorJSONL, EscritorSARIF
+from resultados import ResultadoHoja
+from validador_core import validar_libro
+from validadores.incidencias import incidencia
+from validar_lote import validar_lote
+
+CAMPOS = ['archivo', 'hoja', 'fila', 'columna', 'regla', 'severidad', 'mensaje']
+
+
+@pytest.fixture(scope='module')
+def libro_severo(tmp_path_factory):
+    ruta = str(tmp_path_factory.mktemp('reportes') / 'severo.xlsx')
+    generar_libro(ruta, 300, 900, perfil='severo', semilla=11)
+    return ruta
+
+
+def _esperados(ruta):
+    """(hoja, fila, columna, regla, severidad, mensaje) por incidencia y fila, desde validar_libro"""
+    return [(nombre, fila, i['columna'], i['regla'], i['severidad'], i['mensaje'])
+            for nombre, resultado_hoja in validar_libro(ruta).detalles.items()
+            for i in resultado_hoja.incidencias
+            for fila in i['filas'] or [None]]
+
+
+def _hoja_con_incidencias():
+    # Índices del DataFrame 2, 6 y 1 -> filas de Excel 5, 9 y 4
+    columna = COLUMNAS_REQUERIDAS['Grupos'][1]
+    return ResultadoHoja('Grupos', incidencias=[
+        incidencia('error', 'referencia_inexistente', 'Hay 1 grado(s) asignado(s) que no existen: X',
+                   columna, pd.Index([2, 6])),
+        incidencia('advertencia', 'hoja_vacia', 'La hoja está vacía'),
+        incidencia('error', 'columna_extra', 'Columna desconocida', 'Otra columna', pd.Index([1]))
+    ])
+
+
+def test_jsonl_una_linea_por_incidencia_y_fila():
+    destino = io.StringIO()
+    escritor = EscritorJSONL(destino, 'colegio.xlsx')
+    escritor.escribir_hoja('Grupos', _hoja_con_incidencias())
+    escritor.cerrar()
+
+    lineas = [json.loads(linea) for linea in destino.getvalue().splitlines()]
+    assert escritor.total == len(lineas) == 4
+    assert [(l['fila'], l['regla'], l['severidad']) for l in lineas] == [
+        (5, 'referencia_inexistente', 'error'), (9, 'referencia_inexistente', 'error'),
+        (None, 'hoja_vacia', 'advertencia'), (4, 'columna_extra', 'error')]
+    assert all(list(l) == CAMPOS and l['archivo'] == 'colegio.xlsx' and l['hoja'] == 'Grupos' for l in lineas)
+
+
+def test_sarif_regiones_y_ubicaciones():
+    destino = io.StringIO()
+    escritor = EscritorSARIF(destino, os.path.join('colegios', 'colegio.xlsx'))
+    escritor.escribir_hoja('Grupos', _hoja_con_incidencias())
+    escritor.cerrar()
+
+    sarif = json.loads(destino.getvalue())
+    assert sarif['version'] == '2.1.0'
+    run = sarif['runs'][0]
+    assert [r['id'] for r in run['tool']['driver']['rules']] == ['referencia_inexistente', 'hoja_vacia', 'columna_extra']
+    assert run['artifacts'] == [{'location': {'uri': 'colegios/colegio.xlsx'}}]
+
+    resultados = run['results']
+    assert [(r['ruleId'], r['level']) for r in resultados] == [
+        ('referencia_inexistente', 'error'), ('referencia_inexistente', 'error'),
+        ('hoja_vacia', 'warning'), ('columna_extra', 'error')]
+    fisicas = [r['locations'][0]['physicalLocation'] for r in resultados]
+    assert [f.get('region') for f in fisicas] == [
+        {'startLine': 5, 'startColumn': 2}, {'startLine': 9, 'startColumn': 2}, None, {'startLine': 4}]
+    assert all(f['artifactLocation']['uri'] == 'colegios/colegio.xlsx' for f in fisicas)
+    assert [r['locations'][0]['logicalLocations'][0]['fullyQualifiedName'] for r in resultados] == [
+        'Grupos!B5', 'Grupos!B9', 'Grupos', 'Grupos!4:4']
+
+
+def test_sarif_sin_incidencias_es_json_valido():
+    destino = io.StringIO()
+    escritor = EscritorSARIF(destino, 'colegio.xlsx')
+    escritor.escribir_hoja('Grupos', ResultadoHoja('Grupos'))
+    escritor.cerrar()
+    run = json.loads(destino.getvalue())['runs'][0]
+    assert run['results'] == [] and run['tool']['driver']['rules'] == []
+
+
+@pytest.mark.parametrize('formato', ['jsonl', 'sarif'])
+def test_reporte_del_lote_igual_a_la_validacion(formato, libro_severo, tmp_path):
+    esperados = _esperados(libro_severo)
+    assert any(regla == 'referencia_inexistente' for _, _, _, regla, _, _ in esperados)
+
+    agregado = validar_lote([libro_severo], str(tmp_path), jobs=1, formato_reporte=formato)
+    with open(os.path.join(str(tmp_path), f'severo.{formato}'), encoding='utf-8') as f:
+        if formato == 'jsonl':
+            registros = [json.loads(linea) for linea in f]
+            assert all(r['archivo'] == libro_severo for r in registros)
+            obtenidos = [(r['hoja'], r['fila'], r['columna'], r['regla'], r['severidad'], r['mensaje'])
+                         for r in registros]
+        else:
+            resultados = json.load(f)['runs'][0]['results']
+            obtenidos = []
+            for r in resultados:
+                region = r['locations'][0]['physicalLocation'].get('region', {})
+                propiedades = r['properties']
+                assert region.get('startLine') == propiedades['fila']
+                columnas = COLUMNAS_REQUERIDAS.get(propiedades['hoja'], [])
+                if propiedades['fila'] is not None and propiedades['columna'] in columnas:
+                    assert region['startColumn'] == columnas.index(propiedades['columna']) + 1
+                severidad = {'error': 'error', 'warning': 'advertencia'}[r['level']]
+                obtenidos.append((propiedades['hoja'], propiedades['fila'], propiedades['columna'], r['ruleId'],
+                                  severidad, r['message']['text']))
+
+    assert obtenidos == esperados
+    assert agregado['resultados'][0]['estado'] == 'con_errores'
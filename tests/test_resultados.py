@@ -0,0 +1,67 @@
+"""
+Resultados por hoja y por libro: pickle y combinación de partes
+"""
+import pickle
+
+import pytest
+
+from resultados import ResultadoHoja, ResultadoLibro
+from validador_core import validar_libro
+
+
+def _hoja(nombre, errores=(), advertencias=(), filas=10):
+    return ResultadoHoja(nombre, True, True, not errores, list(errores), list(advertencias),
+                         [{'regla': 'prueba', 'mensaje': m} for m in errores], filas)
+
+
+def test_pickle_conserva_resultados_sin_hojas_ni_contexto(libro):
+    resultados = validar_libro(libro)
+    assert resultados.hojas and resultados.contexto
+
+    copia = pickle.loads(pickle.dumps(resultados))
+    assert copia.detalles == resultados.detalles
+    assert (copia.total_errores, copia.total_advertencias) == (resultados.total_errores, resultados.total_advertencias)
+    assert copia.hojas == {} and copia.contexto == {}
+
+    # El tamaño no depende de los DataFrames ni del contexto (vocabularios indexados)
+    solo_resultados = ResultadoLibro(resultados.detalles, resultados.total_errores, resultados.total_advertencias)
+    assert len(pickle.dumps(resultados)) == len(pickle.dumps(solo_resultados))
+
+
+def test_pickle_de_resultado_hoja():
+    hoja = _hoja('Grupos', ['error 1'], ['advertencia'])
+    assert pickle.loads(pickle.dumps(hoja)) == hoja
+
+
+def test_combinar_partes_del_mismo_libro():
+    primera, segunda = ResultadoLibro(), ResultadoLibro()
+    primera.agregar(_hoja('Sedes'))
+    primera.agregar(_hoja('Matrículas', ['fila 3'], ['aviso'], filas=100))
+    segunda.agregar(_hoja('Matrículas', ['fila 150'], filas=50))
+    segunda.agregar(_hoja('Grupos', advertencias=['aviso grupos']))
+
+    combinado = primera.combinar(segunda)
+    assert list(combinado.detalles) == ['Sedes', 'Matrículas', 'Grupos']
+    matriculas = combinado.detalles['Matrículas']
+    assert matriculas.errores == ['fila 3', 'fila 150']
+    assert matriculas.num_filas == 150 and not matriculas.valida
+    assert len(matriculas.incidencias) == 2
+    assert (combinado.total_errores, combinado.total_advertencias) == (2, 2)
+    assert not combinado.valido
+    assert combinado.hojas_con_errores == ['Matrículas']
+    assert combinado.hojas_validas == ['Sedes', 'Grupos']
+    # Las partes no se modifican
+    assert primera.total_errores == 1 and segunda.total_errores == 1
+
+
+def test_agregar_la_misma_hoja_recalcula_totales():
+    resultados = ResultadoLibro()
+    resultados.agregar(_hoja('Sedes', ['a', 'b']))
+    resultados.agregar(_hoja('Sedes', ['c'], ['d']))
+    assert resultados.total_errores == 3 and resultados.total_advertencias == 1
+    assert resultados.detalles['Sedes'].errores == ['a', 'b', 'c']
+
+
+def test_combinar_hojas_distintas_falla():
+    with pytest.raises(ValueError, match='hojas distintas'):
+        _hoja('Sedes').combinar(_hoja('Grupos'))
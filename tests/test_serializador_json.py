@@ -0,0 +1,85 @@
+"""
+Equivalencia de los serializadores 'json' y 'orjson' con la exportación anterior
+(json.dump(..., ensure_ascii=False, indent=2) del documento completo)
+"""
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exportador_json import DOCUMENTOS, ExcelToJSONExporter
+from serializador_json import iter_lista_json, obtener_serializador
+
+pytest.importorskip('orjson')
+
+
+def _exportar(hojas, contexto, serializador):
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto, serializador=serializador)
+    return {documento: ''.join(exporter.iter_json(documento)) for documento in DOCUMENTOS}
+
+
+@pytest.fixture
+def hojas_con_nan_y_fechas(hojas):
+    """Libro con promedios vacíos (NaN), fechas como datetime y números como escalares numpy"""
+    hojas, contexto = hojas
+    calificaciones = hojas['Calificaciones anuales']
+    calificaciones.loc[calificaciones.index[::7], 'Promedio anual'] = np.nan
+    for hoja, columnas in {'Cursos académicos': ['Fecha de inicio', 'Fecha fin'],
+                           'Periodos': ['Fecha de inicio', 'Fecha fin'],
+                           'Matrículas': ['Fecha de nacimiento']}.items():
+        for columna in columnas:
+            hojas[hoja][columna] = pd.to_datetime(hojas[hoja][columna], errors='coerce')
+    assert calificaciones['Promedio anual'].isna().any()
+    assert calificaciones['Número de documento del estudiante'].dtype == np.int64
+    return hojas, contexto
+
+
+def test_escalares_numpy_y_fechas_iguales_en_ambos_serializadores():
+    valor = {
+        'entero': np.int64(3), 'decimal': np.float64(1.5), 'float32': np.float32(0.1), 'booleano': np.bool_(True),
+        'fecha_hora': datetime(2024, 1, 2, 3, 4), 'fecha': date(2024, 1, 2), 'timestamp': pd.Timestamp('2024-01-02'),
+        'datetime64': np.datetime64('2024-01-02T10:00'), 'nat': pd.NaT, 'na': pd.NA, 'nan_normalizado': None,
+        1: 'clave no string'
+    }
+    stdlib, rapido = obtener_serializador('json'), obtener_serializador('orjson')
+    assert stdlib.encode(valor) == rapido.encode(valor)
+    assert stdlib.encode_linea(valor) == rapido.encode_linea(valor)
+    assert json.loads(stdlib.encode(valor))['fecha_hora'] == '2024-01-02 03:04:00'
+
+
+def test_exportacion_equivalente_con_json_y_orjson(hojas_con_nan_y_fechas):
+    hojas, contexto = hojas_con_nan_y_fechas
+    con_json = _exportar(hojas, contexto, 'json')
+    con_orjson = _exportar(hojas, contexto, 'orjson')
+    for documento in DOCUMENTOS:
+        assert json.loads(con_json[documento]) == json.loads(con_orjson[documento]), documento
+
+
+def test_salida_json_igual_a_json_dump_del_documento_completo(hojas_con_nan_y_fechas):
+    hojas, contexto = hojas_con_nan_y_fechas
+    exporter = ExcelToJSONExporter(hojas=hojas, contexto=contexto)
+    documentos = exporter.export_all()
+    con_json = _exportar(hojas, contexto, 'json')
+    for documento in DOCUMENTOS:
+        anterior = json.dumps(documentos[documento], ensure_ascii=False, indent=2)
+        assert con_json[documento] == anterior, documento
+
+
+def test_promedios_nan_se_exportan_como_null(hojas_con_nan_y_fechas):
+    """Único cambio respecto a la exportación anterior: NaN (JSON inválido) pasa a null"""
+    hojas, contexto = hojas_con_nan_y_fechas
+    for serializador in ('json', 'orjson'):
+        texto = _exportar(hojas, contexto, serializador)['calificaciones_anuales']
+        assert 'NaN' not in texto
+        promedios = [calificacion['Promedio anual'] for estudiante in json.loads(texto).values()
+                     for calificacion in estudiante['calificaciones']]
+        assert None in promedios
+
+
+def test_lista_incremental_con_orjson_igual_a_documento_completo():
+    registros = [{'a': np.int64(i), 'b': [np.float64(i) / 2], 'c': 'ñ'} for i in range(3)]
+    rapido = obtener_serializador('orjson')
+    assert ''.join(iter_lista_json(registros, rapido)) == rapido.encode(registros)
+    assert ''.join(iter_lista_json([], rapido)) == '[]'
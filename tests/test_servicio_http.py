@@ -0,0 +1,125 @@
+"""
+Servicio HTTP: ciclo de un trabajo, cola llena, DELETE y reemplazo del pool
+"""
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from servicio_http import crear_servidor
+
+
+class _PoolEnEspera(ThreadPoolExecutor):
+    """Pool que retiene cada trabajo hasta que se activa continuar"""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.continuar = threading.Event()
+
+    def submit(self, funcion, *args):
+        return super().submit(self._esperar, funcion, *args)
+
+    def _esperar(self, funcion, *args):
+        self.continuar.wait(30)
+        return funcion(*args)
+
+
+class _PoolQueMuere(ProcessPoolExecutor):
+    """Pool cuyo proceso termina abruptamente (como al quedarse sin memoria)"""
+
+    def submit(self, funcion, *args):
+        return super().submit(os._exit, 1)
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    servidor = crear_servidor(puerto=0, workers=1, max_cola=1, directorio=str(tmp_path / 'servicio'))
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+    servidor.servicio.cerrar()
+
+
+def _pedir(servidor, metodo, ruta, cuerpo=None):
+    conexion = http.client.HTTPConnection('127.0.0.1', servidor.server_address[1], timeout=30)
+    try:
+        conexion.request(metodo, ruta, body=cuerpo)
+        respuesta = conexion.getresponse()
+        return respuesta.status, json.loads(respuesta.read() or b'null')
+    finally:
+        conexion.close()
+
+
+def _enviar(servidor, libro):
+    with open(libro, 'rb') as f:
+        return _pedir(servidor, 'POST', '/trabajos?nombre=seed.xlsx', f.read())
+
+
+def _esperar_estado(servidor, id_trabajo, estados, limite_s=60):
+    fin = time.time() + limite_s
+    while time.time() < fin:
+        codigo, estado = _pedir(servidor, 'GET', f'/trabajos/{id_trabajo}')
+        assert codigo == 200
+        if estado['estado'] in estados:
+            return estado
+        time.sleep(0.05)
+    raise AssertionError(f"El trabajo no llegó a {estados}: {estado}")
+
+
+def test_enviar_consultar_resultado_y_eliminar(servidor, libro):
+    codigo, creado = _enviar(servidor, libro)
+    assert codigo == 202
+    id_trabajo = creado['id']
+
+    estado = _esperar_estado(servidor, id_trabajo, ('terminado', 'fallo'))
+    assert estado['estado'] == 'terminado' and estado['valido']
+    codigo, resultado = _pedir(servidor, 'GET', creado['url_resultado'])
+    assert codigo == 200
+    assert resultado['estado'] == 'valido' and resultado['archivo'] == 'seed.xlsx'
+
+    assert _pedir(servidor, 'DELETE', f'/trabajos/{id_trabajo}') == (200, {'eliminado': id_trabajo})
+    assert _pedir(servidor, 'GET', f'/trabajos/{id_trabajo}')[0] == 404
+    assert _pedir(servidor, 'DELETE', f'/trabajos/{id_trabajo}')[0] == 404
+
+
+def test_cola_llena_responde_503(servidor, libro):
+    servicio = servidor.servicio
+    servicio._pool.shutdown()
+    servicio._pool = pool = _PoolEnEspera()
+
+    # Un trabajo en proceso (retenido por el pool) y otro en la cola de un solo lugar
+    primero = _enviar(servidor, libro)[1]
+    _esperar_estado(servidor, primero['id'], ('procesando',))
+    codigo, segundo = _enviar(servidor, libro)
+    assert codigo == 202 and segundo['estado'] == 'en_cola'
+    codigo, error = _enviar(servidor, libro)
+    assert codigo == 503 and 'cola' in error['error']
+    # Un trabajo en cola se puede eliminar antes de procesarse
+    assert _pedir(servidor, 'DELETE', f"/trabajos/{segundo['id']}")[0] == 200
+
+    pool.continuar.set()
+    assert _esperar_estado(servidor, primero['id'], ('terminado', 'fallo'))['estado'] == 'terminado'
+    assert _pedir(servidor, 'GET', '/salud')[1]['en_cola'] == 0
+
+
+def test_pool_roto_se_reemplaza_y_se_informa_en_salud(servidor, libro):
+    servicio = servidor.servicio
+    servicio._pool.shutdown()
+    servicio._pool = _PoolQueMuere(max_workers=1)
+
+    roto = _enviar(servidor, libro)[1]
+    assert _esperar_estado(servidor, roto['id'], ('terminado', 'fallo'))['estado'] == 'fallo'
+    resultado = _pedir(servidor, 'GET', roto['url_resultado'])[1]
+    assert 'terminó de forma inesperada' in resultado['error']
+    salud = _pedir(servidor, 'GET', '/salud')[1]
+    assert salud['reinicios_pool'] == 1 and salud['ultimo_reinicio_pool']
+
+    # Los trabajos siguientes usan el pool nuevo
+    siguiente = _enviar(servidor, libro)[1]
+    assert _esperar_estado(servidor, siguiente['id'], ('terminado', 'fallo'))['estado'] == 'terminado'
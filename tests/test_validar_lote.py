@@ -0,0 +1,27 @@
+"""
+Validación por lotes: nombres de los reportes por archivo
+"""
+import json
+import os
+import shutil
+
+from validar_lote import _nombres_reporte, validar_lote
+
+
+def test_nombres_reporte_unicos_y_sin_pisar_el_resumen():
+    archivos = ['a/resumen.xlsx', 'b/Resumen.xlsx', 'a/seed.xlsx', 'b/SEED.xls', 'c/seed.xlsx']
+    assert _nombres_reporte(archivos) == ['resumen_2', 'Resumen_3', 'seed', 'SEED_2', 'seed_3']
+
+
+def test_libro_llamado_resumen_conserva_su_reporte(libro, tmp_path):
+    ruta = str(tmp_path / 'resumen.xlsx')
+    shutil.copy(libro, ruta)
+    salida = str(tmp_path / 'reportes')
+    agregado = validar_lote([ruta], salida, jobs=1, solo_encabezados=True)
+
+    reporte = agregado['resultados'][0]['reporte']
+    assert reporte == os.path.join(salida, 'resumen_2.json')
+    with open(reporte, encoding='utf-8') as f:
+        assert json.load(f)['archivo'] == ruta
+    with open(os.path.join(salida, 'resumen.json'), encoding='utf-8') as f:
+        assert json.load(f)['archivos'] == 1
@@ -0,0 +1,43 @@
+"""
+Modo vigilancia: reintentos con archivos a medio escribir y errores de validación
+"""
+import zipfile
+
+import pytest
+
+import vigilancia
+from vigilancia import VigilanteLibro, vigilar
+
+
+def _vigilar_revisiones(ruta, monkeypatch, error, revisiones=5):
+    """Ejecuta vigilar durante unas revisiones con actualizar fallando siempre con error"""
+    llamadas, salida, esperas = [], [], []
+
+    def actualizar(self):
+        llamadas.append(self._firma_archivo())
+        raise error
+
+    def dormir(segundos):
+        esperas.append(segundos)
+        if len(esperas) >= revisiones:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(VigilanteLibro, 'actualizar', actualizar)
+    monkeypatch.setattr(vigilancia.time, 'sleep', dormir)
+    assert vigilar(ruta, imprimir=salida.append) == 0
+    return llamadas, salida
+
+
+@pytest.mark.parametrize('error', [zipfile.BadZipFile('incompleto'), PermissionError('bloqueado')])
+def test_archivo_a_medio_escribir_se_reintenta(libro, monkeypatch, error):
+    llamadas, salida = _vigilar_revisiones(libro, monkeypatch, error)
+    assert len(llamadas) == 5
+    assert not any('No se pudo revalidar' in linea for linea in salida)
+
+
+@pytest.mark.parametrize('error', [ValueError('columna inesperada'), KeyError('Nivel')])
+def test_error_de_validacion_no_relee_el_mismo_archivo(libro, monkeypatch, error):
+    llamadas, salida = _vigilar_revisiones(libro, monkeypatch, error)
+    assert len(llamadas) == 1
+    assert sum('No se pudo revalidar' in linea for linea in salida) == 1
+    assert any(type(error).__name__ in linea for linea in salida)
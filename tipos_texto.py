@@ -0,0 +1,70 @@
+"""
+Tipo de las columnas de texto de las hojas leídas
+Con pandas 2 las columnas de texto (nombres, direcciones, correos, acudientes)
+se leen como columnas object: un objeto str de Python por celda. El modo
+'pyarrow' las guarda en un arreglo de Arrow (datos contiguos más offsets), de
+modo que .str.contains, .str.strip o .str.split se ejecutan en C sobre el
+arreglo y cada celda ocupa solo sus bytes.
+
+Modos (config.TIPO_TEXTO, variable de entorno SEED_TIPO_TEXTO):
+    ''         como las lee pandas (object en pandas 2; 'str' de Arrow en pandas 3)
+    'object'   siempre object
+    'pyarrow'  string[pyarrow] con NaN como valor faltante (requiere pyarrow)
+
+El modo 'pyarrow' usa la variante con NaN (la misma que 'str' en pandas 3) y no
+la de pd.NA: así las máscaras (.str.contains, ==, isin) siguen siendo bool de
+numpy y los validadores y el exportador funcionan sin cambios. Solo se
+convierten las columnas con texto en todas sus celdas; las columnas mixtas (ej.
+números y texto) quedan como object para no cambiar sus valores.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+from config import TIPO_TEXTO
+
+TIPOS_TEXTO = ('', 'object', 'pyarrow')
+
+
+def tipo_pyarrow() -> pd.StringDtype:
+    """string[pyarrow] con NaN como valor faltante (según la versión de pandas)"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("El modo de texto 'pyarrow' requiere instalar pyarrow (pip install pyarrow)")
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        # pandas 2.1 y 2.2
+        return pd.StringDtype('pyarrow_numpy')
+
+
+def es_texto(serie: pd.Series) -> bool:
+    """Columna object o de texto cuyas celdas con valor son todas texto"""
+    return ((serie.dtype == object or isinstance(serie.dtype, pd.StringDtype))
+            and infer_dtype(serie, skipna=True) == 'string')
+
+
+def convertir_texto(df: pd.DataFrame, tipo_texto: str = None) -> pd.DataFrame:
+    """
+    Convierte las columnas de texto de una hoja al modo indicado
+
+    Args:
+        df: Hoja leída
+        tipo_texto: '', 'object' o 'pyarrow' (por defecto config.TIPO_TEXTO)
+
+    Returns:
+        pd.DataFrame: El mismo DataFrame (modificado) o sin cambios con ''
+    """
+    tipo_texto = TIPO_TEXTO if tipo_texto is None else tipo_texto
+    if tipo_texto not in TIPOS_TEXTO:
+        raise ValueError(f"Tipo de texto no soportado: '{tipo_texto}' (use {', '.join(repr(t) for t in TIPOS_TEXTO)})")
+    if not tipo_texto:
+        return df
+
+    destino = object if tipo_texto == 'object' else tipo_pyarrow()
+    for col in df.columns:
+        serie = df[col]
+        if serie.dtype != destino and es_texto(serie):
+            df[col] = serie.astype(destino)
+    return df
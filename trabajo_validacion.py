@@ -0,0 +1,163 @@
+"""
+Validación de un archivo en un hilo de fondo, con resultados parciales por hoja
+La usa app_streamlit.py para no bloquear la sesión: la interfaz consulta el
+estado en cada ejecución del script y muestra cada hoja apenas se valida. Un
+trabajo se identifica por el SHA-256 del archivo, de modo que volver a ejecutar
+el script no repite la validación, y se cancela al cargar otro archivo.
+"""
+import hashlib
+import threading
+import time
+from contextlib import nullcontext
+from io import BytesIO
+from typing import Any, Dict
+
+import pandas as pd
+
+from config import HOJAS_REQUERIDAS
+from instrumentacion import perfilar
+from metricas import DURACION_VALIDACION_ARCHIVO, VALIDACIONES_EN_CURSO
+from resultados import ResultadoLibro
+from validador_core import construir_contexto, leer_hoja, validar_hoja_completa
+
+HOJAS_VALIDADAS = [hoja for hoja in HOJAS_REQUERIDAS if hoja != "Instrucciones"]
+
+EN_CURSO = 'en_curso'
+TERMINADO = 'terminado'
+CANCELADO = 'cancelado'
+FALLO = 'fallo'
+
+
+def huella_archivo(contenido: bytes) -> str:
+    """SHA-256 del contenido del archivo (identifica el trabajo y sus exportaciones)"""
+    return hashlib.sha256(contenido).hexdigest()
+
+
+class ValidacionCancelada(Exception):
+    """El trabajo se canceló (por ejemplo, al cargar otro archivo)"""
+
+
+class TrabajoValidacion:
+    """
+    Valida un archivo en un hilo de fondo
+
+    Los resultados ('resultados', un ResultadoLibro completo al terminar) son los
+    que muestra la app: cada hoja se agrega apenas se valida.
+
+    Con medir_rendimiento=True las etapas del hilo se perfilan (ver
+    instrumentacion.py): al terminar, 'rendimiento' tiene el resumen por etapa y
+    'traza' la traza en formato Trace Event.
+    """
+
+    def __init__(self, contenido: bytes, nombre: str = None, medir_rendimiento: bool = False):
+        self.contenido = contenido
+        self.nombre = nombre
+        self.medir_rendimiento = medir_rendimiento
+        self.rendimiento = None
+        self.traza = None
+        self.huella = huella_archivo(contenido)
+        self.estado_trabajo = EN_CURSO
+        self.fase = "📖 Leyendo hojas..."
+        self.progreso = 0.0
+        self.error = None
+        self.duracion_s = None
+        self.resultados = ResultadoLibro()
+        self._lock = threading.Lock()
+        self._cancelado = threading.Event()
+        self._hilo = threading.Thread(target=self._ejecutar, name=f"validacion-{self.huella[:8]}", daemon=True)
+
+    def iniciar(self) -> 'TrabajoValidacion':
+        self._hilo.start()
+        return self
+
+    def cancelar(self) -> None:
+        """Pide detener el trabajo; se detiene al terminar la hoja en curso"""
+        self._cancelado.set()
+
+    @property
+    def terminado(self) -> bool:
+        return self.estado_trabajo != EN_CURSO
+
+    def esperar(self, timeout: float = None) -> bool:
+        self._hilo.join(timeout)
+        return self.terminado
+
+    def _revisar_cancelacion(self) -> None:
+        if self._cancelado.is_set():
+            raise ValidacionCancelada()
+
+    def _avanzar(self, fase: str, progreso: float) -> None:
+        with self._lock:
+            self.fase = fase
+            self.progreso = progreso
+
+    def _ejecutar(self) -> None:
+        inicio = time.perf_counter()
+        total = len(HOJAS_VALIDADAS)
+        perfilado = perfilar(solo_este_hilo=True) if self.medir_rendimiento else nullcontext()
+        VALIDACIONES_EN_CURSO.inc()
+        try:
+            with perfilado as traza:
+                self._validar(total)
+            if traza is not None:
+                self.rendimiento = traza.resumen()
+                self.traza = traza.trace_events()
+            with self._lock:
+                self.fase = "✅ Validación completada"
+                self.progreso = 1.0
+                self.estado_trabajo = TERMINADO
+        except ValidacionCancelada:
+            with self._lock:
+                self.estado_trabajo = CANCELADO
+        except Exception as e:
+            with self._lock:
+                self.error = str(e)
+                self.estado_trabajo = FALLO
+        finally:
+            self.duracion_s = time.perf_counter() - inicio
+            VALIDACIONES_EN_CURSO.dec()
+            DURACION_VALIDACION_ARCHIVO.observar(self.duracion_s, resultado=self.estado_trabajo)
+
+    def _validar(self, total: int) -> None:
+        excel_file = pd.ExcelFile(BytesIO(self.contenido))
+
+        # Lectura (40% del progreso): una hoja a la vez para poder cancelar entre hojas
+        hojas = {}
+        for i, hoja in enumerate(HOJAS_VALIDADAS):
+            self._revisar_cancelacion()
+            self._avanzar(f"📖 Leyendo: {hoja} ({i + 1}/{total})", 0.4 * i / total)
+            if hoja in excel_file.sheet_names:
+                hojas[hoja] = leer_hoja(excel_file, hoja)
+
+        self._revisar_cancelacion()
+        self._avanzar("🔄 Construyendo contexto de referencia...", 0.4)
+        contexto = construir_contexto(excel_file, excel_file, hojas)
+        with self._lock:
+            self.resultados.hojas = hojas
+            self.resultados.contexto = contexto
+
+        # Validación (60% restante): cada hoja se publica apenas termina
+        for i, hoja in enumerate(HOJAS_VALIDADAS):
+            self._revisar_cancelacion()
+            self._avanzar(f"📋 Validando: {hoja} ({i + 1}/{total})", 0.4 + 0.6 * i / total)
+            resultado_hoja = validar_hoja_completa(hoja, hojas.get(hoja), contexto)
+            with self._lock:
+                self.resultados.agregar(resultado_hoja)
+
+    def estado(self) -> Dict[str, Any]:
+        """
+        Instantánea del trabajo para la interfaz
+
+        Returns:
+            dict: 'estado', 'fase', 'progreso' (0-1), 'error', 'duracion_s' y
+                'detalles' (copia con las hojas ya validadas, en orden)
+        """
+        with self._lock:
+            return {
+                'estado': self.estado_trabajo,
+                'fase': self.fase,
+                'progreso': self.progreso,
+                'error': self.error,
+                'duracion_s': self.duracion_s,
+                'detalles': dict(self.resultados.detalles)
+            }
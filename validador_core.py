@@ -7,11 +7,67 @@ import pandas as pd
 import warnings
 from config import HOJAS_REQUERIDAS, COLUMNAS_REQUERIDAS
 from validadores import VALIDADORES
+from validadores.incidencias import FILA_ENCABEZADOS, incidencia
+from validadores.vocabularios import Vocabulario
+from instrumentacion import instrumentar, medir
+from resultados import ResultadoHoja, ResultadoLibro
+from tipos_texto import convertir_texto
 
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
+# Hoja de origen de cada clave del contexto de referencia (ver construir_contexto)
+FUENTES_CONTEXTO = {
+    'sedes': "Sedes",
+    'cursos_academicos': "Cursos académicos",
+    'grados': "Grados",
+    'areas': "Áreas",
+    'asignaturas': "Asignaturas",
+    'profesores_docs': "Profesores"
+}
 
-def construir_contexto(excel_file, archivo_excel):
+
+def leer_hoja(excel_file, hoja, tipo_texto=None):
+    """
+    Lee una hoja con header=1 (se instrumenta como etapa 'lectura', ver instrumentacion.py)
+    
+    Args:
+        excel_file: pd.ExcelFile objeto
+        hoja: Nombre de la hoja
+        tipo_texto: Tipo de las columnas de texto ('', 'object' o 'pyarrow';
+            por defecto config.TIPO_TEXTO, ver tipos_texto.py)
+        
+    Returns:
+        pd.DataFrame: Datos de la hoja
+    """
+    with medir('lectura', hoja) as registro:
+        df = convertir_texto(excel_file.parse(hoja, header=1), tipo_texto)
+        registro['filas'] = len(df)
+    return df
+
+
+def leer_hojas(excel_file, hojas=None, tipo_texto=None):
+    """
+    Lee una sola vez las hojas del archivo (header=1) para reutilizarlas en el
+    contexto, la validación y la exportación.
+    
+    Args:
+        excel_file: pd.ExcelFile objeto
+        hojas: Nombres de hojas a leer (por defecto HOJAS_REQUERIDAS sin Instrucciones)
+        tipo_texto: Tipo de las columnas de texto (ver leer_hoja)
+        
+    Returns:
+        dict: Nombre de hoja -> DataFrame (solo las hojas presentes en el archivo)
+    """
+    if hojas is None:
+        hojas = [hoja for hoja in HOJAS_REQUERIDAS if hoja != "Instrucciones"]
+    return {
+        hoja: leer_hoja(excel_file, hoja, tipo_texto)
+        for hoja in hojas if hoja in excel_file.sheet_names
+    }
+
+
+@instrumentar('contexto')
+def construir_contexto(excel_file, archivo_excel, hojas=None):
     """
     Construye el diccionario de contexto con datos de referencia
     para validaciones cruzadas entre hojas.
@@ -19,55 +75,64 @@ def construir_contexto(excel_file, archivo_excel):
     Args:
         excel_file: pd.ExcelFile objeto
         archivo_excel: ruta o archivo Excel
+        hojas: DataFrames ya leídos con leer_hojas (opcional, evita volver a leer el archivo)
         
     Returns:
-        dict: Diccionario con listas de valores válidos por categoría
+        dict: Diccionario con los valores válidos por categoría, cada uno como
+            Vocabulario (lista con índice y tipo Categorical compartidos por
+            todas las hojas que lo referencian; ver validadores/vocabularios.py)
     """
     contexto = {}
     
+    def leer(nombre_hoja):
+        if hojas is not None and nombre_hoja in hojas:
+            return hojas[nombre_hoja]
+        return convertir_texto(pd.read_excel(archivo_excel, sheet_name=nombre_hoja, header=1))
+    
     # Sedes
     if "Sedes" in excel_file.sheet_names:
-        df_sedes = pd.read_excel(archivo_excel, sheet_name="Sedes", header=1)
+        df_sedes = leer("Sedes")
         col_nombre_sede = COLUMNAS_REQUERIDAS["Sedes"][0]
         if col_nombre_sede in df_sedes.columns:
-            contexto['sedes'] = df_sedes[df_sedes[col_nombre_sede].notna()][col_nombre_sede].unique().tolist()
+            contexto['sedes'] = Vocabulario(df_sedes[df_sedes[col_nombre_sede].notna()][col_nombre_sede].unique().tolist())
     
     # Cursos académicos
     if "Cursos académicos" in excel_file.sheet_names:
-        df_cursos = pd.read_excel(archivo_excel, sheet_name="Cursos académicos", header=1)
+        df_cursos = leer("Cursos académicos")
         col_nombre_curso = COLUMNAS_REQUERIDAS["Cursos académicos"][0]
         if col_nombre_curso in df_cursos.columns:
             # Convertir a string para manejar tanto enteros como strings
-            contexto['cursos_academicos'] = [str(int(c)) if isinstance(c, (int, float)) and not pd.isna(c) else str(c) 
-                                             for c in df_cursos[df_cursos[col_nombre_curso].notna()][col_nombre_curso].unique().tolist()]
+            contexto['cursos_academicos'] = Vocabulario(
+                str(int(c)) if isinstance(c, (int, float)) and not pd.isna(c) else str(c)
+                for c in df_cursos[df_cursos[col_nombre_curso].notna()][col_nombre_curso].unique().tolist())
     
     # Grados
     if "Grados" in excel_file.sheet_names:
-        df_grados = pd.read_excel(archivo_excel, sheet_name="Grados", header=1)
+        df_grados = leer("Grados")
         col_nombre_grado = COLUMNAS_REQUERIDAS["Grados"][1]
         if col_nombre_grado in df_grados.columns:
-            contexto['grados'] = [str(g) for g in df_grados[df_grados[col_nombre_grado].notna()][col_nombre_grado].unique().tolist()]
+            contexto['grados'] = Vocabulario(str(g) for g in df_grados[df_grados[col_nombre_grado].notna()][col_nombre_grado].unique().tolist())
     
     # Áreas
     if "Áreas" in excel_file.sheet_names:
-        df_areas = pd.read_excel(archivo_excel, sheet_name="Áreas", header=1)
+        df_areas = leer("Áreas")
         col_nombre_area = COLUMNAS_REQUERIDAS["Áreas"][0]
         if col_nombre_area in df_areas.columns:
-            contexto['areas'] = df_areas[df_areas[col_nombre_area].notna()][col_nombre_area].unique().tolist()
+            contexto['areas'] = Vocabulario(df_areas[df_areas[col_nombre_area].notna()][col_nombre_area].unique().tolist())
     
     # Asignaturas
     if "Asignaturas" in excel_file.sheet_names:
-        df_asignaturas = pd.read_excel(archivo_excel, sheet_name="Asignaturas", header=1)
+        df_asignaturas = leer("Asignaturas")
         col_nombre_asignatura = COLUMNAS_REQUERIDAS["Asignaturas"][0]
         if col_nombre_asignatura in df_asignaturas.columns:
-            contexto['asignaturas'] = df_asignaturas[df_asignaturas[col_nombre_asignatura].notna()][col_nombre_asignatura].unique().tolist()
+            contexto['asignaturas'] = Vocabulario(df_asignaturas[df_asignaturas[col_nombre_asignatura].notna()][col_nombre_asignatura].unique().tolist())
     
     # Profesores
     if "Profesores" in excel_file.sheet_names:
-        df_profesores = pd.read_excel(archivo_excel, sheet_name="Profesores", header=1)
+        df_profesores = leer("Profesores")
         col_num_doc_profesor = COLUMNAS_REQUERIDAS["Profesores"][3]
         if col_num_doc_profesor in df_profesores.columns:
-            contexto['profesores_docs'] = [str(d) for d in df_profesores[df_profesores[col_num_doc_profesor].notna()][col_num_doc_profesor].unique().tolist()]
+            contexto['profesores_docs'] = Vocabulario(str(d) for d in df_profesores[df_profesores[col_num_doc_profesor].notna()][col_num_doc_profesor].unique().tolist())
     
     return contexto
 
@@ -93,12 +158,111 @@ def validar_hoja(nombre_hoja, df, contexto):
     # Validar contenido usando el validador específico
     if nombre_hoja in VALIDADORES:
         validador = VALIDADORES[nombre_hoja]
+        # Algunos validadores convierten columnas (ej. fechas); se valida sobre una copia
+        # superficial para que el DataFrame original se pueda reutilizar en la exportación
+        df = df.copy(deep=False)
         
-        try:
-            # Intentar con contexto
-            resultado = validador(df, nombre_hoja, contexto=contexto)
-        except TypeError:
-            # Validador antiguo sin contexto
-            resultado = validador(df, nombre_hoja)
+        with medir('validar_hoja', nombre_hoja, filas=len(df)):
+            try:
+                # Intentar con contexto
+                resultado = validador(df, nombre_hoja, contexto=contexto)
+            except TypeError:
+                # Validador antiguo sin contexto
+                resultado = validador(df, nombre_hoja)
     
     return resultado
+
+
+def validar_estructura(nombre_hoja, df):
+    """
+    Verifica que la hoja empiece con las columnas requeridas, en orden.
+    
+    Args:
+        nombre_hoja: Nombre de la hoja
+        df: DataFrame con los datos (header=1)
+        
+    Returns:
+        bool: True si la estructura es válida
+    """
+    # Sede principal tiene estructura transpuesta, solo se valida que existe
+    if nombre_hoja == "Sede principal" or nombre_hoja not in COLUMNAS_REQUERIDAS:
+        return True
+    columnas_requeridas = COLUMNAS_REQUERIDAS[nombre_hoja]
+    return columnas_requeridas == df.columns.tolist()[:len(columnas_requeridas)]
+
+
+def validar_hoja_completa(nombre_hoja, df, contexto):
+    """
+    Valida existencia, estructura y contenido de una hoja.
+    
+    Args:
+        nombre_hoja: Nombre de la hoja
+        df: DataFrame con los datos (None si la hoja no existe)
+        contexto: Diccionario de contexto
+        
+    Returns:
+        ResultadoHoja: existencia, estructura y contenido, con 'errores',
+            'advertencias', 'incidencias' (una por mensaje, con regla, columna
+            y filas; ver validadores/incidencias.py) y 'num_filas'
+    """
+    resultado_hoja = ResultadoHoja(nombre_hoja, existe=df is not None)
+    
+    if df is None:
+        resultado_hoja.errores.append(f"La hoja '{nombre_hoja}' no existe")
+        resultado_hoja.incidencias.append(incidencia('error', 'hoja_faltante', resultado_hoja.errores[-1]))
+        return resultado_hoja
+    
+    resultado_hoja.num_filas = len(df)
+    resultado_hoja.estructura_valida = validar_estructura(nombre_hoja, df)
+    if not resultado_hoja.estructura_valida:
+        resultado_hoja.errores.append("Estructura de columnas incorrecta")
+        estructura = incidencia('error', 'estructura', resultado_hoja.errores[-1])
+        estructura['filas'] = [FILA_ENCABEZADOS]
+        resultado_hoja.incidencias.append(estructura)
+    
+    validacion = validar_hoja(nombre_hoja, df, contexto)
+    resultado_hoja.contenido_valido = validacion['valido']
+    resultado_hoja.errores.extend(validacion['errores'])
+    resultado_hoja.advertencias.extend(validacion['advertencias'])
+    resultado_hoja.incidencias.extend(validacion.get('incidencias', []))
+    
+    # Mensajes sin incidencia estructurada (hoja vacía, validadores sin 'incidencias', ...)
+    registrados = {(i['severidad'], i['mensaje']) for i in resultado_hoja.incidencias}
+    for severidad, mensajes in (('error', validacion['errores']), ('advertencia', validacion['advertencias'])):
+        resultado_hoja.incidencias.extend(
+            incidencia(severidad, 'general', mensaje) for mensaje in mensajes
+            if (severidad, mensaje) not in registrados
+        )
+    return resultado_hoja
+
+
+def validar_libro(archivo_excel, excel_file=None, al_validar_hoja=None):
+    """
+    Valida un archivo completo: hojas requeridas, estructura y contenido de cada hoja.
+    
+    Args:
+        archivo_excel: ruta o archivo Excel
+        excel_file: pd.ExcelFile ya abierto (opcional)
+        al_validar_hoja: función (hoja, resultado_hoja) llamada al terminar cada hoja,
+            para escribir reportes a medida que avanza la validación (opcional)
+        
+    Returns:
+        ResultadoLibro: Resultado por hoja ('detalles'), totales, 'hojas'
+            (DataFrames leídos) y 'contexto'
+    """
+    excel_file = excel_file if excel_file is not None else pd.ExcelFile(archivo_excel)
+    hojas = leer_hojas(excel_file)
+    contexto = construir_contexto(excel_file, archivo_excel, hojas)
+    
+    resultados = ResultadoLibro(hojas=hojas, contexto=contexto)
+    
+    for hoja in HOJAS_REQUERIDAS:
+        if hoja == "Instrucciones":
+            continue
+        
+        resultado_hoja = validar_hoja_completa(hoja, hojas.get(hoja), contexto)
+        resultados.agregar(resultado_hoja)
+        if al_validar_hoja is not None:
+            al_validar_hoja(hoja, resultado_hoja)
+    
+    return resultados
@@ -1,33 +1,51 @@
-# Importar todos los validadores
-from .sede_principal import validar_sede_principal
-from .sedes import validar_sedes
-from .administradores import validar_administradores
-from .coordinadores import validar_coordinadores
-from .cursos_academicos import validar_cursos_academicos
-from .periodos import validar_periodos
-from .grados import validar_grados
-from .grupos import validar_grupos
-from .areas import validar_areas
-from .asignaturas import validar_asignaturas
-from .profesores import validar_profesores
-from .clases import validar_clases
-from .matriculas import validar_matriculas
-from .calificaciones_anuales import validar_calificaciones_anuales
+# Los validadores se importan al usarse por primera vez (no al importar el paquete),
+# para que las herramientas que no validan contenido arranquen rápido
+import importlib
+from collections.abc import Mapping
 
-# Mapa de validadores por hoja
-VALIDADORES = {
-    "Sede principal": validar_sede_principal,
-    "Sedes": validar_sedes,
-    "Administradores": validar_administradores,
-    "Coordinadores": validar_coordinadores,
-    "Cursos académicos": validar_cursos_academicos,
-    "Periodos": validar_periodos,
-    "Grados": validar_grados,
-    "Grupos": validar_grupos,
-    "Áreas": validar_areas,
-    "Asignaturas": validar_asignaturas,
-    "Profesores": validar_profesores,
-    "Clases": validar_clases,
-    "Matrículas": validar_matriculas,
-    "Calificaciones anuales": validar_calificaciones_anuales
+# Hoja -> (módulo, función de validación)
+_VALIDADORES_POR_HOJA = {
+    "Sede principal": ('sede_principal', 'validar_sede_principal'),
+    "Sedes": ('sedes', 'validar_sedes'),
+    "Administradores": ('administradores', 'validar_administradores'),
+    "Coordinadores": ('coordinadores', 'validar_coordinadores'),
+    "Cursos académicos": ('cursos_academicos', 'validar_cursos_academicos'),
+    "Periodos": ('periodos', 'validar_periodos'),
+    "Grados": ('grados', 'validar_grados'),
+    "Grupos": ('grupos', 'validar_grupos'),
+    "Áreas": ('areas', 'validar_areas'),
+    "Asignaturas": ('asignaturas', 'validar_asignaturas'),
+    "Profesores": ('profesores', 'validar_profesores'),
+    "Clases": ('clases', 'validar_clases'),
+    "Matrículas": ('matriculas', 'validar_matriculas'),
+    "Calificaciones anuales": ('calificaciones_anuales', 'validar_calificaciones_anuales')
 }
+
+
+def _cargar(modulo, funcion):
+    return getattr(importlib.import_module(f'.{modulo}', __name__), funcion)
+
+
+class _MapaValidadores(Mapping):
+    """Mapa hoja -> función de validación que importa cada validador al primer acceso"""
+    
+    def __getitem__(self, nombre_hoja):
+        return _cargar(*_VALIDADORES_POR_HOJA[nombre_hoja])
+    
+    def __iter__(self):
+        return iter(_VALIDADORES_POR_HOJA)
+    
+    def __len__(self):
+        return len(_VALIDADORES_POR_HOJA)
+
+
+# Mapa de validadores por hoja
+VALIDADORES = _MapaValidadores()
+
+
+def __getattr__(nombre):
+    # Permite seguir importando las funciones: from validadores import validar_sedes
+    for modulo, funcion in _VALIDADORES_POR_HOJA.values():
+        if funcion == nombre:
+            return _cargar(modulo, funcion)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -1,5 +1,6 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
 
 def validar_administradores(df, nombre_hoja):
     """
@@ -14,6 +15,7 @@ def validar_administradores(df, nombre_hoja):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -43,6 +45,7 @@ def validar_administradores(df, nombre_hoja):
                               ~df[col_correo].str.contains('@', na=False)]
         if len(correos_invalidos) > 0:
             errores.append(f"Hay {len(correos_invalidos)} correo(s) con formato inválido")
+            incidencias.append(incidencia('error', 'correo_invalido', errores[-1], col_correo, correos_invalidos))
     
     # Validar que no haya correos duplicados
     if col_correo in df.columns:
@@ -50,6 +53,7 @@ def validar_administradores(df, nombre_hoja):
         if len(duplicados) > 0:
             correos_dup = duplicados[col_correo].unique()
             errores.append(f"Hay {len(duplicados)} correo(s) electrónico(s) duplicado(s): {', '.join(correos_dup)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_correo, duplicados))
     
     # Validar que no haya números de documento duplicados
     if col_num_doc in df.columns:
@@ -57,6 +61,7 @@ def validar_administradores(df, nombre_hoja):
         if len(duplicados) > 0:
             documentos_dup = duplicados[col_num_doc].unique()
             errores.append(f"Hay {len(duplicados)} número(s) de documento duplicado(s): {', '.join(map(str, documentos_dup))}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_num_doc, duplicados))
     
     # Validar que no haya teléfonos duplicados
     if col_telefono in df.columns:
@@ -64,9 +69,11 @@ def validar_administradores(df, nombre_hoja):
         if len(duplicados) > 0:
             telefonos_dup = duplicados[col_telefono].unique()
             errores.append(f"Hay {len(duplicados)} teléfono(s) duplicado(s): {', '.join(map(str, telefonos_dup))}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_telefono, duplicados))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -1,5 +1,6 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
 
 def validar_areas(df, nombre_hoja):
     """
@@ -14,6 +15,7 @@ def validar_areas(df, nombre_hoja):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -38,9 +40,11 @@ def validar_areas(df, nombre_hoja):
         if len(duplicados) > 0:
             nombres_dup = duplicados[col_nombre].unique()
             errores.append(f"Hay {len(duplicados)} nombre(s) de área duplicado(s): {', '.join(nombres_dup)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -1,5 +1,6 @@
-import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
+from .vocabularios import vocabulario
 
 def validar_asignaturas(df, nombre_hoja, contexto=None):
     """
@@ -15,6 +16,7 @@ def validar_asignaturas(df, nombre_hoja, contexto=None):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -41,34 +43,29 @@ def validar_asignaturas(df, nombre_hoja, contexto=None):
         if len(duplicados) > 0:
             nombres_dup = duplicados[col_nombre].unique()
             errores.append(f"Hay {len(duplicados)} nombre(s) de asignatura duplicado(s): {', '.join(nombres_dup)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados))
     
     # Validar que las áreas asociadas existan en la hoja Áreas
     if contexto and 'areas' in contexto and col_area in df.columns:
-        areas_validas = contexto['areas']
-        areas_asignadas = df[df[col_area].notna()][col_area].unique()
-        areas_invalidas = [area for area in areas_asignadas if area not in areas_validas]
+        areas_invalidas, filas_invalidas = vocabulario(contexto['areas']).inexistentes(df[col_area])
         
         if areas_invalidas:
             errores.append(f"Hay {len(areas_invalidas)} área(s) asociada(s) que no existen: {', '.join(areas_invalidas)}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_area, filas_invalidas))
     
     # Validar que los grados asociados (separados por coma) existan en la hoja Grados
     if contexto and 'grados' in contexto and col_grados in df.columns:
-        grados_validos = contexto['grados']
-        grados_invalidos_encontrados = set()
-        
-        for _, row in df.iterrows():
-            if pd.notna(row[col_grados]):
-                # Separar por coma y limpiar espacios
-                grados_lista = [grado.strip() for grado in str(row[col_grados]).split(',')]
-                for grado in grados_lista:
-                    if grado and grado not in grados_validos:
-                        grados_invalidos_encontrados.add(grado)
+        # Cada celda es una lista separada por coma; cada grado se compara sin espacios
+        grados_invalidos_encontrados, filas_invalidas = vocabulario(contexto['grados']).inexistentes(
+            df[col_grados], separador=',')
         
         if grados_invalidos_encontrados:
             errores.append(f"Hay {len(grados_invalidos_encontrados)} grado(s) asociado(s) que no existen: {', '.join(sorted(grados_invalidos_encontrados))}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_grados, filas_invalidas))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -1,5 +1,11 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
+from .vocabularios import vocabulario
+
+def _año_texto(valor):
+    """Año escolar como texto, igual que al compararlo con los cursos académicos"""
+    return str(int(valor)) if isinstance(valor, (int, float)) else str(valor).strip()
 
 def validar_calificaciones_anuales(df, nombre_hoja, contexto=None):
     """
@@ -15,6 +21,7 @@ def validar_calificaciones_anuales(df, nombre_hoja, contexto=None):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Validar que no esté vacía
     if df.empty:
@@ -38,32 +45,22 @@ def validar_calificaciones_anuales(df, nombre_hoja, contexto=None):
     
     # 1. Validar año escolar
     if contexto and 'cursos_academicos' in contexto and col_año_escolar in df.columns:
-        cursos_validos = contexto['cursos_academicos']
-        años_invalidos = set()
-        
-        for _, row in df.iterrows():
-            if pd.notna(row[col_año_escolar]):
-                # Convertir a string sin decimales si es número
-                año = str(int(row[col_año_escolar])) if isinstance(row[col_año_escolar], (int, float)) else str(row[col_año_escolar]).strip()
-                if año and año not in cursos_validos:
-                    años_invalidos.add(año)
+        # Cada año distinto se convierte a texto sin decimales una sola vez
+        años_invalidos, filas_invalidas = vocabulario(contexto['cursos_academicos']).inexistentes(
+            df[col_año_escolar], normalizar=_año_texto, ignorar_vacios=True)
         
         if años_invalidos:
             errores.append(f"Hay {len(años_invalidos)} año(s) escolar(es) que no existen: {', '.join(sorted(años_invalidos))}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_año_escolar, filas_invalidas))
     
     # 2. Validar sede asignada
     if contexto and 'sedes' in contexto and col_sede in df.columns:
-        sedes_validas = contexto['sedes']
-        sedes_invalidas = set()
-        
-        for _, row in df.iterrows():
-            if pd.notna(row[col_sede]):
-                sede = str(row[col_sede]).strip()
-                if sede and sede not in sedes_validas:
-                    sedes_invalidas.add(sede)
+        sedes_invalidas, filas_invalidas = vocabulario(contexto['sedes']).inexistentes(
+            df[col_sede], normalizar=lambda sede: str(sede).strip(), ignorar_vacios=True)
         
         if sedes_invalidas:
             errores.append(f"Hay {len(sedes_invalidas)} sede(s) asignada(s) que no existen: {', '.join(sorted(sedes_invalidas))}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_sede, filas_invalidas))
     
     # 3. Validar tipo de nota (enum)
     TIPOS_NOTA_VALIDOS = ["Cualitativa (Letras)", "Cuantitativa (Números)"]
@@ -77,6 +74,7 @@ def validar_calificaciones_anuales(df, nombre_hoja, contexto=None):
                 f"Hay {len(tipos_invalidos)} registro(s) con tipo de nota inválido. "
                 f"Valores encontrados: {', '.join(map(str, valores_unicos))}"
             )
+            incidencias.append(incidencia('error', 'valor_no_permitido', errores[-1], col_tipo_nota, tipos_invalidos))
     
     # 4. Validar promedio anual (solo para notas cuantitativas)
     if col_tipo_nota in df.columns and col_promedio in df.columns:
@@ -94,6 +92,7 @@ def validar_calificaciones_anuales(df, nombre_hoja, contexto=None):
                     errores.append(
                         f"Hay {len(no_numericos)} registro(s) cuantitativos con promedio no numérico"
                     )
+                    incidencias.append(incidencia('error', 'promedio_no_numerico', errores[-1], col_promedio, no_numericos))
                 
                 # Verificar rango 0-5
                 df_cuantitativa_valid = df_cuantitativa.copy()
@@ -107,16 +106,15 @@ def validar_calificaciones_anuales(df, nombre_hoja, contexto=None):
                     errores.append(
                         f"Hay {len(fuera_rango)} promedio(s) fuera del rango válido (0-5)"
                     )
+                    incidencias.append(incidencia('error', 'valor_fuera_rango', errores[-1], col_promedio, fuera_rango))
             except Exception as e:
                 advertencias.append(f"No se pudieron validar completamente los promedios: {str(e)}")
     
     # 5. Validar asignatura con reporte estadístico detallado (solo advertencia)
     if contexto and 'asignaturas' in contexto and col_asignatura in df.columns:
-        asignaturas_validas = contexto['asignaturas']
-        
-        # Filtrar registros con asignaturas inválidas
-        registros_invalidos = df[df[col_asignatura].notna() & 
-                                ~df[col_asignatura].isin(asignaturas_validas)]
+        # Filtrar registros con asignaturas inválidas: código -1 en el vocabulario compartido
+        codigos = vocabulario(contexto['asignaturas']).codificar(df[col_asignatura]).codes
+        registros_invalidos = df[df[col_asignatura].notna().to_numpy() & (codigos == -1)]
         
         if not registros_invalidos.empty:
             total_records = len(df[df[col_asignatura].notna()])
@@ -134,25 +132,30 @@ def validar_calificaciones_anuales(df, nombre_hoja, contexto=None):
             )
             
             advertencias.append(warning_msg)
+            incidencias.append(incidencia('advertencia', 'referencia_inexistente', advertencias[-1], col_asignatura,
+                                          registros_invalidos))
     
     # 6. Mostrar todos los tipos únicos de "Promedio anual"
     if col_promedio in df.columns:
         tipos_promedio = df[df[col_promedio].notna()][col_promedio].unique()
         if len(tipos_promedio) > 0:
             advertencias.append(
-                f"Tipos encontrados en '{col_promedio}': {', '.join(map(str, sorted(tipos_promedio)))}"
+                f"Tipos encontrados en '{col_promedio}': {', '.join(map(str, sorted(tipos_promedio, key=str)))}"
             )
+            incidencias.append(incidencia('advertencia', 'valores_encontrados', advertencias[-1], col_promedio))
     
     # 7. Mostrar todos los tipos únicos de "Aprobó"
     if col_aprobo in df.columns:
         tipos_aprobo = df[df[col_aprobo].notna()][col_aprobo].unique()
         if len(tipos_aprobo) > 0:
             advertencias.append(
-                f"Valores encontrados en '{col_aprobo}': {', '.join(map(str, sorted(tipos_aprobo)))}"
+                f"Valores encontrados en '{col_aprobo}': {', '.join(map(str, sorted(tipos_aprobo, key=str)))}"
             )
+            incidencias.append(incidencia('advertencia', 'valores_encontrados', advertencias[-1], col_aprobo))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
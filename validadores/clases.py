@@ -1,5 +1,6 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
 
 def validar_clases(df, nombre_hoja):
     """
@@ -14,6 +15,7 @@ def validar_clases(df, nombre_hoja):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Validar que no esté vacía
     if df.empty:
@@ -32,9 +34,11 @@ def validar_clases(df, nombre_hoja):
         duplicados = df[df.duplicated(subset=columnas_clave, keep=False)]
         if len(duplicados) > 0:
             advertencias.append(f"Hay {len(duplicados)} clase(s) potencialmente duplicada(s)")
+            incidencias.append(incidencia('advertencia', 'duplicado', advertencias[-1], None, duplicados))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -1,5 +1,6 @@
-import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
+from .vocabularios import vocabulario
 
 def validar_coordinadores(df, nombre_hoja, contexto=None):
     """
@@ -15,6 +16,7 @@ def validar_coordinadores(df, nombre_hoja, contexto=None):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -43,6 +45,7 @@ def validar_coordinadores(df, nombre_hoja, contexto=None):
                               ~df[col_correo].str.contains('@', na=False)]
         if len(correos_invalidos) > 0:
             errores.append(f"Hay {len(correos_invalidos)} correo(s) con formato inválido")
+            incidencias.append(incidencia('error', 'correo_invalido', errores[-1], col_correo, correos_invalidos))
     
     # Validar que no haya correos duplicados
     if col_correo in df.columns:
@@ -50,6 +53,7 @@ def validar_coordinadores(df, nombre_hoja, contexto=None):
         if len(duplicados) > 0:
             correos_dup = duplicados[col_correo].unique()
             errores.append(f"Hay {len(duplicados)} correo(s) electrónico(s) duplicado(s): {', '.join(correos_dup)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_correo, duplicados))
     
     # Validar que no haya números de documento duplicados
     if col_num_doc in df.columns:
@@ -57,18 +61,19 @@ def validar_coordinadores(df, nombre_hoja, contexto=None):
         if len(duplicados) > 0:
             documentos_dup = duplicados[col_num_doc].unique()
             errores.append(f"Hay {len(duplicados)} número(s) de documento duplicado(s): {', '.join(map(str, documentos_dup))}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_num_doc, duplicados))
     
     # Validar que las sedes asignadas existan en la hoja Sedes
     if contexto and 'sedes' in contexto and col_sede in df.columns:
-        sedes_validas = contexto['sedes']
-        sedes_asignadas = df[df[col_sede].notna()][col_sede].unique()
-        sedes_invalidas = [sede for sede in sedes_asignadas if sede not in sedes_validas]
+        sedes_invalidas, filas_invalidas = vocabulario(contexto['sedes']).inexistentes(df[col_sede])
         
         if sedes_invalidas:
             errores.append(f"Hay {len(sedes_invalidas)} sede(s) asignada(s) que no existen: {', '.join(sedes_invalidas)}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_sede, filas_invalidas))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -1,5 +1,6 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
 
 def validar_cursos_academicos(df, nombre_hoja):
     """
@@ -14,6 +15,7 @@ def validar_cursos_academicos(df, nombre_hoja):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -40,6 +42,7 @@ def validar_cursos_academicos(df, nombre_hoja):
         if len(duplicados) > 0:
             nombres_dup = duplicados[col_nombre].unique()
             errores.append(f"Hay {len(duplicados)} nombre(s) de año escolar duplicado(s): {', '.join(nombres_dup)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados))
     
     # Validar que las fechas sean válidas
     if col_fecha_inicio in df.columns and col_fecha_fin in df.columns:
@@ -52,10 +55,12 @@ def validar_cursos_academicos(df, nombre_hoja):
             fechas_inicio_invalidas = df[df[col_fecha_inicio].isna()]
             if len(fechas_inicio_invalidas) > 0:
                 errores.append(f"Hay {len(fechas_inicio_invalidas)} fecha(s) de inicio inválida(s)")
+                incidencias.append(incidencia('error', 'fecha_invalida', errores[-1], col_fecha_inicio, fechas_inicio_invalidas))
             
             fechas_fin_invalidas = df[df[col_fecha_fin].isna()]
             if len(fechas_fin_invalidas) > 0:
                 errores.append(f"Hay {len(fechas_fin_invalidas)} fecha(s) de fin inválida(s)")
+                incidencias.append(incidencia('error', 'fecha_invalida', errores[-1], col_fecha_fin, fechas_fin_invalidas))
             
             # Validar que fecha fin sea mayor que fecha inicio
             fechas_logicas_invalidas = df[(df[col_fecha_inicio].notna()) & 
@@ -63,11 +68,13 @@ def validar_cursos_academicos(df, nombre_hoja):
                                           (df[col_fecha_fin] <= df[col_fecha_inicio])]
             if len(fechas_logicas_invalidas) > 0:
                 errores.append(f"Hay {len(fechas_logicas_invalidas)} curso(s) con fecha fin menor o igual a fecha inicio")
+                incidencias.append(incidencia('error', 'rango_fechas', errores[-1], col_fecha_fin, fechas_logicas_invalidas))
         except Exception as e:
             advertencias.append(f"No se pudieron validar completamente las fechas: {str(e)}")
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -1,5 +1,6 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
 
 def validar_grados(df, nombre_hoja):
     """
@@ -14,6 +15,7 @@ def validar_grados(df, nombre_hoja):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -54,6 +56,7 @@ def validar_grados(df, nombre_hoja):
             combinaciones_dup = duplicados[[col_nivel, col_nombre]].drop_duplicates()
             descripciones = [f"{row[col_nivel]} - {row[col_nombre]}" for _, row in combinaciones_dup.iterrows()]
             errores.append(f"Hay {len(duplicados)} combinación(es) Nivel-Nombre duplicada(s): {', '.join(descripciones)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados))
     
     # Validar que el tipo de grado sea válido
     if col_tipo in df.columns:
@@ -61,6 +64,7 @@ def validar_grados(df, nombre_hoja):
         if len(tipos_invalidos) > 0:
             tipos_encontrados = tipos_invalidos[col_tipo].unique()
             errores.append(f"Hay {len(tipos_invalidos)} tipo(s) de grado inválido(s): {', '.join(tipos_encontrados)}. Valores permitidos: {', '.join(TIPOS_VALIDOS)}")
+            incidencias.append(incidencia('error', 'valor_no_permitido', errores[-1], col_tipo, tipos_invalidos))
     
     # Validar que el campo culminante sea booleano (Sí o No)
     if col_culminante in df.columns:
@@ -68,9 +72,11 @@ def validar_grados(df, nombre_hoja):
         if len(valores_invalidos) > 0:
             valores_encontrados = valores_invalidos[col_culminante].unique()
             errores.append(f"Hay {len(valores_invalidos)} valor(es) inválido(s) en '¿Último grado culminante?': {', '.join(map(str, valores_encontrados))}. Solo se permite: Sí o No")
+            incidencias.append(incidencia('error', 'valor_no_permitido', errores[-1], col_culminante, valores_invalidos))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
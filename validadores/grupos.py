@@ -1,5 +1,6 @@
-import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
+from .vocabularios import vocabulario
 
 def validar_grupos(df, nombre_hoja, contexto=None):
     """
@@ -15,6 +16,7 @@ def validar_grupos(df, nombre_hoja, contexto=None):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -47,47 +49,42 @@ def validar_grupos(df, nombre_hoja, contexto=None):
             if len(duplicados_sede) > 0:
                 nombres_dup = duplicados_sede[col_nombre].unique()
                 nombres_dup_str = [str(x) for x in nombres_dup]
-                duplicados_por_sede.append(f"En la sede '{sede}': {', '.join(nombres_dup_str)}")
+                duplicados_por_sede.append((f"En la sede '{sede}': {', '.join(nombres_dup_str)}", duplicados_sede))
         
         if duplicados_por_sede:
-            for msg in duplicados_por_sede:
+            for msg, duplicados_sede in duplicados_por_sede:
                 errores.append(f"Nombres de grupo duplicados en la misma sede: {msg}")
+                incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados_sede))
     
     # Validar que los grados asociados existan en la hoja Grados
     if contexto and 'grados' in contexto and col_grado in df.columns:
-        grados_validos = contexto['grados']
-        grados_asignados = df[df[col_grado].notna()][col_grado].unique()
-        grados_invalidos = [grado for grado in grados_asignados if grado not in grados_validos]
+        grados_invalidos, filas_invalidas = vocabulario(contexto['grados']).inexistentes(df[col_grado])
         
         if grados_invalidos:
             # Convertir a strings por si contienen int64 de Pandas/Excel
             grados_invalidos_str = [str(x) for x in grados_invalidos]
             errores.append(f"Hay {len(grados_invalidos)} grado(s) asignado(s) que no existen: {', '.join(grados_invalidos_str)}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_grado, filas_invalidas))
     
     # Validar que las sedes asociadas (separadas por coma) existan en la hoja Sedes
     if contexto and 'sedes' in contexto and col_sedes in df.columns:
-        sedes_validas = contexto['sedes']
-        sedes_invalidas_encontradas = set()
-        
-        for _, row in df.iterrows():
-            if pd.notna(row[col_sedes]):
-                # Separar por coma y limpiar espacios
-                sedes_lista = [sede.strip() for sede in str(row[col_sedes]).split(',')]
-                for sede in sedes_lista:
-                    if sede and sede not in sedes_validas:
-                        sedes_invalidas_encontradas.add(sede)
+        # Cada celda es una lista separada por coma; cada sede se compara sin espacios
+        sedes_invalidas_encontradas, filas_invalidas = vocabulario(contexto['sedes']).inexistentes(df[col_sedes], separador=',')
         
         if sedes_invalidas_encontradas:
             errores.append(f"Hay {len(sedes_invalidas_encontradas)} sede(s) asociada(s) que no existen: {', '.join(sorted(sedes_invalidas_encontradas))}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_sedes, filas_invalidas))
     
     # Validar capacidad (debe ser número positivo)
     if col_capacidad in df.columns:
         capacidades_invalidas = df[df[col_capacidad].notna() & (df[col_capacidad] <= 0)]
         if len(capacidades_invalidas) > 0:
             errores.append(f"Hay {len(capacidades_invalidas)} grupo(s) con capacidad inválida (debe ser mayor a 0)")
+            incidencias.append(incidencia('error', 'valor_fuera_rango', errores[-1], col_capacidad, capacidades_invalidas))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -0,0 +1,46 @@
+"""
+Incidencias estructuradas de los validadores
+Además de los mensajes de 'errores' y 'advertencias', cada validador retorna en
+'incidencias' un registro por mensaje con la regla, la columna y las filas de
+Excel afectadas, que usan los reportes JSONL y SARIF (ver reporte_incidencias.py).
+"""
+# Fila 1: título, fila 2: encabezados (header=1); el índice 0 del DataFrame es la fila 3
+FILA_ENCABEZADOS = 2
+FILA_PRIMER_DATO = FILA_ENCABEZADOS + 1
+
+
+def filas_excel(filas):
+    """
+    Números de fila en Excel de un DataFrame o Serie filtrados (o de un índice)
+
+    Args:
+        filas: DataFrame, Serie o índice con las filas afectadas (header=1)
+
+    Returns:
+        list: Números de fila (base 1) en la hoja de Excel
+    """
+    indice = getattr(filas, 'index', filas)
+    return [int(i) + FILA_PRIMER_DATO for i in indice]
+
+
+def incidencia(severidad, regla, mensaje, columna=None, filas=None):
+    """
+    Crea el registro de una incidencia
+
+    Args:
+        severidad: 'error' o 'advertencia'
+        regla: Identificador de la regla (ej. 'duplicado', 'referencia_inexistente')
+        mensaje: El mismo texto agregado a 'errores' o 'advertencias'
+        columna: Columna afectada (None si aplica a la hoja)
+        filas: DataFrame/Serie filtrados con las filas afectadas (None si no aplica)
+
+    Returns:
+        dict: 'severidad', 'regla', 'mensaje', 'columna' y 'filas' (números de fila en Excel)
+    """
+    return {
+        'severidad': severidad,
+        'regla': regla,
+        'mensaje': mensaje,
+        'columna': columna,
+        'filas': filas_excel(filas) if filas is not None else []
+    }
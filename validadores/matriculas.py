@@ -1,5 +1,6 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
 
 def validar_matriculas(df, nombre_hoja):
     """
@@ -14,6 +15,7 @@ def validar_matriculas(df, nombre_hoja):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Validar que no esté vacía
     if df.empty:
@@ -30,12 +32,15 @@ def validar_matriculas(df, nombre_hoja):
                               ~df['Correo electrónico'].str.contains('@', na=False)]
         if len(correos_invalidos) > 0:
             advertencias.append(f"Hay {len(correos_invalidos)} correo(s) de estudiante con formato inválido")
+            incidencias.append(incidencia('advertencia', 'correo_invalido', advertencias[-1], 'Correo electrónico',
+                                          correos_invalidos))
     
     # Validar duplicados de documento
     if 'Número de documento' in df.columns:
         duplicados = df[df['Número de documento'].duplicated(keep=False)]
         if len(duplicados) > 0:
             errores.append(f"Hay {len(duplicados)} número(s) de documento duplicado(s)")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], 'Número de documento', duplicados))
     
     # Validar que las fechas de nacimiento sean coherentes
     if 'Fecha de nacimiento' in df.columns:
@@ -44,11 +49,13 @@ def validar_matriculas(df, nombre_hoja):
             fechas_futuras = df[df['Fecha de nacimiento'] > pd.Timestamp.now()]
             if len(fechas_futuras) > 0:
                 errores.append(f"Hay {len(fechas_futuras)} estudiante(s) con fecha de nacimiento futura")
+                incidencias.append(incidencia('error', 'fecha_futura', errores[-1], 'Fecha de nacimiento', fechas_futuras))
         except:
             advertencias.append("No se pudieron validar las fechas de nacimiento")
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
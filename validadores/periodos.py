@@ -1,5 +1,7 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
+from .vocabularios import vocabulario
 
 def validar_periodos(df, nombre_hoja, contexto=None):
     """
@@ -15,6 +17,7 @@ def validar_periodos(df, nombre_hoja, contexto=None):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -49,12 +52,14 @@ def validar_periodos(df, nombre_hoja, contexto=None):
                 errores.append(
                     f"Hay {len(duplicados)} periodo(s) duplicado(s) dentro del mismo curso: {', '.join(combos_list)}"
                 )
+                incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados))
         else:
             # Sin columna de curso, usar comportamiento anterior (global)
             duplicados = df[df[col_nombre].duplicated(keep=False) & df[col_nombre].notna()]
             if len(duplicados) > 0:
                 nombres_dup = duplicados[col_nombre].unique()
                 errores.append(f"Hay {len(duplicados)} nombre(s) de periodo duplicado(s): {', '.join(nombres_dup)}")
+                incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados))
     
     # Validar que las fechas sean válidas
     if col_fecha_inicio in df.columns and col_fecha_fin in df.columns:
@@ -67,10 +72,12 @@ def validar_periodos(df, nombre_hoja, contexto=None):
             fechas_inicio_invalidas = df[df[col_fecha_inicio].isna()]
             if len(fechas_inicio_invalidas) > 0:
                 errores.append(f"Hay {len(fechas_inicio_invalidas)} fecha(s) de inicio inválida(s)")
+                incidencias.append(incidencia('error', 'fecha_invalida', errores[-1], col_fecha_inicio, fechas_inicio_invalidas))
             
             fechas_fin_invalidas = df[df[col_fecha_fin].isna()]
             if len(fechas_fin_invalidas) > 0:
                 errores.append(f"Hay {len(fechas_fin_invalidas)} fecha(s) de fin inválida(s)")
+                incidencias.append(incidencia('error', 'fecha_invalida', errores[-1], col_fecha_fin, fechas_fin_invalidas))
             
             # Validar que fecha fin sea mayor que fecha inicio
             fechas_logicas_invalidas = df[(df[col_fecha_inicio].notna()) & 
@@ -78,20 +85,21 @@ def validar_periodos(df, nombre_hoja, contexto=None):
                                           (df[col_fecha_fin] <= df[col_fecha_inicio])]
             if len(fechas_logicas_invalidas) > 0:
                 errores.append(f"Hay {len(fechas_logicas_invalidas)} periodo(s) con fecha fin menor o igual a fecha inicio")
+                incidencias.append(incidencia('error', 'rango_fechas', errores[-1], col_fecha_fin, fechas_logicas_invalidas))
         except Exception as e:
             advertencias.append(f"No se pudieron validar completamente las fechas: {str(e)}")
     
     # Validar que los años escolares asociados existan en Cursos académicos
     if contexto and 'cursos_academicos' in contexto and col_curso in df.columns:
-        cursos_validos = contexto['cursos_academicos']
-        cursos_asociados = df[df[col_curso].notna()][col_curso].unique()
-        cursos_invalidos = [curso for curso in cursos_asociados if curso not in cursos_validos]
+        cursos_invalidos, filas_invalidas = vocabulario(contexto['cursos_academicos']).inexistentes(df[col_curso])
         
         if cursos_invalidos:
             errores.append(f"Hay {len(cursos_invalidos)} año(s) escolar(es) asociado(s) que no existen: {', '.join(cursos_invalidos)}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_curso, filas_invalidas))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
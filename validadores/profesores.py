@@ -1,5 +1,6 @@
-import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
+from .vocabularios import vocabulario
 
 def validar_profesores(df, nombre_hoja, contexto=None):
     """
@@ -15,6 +16,7 @@ def validar_profesores(df, nombre_hoja, contexto=None):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -43,6 +45,7 @@ def validar_profesores(df, nombre_hoja, contexto=None):
                               ~df[col_correo].str.contains('@', na=False)]
         if len(correos_invalidos) > 0:
             errores.append(f"Hay {len(correos_invalidos)} correo(s) con formato inválido")
+            incidencias.append(incidencia('error', 'correo_invalido', errores[-1], col_correo, correos_invalidos))
     
     # Validar que no haya números de documento duplicados
     if col_num_doc in df.columns:
@@ -50,6 +53,7 @@ def validar_profesores(df, nombre_hoja, contexto=None):
         if len(duplicados) > 0:
             documentos_dup = duplicados[col_num_doc].unique()
             errores.append(f"Hay {len(duplicados)} número(s) de documento duplicado(s): {', '.join(map(str, documentos_dup))}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_num_doc, duplicados))
     
     # Validar que no haya teléfonos duplicados
     if col_telefono in df.columns:
@@ -57,6 +61,7 @@ def validar_profesores(df, nombre_hoja, contexto=None):
         if len(duplicados) > 0:
             telefonos_dup = duplicados[col_telefono].unique()
             errores.append(f"Hay {len(duplicados)} teléfono(s) duplicado(s): {', '.join(map(str, telefonos_dup))}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_telefono, duplicados))
     
     # Validar que no haya correos duplicados
     if col_correo in df.columns:
@@ -64,34 +69,29 @@ def validar_profesores(df, nombre_hoja, contexto=None):
         if len(duplicados) > 0:
             correos_dup = duplicados[col_correo].unique()
             errores.append(f"Hay {len(duplicados)} correo(s) electrónico(s) duplicado(s): {', '.join(correos_dup)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_correo, duplicados))
     
     # Validar que las sedes asignadas existan en la hoja Sedes
     if contexto and 'sedes' in contexto and col_sede in df.columns:
-        sedes_validas = contexto['sedes']
-        sedes_asignadas = df[df[col_sede].notna()][col_sede].unique()
-        sedes_invalidas = [sede for sede in sedes_asignadas if sede not in sedes_validas]
+        sedes_invalidas, filas_invalidas = vocabulario(contexto['sedes']).inexistentes(df[col_sede])
         
         if sedes_invalidas:
             errores.append(f"Hay {len(sedes_invalidas)} sede(s) asignada(s) que no existen: {', '.join(sedes_invalidas)}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_sede, filas_invalidas))
     
     # Validar que las asignaturas a cargo (separadas por coma) existan en la hoja Asignaturas
     if contexto and 'asignaturas' in contexto and col_asignaturas in df.columns:
-        asignaturas_validas = contexto['asignaturas']
-        asignaturas_invalidas_encontradas = set()
-        
-        for _, row in df.iterrows():
-            if pd.notna(row[col_asignaturas]):
-                # Separar por coma y limpiar espacios
-                asignaturas_lista = [asig.strip() for asig in str(row[col_asignaturas]).split(',')]
-                for asignatura in asignaturas_lista:
-                    if asignatura and asignatura not in asignaturas_validas:
-                        asignaturas_invalidas_encontradas.add(asignatura)
+        # Cada celda es una lista separada por coma; cada asignatura se compara sin espacios
+        asignaturas_invalidas_encontradas, filas_invalidas = vocabulario(contexto['asignaturas']).inexistentes(
+            df[col_asignaturas], separador=',')
         
         if asignaturas_invalidas_encontradas:
             errores.append(f"Hay {len(asignaturas_invalidas_encontradas)} asignatura(s) a cargo que no existen: {', '.join(sorted(asignaturas_invalidas_encontradas))}")
+            incidencias.append(incidencia('error', 'referencia_inexistente', errores[-1], col_asignaturas, filas_invalidas))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
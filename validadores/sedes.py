@@ -1,5 +1,6 @@
 import pandas as pd
 from config import COLUMNAS_REQUERIDAS
+from .incidencias import incidencia
 
 def validar_sedes(df, nombre_hoja):
     """
@@ -14,6 +15,7 @@ def validar_sedes(df, nombre_hoja):
     """
     errores = []
     advertencias = []
+    incidencias = []
     
     # Obtener nombres de columnas desde la configuración
     columnas = COLUMNAS_REQUERIDAS[nombre_hoja]
@@ -42,6 +44,7 @@ def validar_sedes(df, nombre_hoja):
                               ~df[col_correo].str.contains('@', na=False)]
         if len(correos_invalidos) > 0:
             errores.append(f"Hay {len(correos_invalidos)} correo(s) con formato inválido")
+            incidencias.append(incidencia('error', 'correo_invalido', errores[-1], col_correo, correos_invalidos))
     
     # Validar que no haya nombres de institución duplicados
     if col_nombre in df.columns:
@@ -49,6 +52,7 @@ def validar_sedes(df, nombre_hoja):
         if len(duplicados) > 0:
             nombres_dup = duplicados[col_nombre].unique()
             errores.append(f"Hay {len(duplicados)} nombre(s) de institución duplicado(s): {', '.join(nombres_dup)}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_nombre, duplicados))
     
     # Validar que no haya teléfonos duplicados
     # NOTA: Los teléfonos pueden repetirse entre sedes - se ignoran duplicados
@@ -62,9 +66,11 @@ def validar_sedes(df, nombre_hoja):
         if len(duplicados) > 0:
             codigos_dup = duplicados[col_dane].unique()
             errores.append(f"Hay {len(duplicados)} código(s) Dane duplicado(s): {', '.join(map(str, codigos_dup))}")
+            incidencias.append(incidencia('error', 'duplicado', errores[-1], col_dane, duplicados))
     
     return {
         'valido': len(errores) == 0,
         'errores': errores,
-        'advertencias': advertencias
+        'advertencias': advertencias,
+        'incidencias': incidencias
     }
@@ -0,0 +1,114 @@
+"""
+Vocabularios compartidos de las claves de referencia entre hojas
+validador_core.construir_contexto guarda cada dominio de referencia (sedes,
+cursos académicos, grados, áreas, asignaturas, documentos de profesores) como un
+Vocabulario: la lista de valores válidos de siempre, más un índice hash de
+pandas y un tipo Categorical construidos una sola vez.
+
+Los validadores codifican cada columna que referencia un dominio como un
+Categorical sobre ese tipo compartido: los valores se factorizan (una pasada
+en C), solo los valores distintos se normalizan y se buscan en el índice, y una
+referencia inexistente es un código -1 en una fila con valor.
+"""
+import numpy as np
+import pandas as pd
+
+
+class Vocabulario(list):
+    """
+    Valores válidos de un dominio de referencia
+
+    Se comporta como la lista de valores (pertenencia con `in`, iteración,
+    isin), pero la pertenencia usa el índice hash. No se modifica después de
+    creado: el índice no se actualiza.
+    """
+
+    def __init__(self, valores=()):
+        super().__init__(valores)
+        # Valores repetidos (ej. 2024 y '2024' en cursos) se indexan una vez
+        self.indice = pd.Index(list(self), dtype=object).drop_duplicates()
+        self.tipo = pd.CategoricalDtype(self.indice)
+
+    def __contains__(self, valor):
+        try:
+            return valor in self.indice
+        except TypeError:
+            return list.__contains__(self, valor)
+
+    def _codificar(self, serie, normalizar=None):
+        """(códigos de pd.factorize, valores distintos normalizados, códigos en el vocabulario)"""
+        codigos, unicos = pd.factorize(serie)
+        valores = [normalizar(valor) for valor in unicos] if normalizar is not None else list(unicos)
+        codigos_vocabulario = np.full(len(codigos), -1, dtype=np.intp)
+        if valores:
+            # Solo los valores distintos se buscan en el índice
+            posiciones = self.indice.get_indexer(pd.Index(valores, dtype=object))
+            presentes = codigos >= 0
+            codigos_vocabulario[presentes] = posiciones[codigos[presentes]]
+        return codigos, valores, codigos_vocabulario
+
+    def codificar(self, serie: pd.Series, normalizar=None) -> pd.Categorical:
+        """
+        Columna como Categorical sobre el vocabulario
+
+        Args:
+            serie: Columna que referencia el dominio
+            normalizar: Función valor -> valor comparable (ej. quitar espacios),
+                aplicada una vez por valor distinto
+
+        Returns:
+            pd.Categorical: Código -1 en las filas vacías o con valores que no existen
+        """
+        return pd.Categorical.from_codes(self._codificar(serie, normalizar)[2], dtype=self.tipo)
+
+    def inexistentes(self, serie: pd.Series, separador: str = None, normalizar=None, ignorar_vacios: bool = False):
+        """
+        Referencias de una columna que no existen en el vocabulario
+
+        Args:
+            serie: Columna que referencia el dominio
+            separador: Separador de las listas en una celda (ej. ','); cada
+                elemento se compara sin espacios alrededor y se ignoran los vacíos
+            normalizar: Función valor -> valor comparable (sin separador)
+            ignorar_vacios: No reportar valores que quedan vacíos al normalizar
+
+        Returns:
+            tuple: (valores inexistentes, ya normalizados y en orden de aparición;
+                subconjunto de 'serie' con las filas que los contienen)
+        """
+        if separador is not None:
+            return self._inexistentes_en_listas(serie, separador)
+
+        codigos, valores, codigos_vocabulario = self._codificar(serie, normalizar)
+        # Referencia inexistente: código -1 en una fila con valor
+        filas = (codigos_vocabulario == -1) & (codigos >= 0)
+        if ignorar_vacios and valores:
+            vacios = np.array([valor == '' for valor in valores], dtype=bool)
+            filas &= ~vacios[np.maximum(codigos, 0)]
+        inexistentes = [valores[i] for i in pd.unique(codigos[filas])]
+        return inexistentes, serie[filas]
+
+    def _inexistentes_en_listas(self, serie, separador):
+        codigos, unicos = pd.factorize(serie)
+        # Cada celda distinta se separa una vez y sus elementos se buscan juntos en el índice
+        partes = [[parte.strip() for parte in str(valor).split(separador)] for valor in unicos]
+        elementos = [parte for partes_celda in partes for parte in partes_celda]
+        posiciones = self.indice.get_indexer(pd.Index(elementos, dtype=object)) if elementos else []
+        celdas_invalidas = np.zeros(len(unicos), dtype=bool)
+        inexistentes = {}
+        n = 0
+        for i, partes_celda in enumerate(partes):
+            for parte in partes_celda:
+                if parte and posiciones[n] == -1:
+                    celdas_invalidas[i] = True
+                    inexistentes[parte] = None
+                n += 1
+        filas = np.zeros(len(codigos), dtype=bool)
+        presentes = codigos >= 0
+        filas[presentes] = celdas_invalidas[codigos[presentes]]
+        return list(inexistentes), serie[filas]
+
+
+def vocabulario(valores) -> Vocabulario:
+    """El Vocabulario del contexto, o uno nuevo si el contexto trae una lista simple"""
+    return valores if isinstance(valores, Vocabulario) else Vocabulario(valores)
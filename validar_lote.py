@@ -0,0 +1,341 @@
+"""
+Validación y exportación por lotes de archivos Excel de semilla
+Acepta archivos, directorios (se buscan .xlsx/.xls de forma recursiva) y
+patrones glob, procesa cada archivo en un pool de procesos y escribe un
+resumen JSON por archivo y un resumen agregado. Con --formato jsonl|sarif cada
+archivo escribe además sus incidencias (hoja, fila, columna, regla y severidad)
+a medida que termina cada hoja (ver reporte_incidencias.py).
+
+Uso:
+    python validar_lote.py colegios/ otros/*.xlsx --jobs 8 --salida reportes/lote
+    python validar_lote.py colegios/ --exportar output/lote
+    python validar_lote.py colegios/ --preflight     # solo hojas y encabezados
+    python validar_lote.py seed.xlsx --watch         # revalidar en cada guardado
+    python validar_lote.py colegios/ --formato sarif # incidencias en SARIF por archivo
+    python validar_lote.py seed.xlsx --profile       # tiempos, filas y memoria por etapa
+
+Las dependencias pesadas (pandas, validadores, exportador) se importan solo al
+validar cada archivo, de modo que --help y --preflight arrancan en milisegundos
+(ver benchmarks/bench_importacion.py).
+
+Códigos de salida:
+    0  Todos los archivos son válidos
+    1  Algún archivo tiene errores de validación
+    2  Uso incorrecto o no se encontró ningún archivo
+    3  Algún archivo no se pudo procesar (no existe, está dañado, ...)
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List
+
+warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+
+EXTENSIONES_EXCEL = ('.xlsx', '.xls')
+
+SALIDA_OK = 0
+SALIDA_ERRORES_VALIDACION = 1
+SALIDA_USO = 2
+SALIDA_FALLO = 3
+
+
+def expandir_rutas(entradas: List[str]) -> List[str]:
+    """
+    Convierte archivos, directorios y patrones glob en la lista de archivos Excel
+
+    Las rutas que no existen se conservan para reportarlas como fallidas.
+    Se omiten los archivos temporales de Excel (~$...) y los duplicados.
+    """
+    archivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            encontrados = sorted(
+                ruta for ruta in glob.glob(os.path.join(entrada, '**', '*'), recursive=True)
+                if ruta.lower().endswith(EXTENSIONES_EXCEL)
+            )
+        elif glob.has_magic(entrada):
+            encontrados = sorted(glob.glob(entrada, recursive=True))
+        else:
+            encontrados = [entrada]
+        archivos.extend(ruta for ruta in encontrados if not os.path.basename(ruta).startswith('~$'))
+
+    vistos = set()
+    unicos = []
+    for ruta in archivos:
+        clave = os.path.abspath(ruta)
+        if clave not in vistos:
+            vistos.add(clave)
+            unicos.append(ruta)
+    return unicos
+
+
+def _nombres_reporte(archivos: List[str]) -> List[str]:
+    """
+    Nombre único (sin extensión) para el reporte de cada archivo
+
+    'resumen' queda reservado para el resumen agregado, y los nombres se comparan
+    sin distinguir mayúsculas (sistemas de archivos de Windows y macOS).
+    """
+    nombres = []
+    usados = {'resumen'}
+    for ruta in archivos:
+        base = os.path.splitext(os.path.basename(ruta))[0]
+        nombre, n = base, 1
+        while nombre.casefold() in usados:
+            n += 1
+            nombre = f"{base}_{n}"
+        usados.add(nombre.casefold())
+        nombres.append(nombre)
+    return nombres
+
+
+def procesar_archivo(ruta: str, directorio_exportacion: str = None,
+                     solo_encabezados: bool = False, formato_reporte: str = None,
+                     ruta_reporte: str = None, ruta_traza: str = None) -> Dict[str, Any]:
+    """
+    Valida un archivo y, si es válido y se indica directorio, lo exporta a JSON
+
+    Se ejecuta en un proceso del pool: retorna solo datos serializables (sin DataFrames).
+
+    Args:
+        ruta: Ruta del archivo Excel
+        directorio_exportacion: Directorio para los JSON del archivo (None = no exportar)
+        solo_encabezados: Verificar solo hojas y encabezados (preflight, sin pandas)
+        formato_reporte: 'jsonl' o 'sarif' para escribir las incidencias en ruta_reporte
+        ruta_reporte: Archivo del reporte de incidencias
+        ruta_traza: Perfilar las etapas (ver instrumentacion.py) y escribir la traza JSON
+            en este archivo; el resumen incluye 'rendimiento' (tiempos por etapa)
+
+    Returns:
+        dict: Resumen del archivo con 'estado' ('valido', 'con_errores' o 'fallo')
+    """
+    if ruta_traza:
+        from instrumentacion import perfilar
+        with perfilar() as traza:
+            resumen = procesar_archivo(ruta, directorio_exportacion, solo_encabezados,
+                                       formato_reporte, ruta_reporte)
+        resumen['rendimiento'] = traza.resumen()
+        traza.guardar(ruta_traza)
+        resumen['traza'] = ruta_traza
+        return resumen
+
+    inicio = time.perf_counter()
+    resumen = {
+        'archivo': ruta,
+        'estado': 'fallo',
+        'total_errores': 0,
+        'total_advertencias': 0,
+        'duracion_s': 0.0,
+        'hojas': {},
+        'exportacion': None,
+        'error': None
+    }
+    try:
+        if solo_encabezados:
+            from preflight import verificar_encabezados
+            if not os.path.isfile(ruta):
+                raise FileNotFoundError(f"No existe el archivo: {ruta}")
+            verificacion = verificar_encabezados(ruta)
+            resumen['estado'] = 'valido' if verificacion['valido'] else 'con_errores'
+            resumen['total_errores'] = len(verificacion['errores'])
+            resumen['total_advertencias'] = len(verificacion['advertencias'])
+            resumen['errores'] = verificacion['errores']
+            resumen['advertencias'] = verificacion['advertencias']
+            resumen['hojas'] = verificacion['hojas']
+            return resumen
+
+        from validador_core import validar_libro
+        if formato_reporte:
+            from reporte_incidencias import abrir_reporte
+            with abrir_reporte(formato_reporte, ruta_reporte, ruta) as reporte:
+                resultados = validar_libro(ruta, al_validar_hoja=reporte.escribir_hoja)
+            resumen['reporte_incidencias'] = ruta_reporte
+        else:
+            resultados = validar_libro(ruta)
+        resumen['estado'] = 'valido' if resultados.valido else 'con_errores'
+        resumen['total_errores'] = resultados.total_errores
+        resumen['total_advertencias'] = resultados.total_advertencias
+        # Las filas de cada incidencia van en el reporte --formato, no en el resumen
+        resumen['hojas'] = {hoja: detalle.a_dict(incidencias=False)
+                            for hoja, detalle in resultados.detalles.items()}
+
+        if directorio_exportacion and resultados.valido:
+            from exportador_json import ExcelToJSONExporter
+            exporter = ExcelToJSONExporter(hojas=resultados.hojas, contexto=resultados.contexto)
+            resumen['exportacion'] = exporter.save_to_files(directorio_exportacion)
+    except Exception as e:
+        resumen['estado'] = 'fallo'
+        resumen['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        resumen['duracion_s'] = round(time.perf_counter() - inicio, 3)
+    return resumen
+
+
+def _escribir_resumen(ruta: str, datos: Dict[str, Any]) -> None:
+    # Los resúmenes solo tienen tipos nativos: json basta (sin importar pandas)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+
+def _imprimir_resultado(resumen: Dict[str, Any], n: int, total: int) -> None:
+    if resumen['estado'] == 'valido':
+        estado = f"✓ válido ({resumen['total_advertencias']} advertencia(s))"
+    elif resumen['estado'] == 'con_errores':
+        estado = f"✗ {resumen['total_errores']} error(es), {resumen['total_advertencias']} advertencia(s)"
+    else:
+        estado = f"✗ no se pudo procesar: {resumen['error']}"
+    print(f"[{n}/{total}] {resumen['archivo']}: {estado} - {resumen['duracion_s']:.2f}s", flush=True)
+
+
+def validar_lote(archivos: List[str], salida: str = 'reportes/lote', jobs: int = None,
+                 directorio_exportacion: str = None, solo_encabezados: bool = False,
+                 formato_reporte: str = None, perfilar: bool = False) -> Dict[str, Any]:
+    """
+    Procesa varios archivos en paralelo y escribe los resúmenes JSON
+
+    Args:
+        archivos: Rutas de los archivos Excel
+        salida: Directorio de los resúmenes (<archivo>.json y resumen.json)
+        jobs: Procesos de trabajo (por defecto, uno por núcleo)
+        directorio_exportacion: Exportar los archivos válidos a <directorio>/<archivo>/
+        solo_encabezados: Verificar solo hojas y encabezados (preflight)
+        formato_reporte: 'jsonl' o 'sarif' para escribir <salida>/<archivo>.<formato>
+        perfilar: Medir cada etapa y escribir la traza en <salida>/<archivo>.traza.json
+
+    Returns:
+        dict: Resumen agregado (el mismo contenido de resumen.json)
+    """
+    os.makedirs(salida, exist_ok=True)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    nombres = _nombres_reporte(archivos)
+    inicio = time.perf_counter()
+
+    def exportacion(nombre):
+        return os.path.join(directorio_exportacion, nombre) if directorio_exportacion else None
+
+    def reporte(nombre):
+        return os.path.join(salida, f'{nombre}.{formato_reporte}') if formato_reporte else None
+
+    def traza(nombre):
+        return os.path.join(salida, f'{nombre}.traza.json') if perfilar else None
+
+    resultados = [None] * len(archivos)
+
+    def registrar(i, resumen):
+        resumen['reporte'] = os.path.join(salida, f'{nombres[i]}.json')
+        _escribir_resumen(resumen['reporte'], resumen)
+        resultados[i] = resumen
+        _imprimir_resultado(resumen, sum(r is not None for r in resultados), len(archivos))
+        if 'rendimiento' in resumen:
+            from instrumentacion import formatear_resumen
+            print('\n'.join('      ' + linea for linea in formatear_resumen(resumen['rendimiento']).splitlines()))
+            print(f"      Traza: {resumen['traza']}")
+
+    if jobs == 1 or len(archivos) == 1:
+        for i, ruta in enumerate(archivos):
+            registrar(i, procesar_archivo(ruta, exportacion(nombres[i]), solo_encabezados,
+                                          formato_reporte, reporte(nombres[i]), traza(nombres[i])))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(archivos))) as pool:
+            futuros = {pool.submit(procesar_archivo, ruta, exportacion(nombres[i]), solo_encabezados,
+                                   formato_reporte, reporte(nombres[i]), traza(nombres[i])): i
+                       for i, ruta in enumerate(archivos)}
+            for futuro in as_completed(futuros):
+                registrar(futuros[futuro], futuro.result())
+
+    agregado = {
+        'generado': datetime.now().isoformat(timespec='seconds'),
+        'duracion_s': round(time.perf_counter() - inicio, 3),
+        'jobs': jobs,
+        'archivos': len(archivos),
+        'validos': sum(r['estado'] == 'valido' for r in resultados),
+        'con_errores': sum(r['estado'] == 'con_errores' for r in resultados),
+        'fallidos': sum(r['estado'] == 'fallo' for r in resultados),
+        'total_errores': sum(r['total_errores'] for r in resultados),
+        'total_advertencias': sum(r['total_advertencias'] for r in resultados),
+        'resultados': [
+            {clave: r[clave] for clave in ('archivo', 'estado', 'total_errores', 'total_advertencias',
+                                           'duracion_s', 'reporte', 'error')}
+            for r in resultados
+        ]
+    }
+    _escribir_resumen(os.path.join(salida, 'resumen.json'), agregado)
+    return agregado
+
+
+def codigo_salida(agregado: Dict[str, Any]) -> int:
+    """Código de salida del proceso según el resumen agregado"""
+    if agregado['fallidos']:
+        return SALIDA_FALLO
+    if agregado['con_errores']:
+        return SALIDA_ERRORES_VALIDACION
+    return SALIDA_OK
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Valida (y opcionalmente exporta) varios archivos Excel de semilla en paralelo",
+        epilog="Códigos de salida: 0 todo válido, 1 errores de validación, 2 uso incorrecto "
+               "o sin archivos, 3 archivos que no se pudieron procesar"
+    )
+    parser.add_argument('rutas', nargs='+', help="Archivos, directorios o patrones glob (ej. 'colegios/*.xlsx')")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Procesos de trabajo (por defecto, uno por núcleo)")
+    parser.add_argument('-o', '--salida', default=os.path.join('reportes', 'lote'),
+                        help="Directorio de los resúmenes JSON (por defecto reportes/lote)")
+    parser.add_argument('--exportar', metavar='DIRECTORIO', default=None,
+                        help="Exportar a JSON los archivos válidos en DIRECTORIO/<archivo>/")
+    parser.add_argument('--preflight', action='store_true',
+                        help="Verificar solo hojas requeridas y encabezados (rápido, sin leer los datos)")
+    parser.add_argument('--formato', choices=['jsonl', 'sarif'], default=None,
+                        help="Escribir las incidencias de cada archivo (hoja, fila, columna, regla, severidad) "
+                             "en <salida>/<archivo>.jsonl o .sarif a medida que se valida cada hoja")
+    parser.add_argument('--profile', action='store_true',
+                        help="Medir duración, filas y memoria (tracemalloc) de cada etapa; muestra un resumen "
+                             "por archivo y escribe la traza en <salida>/<archivo>.traza.json")
+    parser.add_argument('--watch', action='store_true',
+                        help="Vigilar un archivo y revalidar solo las hojas afectadas cada vez que se guarda")
+    parser.add_argument('--intervalo', type=float, default=0.3,
+                        help="Segundos entre revisiones del archivo en modo --watch (por defecto 0.3)")
+    args = parser.parse_args(argv)
+    if args.preflight and args.exportar:
+        parser.error("--preflight no se puede combinar con --exportar")
+    if args.preflight and args.formato:
+        parser.error("--preflight no se puede combinar con --formato")
+    if args.profile and (args.preflight or args.watch):
+        parser.error("--profile no se puede combinar con --preflight ni --watch")
+    if args.watch and (len(args.rutas) != 1 or glob.has_magic(args.rutas[0]) or os.path.isdir(args.rutas[0])):
+        parser.error("--watch requiere un único archivo")
+
+    if args.watch:
+        from vigilancia import vigilar
+        return vigilar(args.rutas[0], args.intervalo)
+
+    archivos = expandir_rutas(args.rutas)
+    if not archivos:
+        print("✗ No se encontraron archivos Excel", file=sys.stderr)
+        return SALIDA_USO
+
+    print(f"Procesando {len(archivos)} archivo(s)...")
+    agregado = validar_lote(archivos, args.salida, args.jobs, args.exportar, args.preflight, args.formato,
+                            args.profile)
+
+    print("\n" + "=" * 40)
+    print("RESUMEN DEL LOTE:")
+    print("=" * 40)
+    print(f"Archivos: {agregado['archivos']} ({agregado['jobs']} proceso(s), {agregado['duracion_s']:.1f}s)")
+    print(f"  ✓ Válidos: {agregado['validos']}")
+    print(f"  ✗ Con errores: {agregado['con_errores']}")
+    print(f"  ✗ No procesados: {agregado['fallidos']}")
+    print(f"Resumen: {os.path.join(args.salida, 'resumen.json')}")
+    return codigo_salida(agregado)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
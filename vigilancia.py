@@ -0,0 +1,200 @@
+"""
+Modo vigilancia: revalida un archivo Excel cada vez que se guarda
+Consulta periódicamente la fecha de modificación y el tamaño del archivo. Al
+detectar un cambio compara la huella de cada hoja, vuelve a leer solo las hojas
+modificadas (las demás se conservan en memoria), vuelve a ejecutar solo los
+validadores afectados y muestra los errores y advertencias nuevos y resueltos.
+
+Un validador se considera afectado si cambió su hoja o alguna de las hojas de
+las que consultó el contexto de referencia en su última ejecución.
+"""
+import os
+import time
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Set, Tuple
+
+import pandas as pd
+
+from config import HOJAS_REQUERIDAS
+from preflight import firmas_hojas
+from resultados import ResultadoHoja
+from validador_core import FUENTES_CONTEXTO, construir_contexto, leer_hoja, validar_hoja_completa
+
+
+class _ContextoRegistrado(dict):
+    """Contexto que anota qué claves consulta un validador"""
+
+    def __init__(self, contexto: Dict[str, Any]):
+        super().__init__(contexto)
+        self.consultadas = set()
+
+    def __getitem__(self, clave):
+        self.consultadas.add(clave)
+        return super().__getitem__(clave)
+
+    def __contains__(self, clave):
+        self.consultadas.add(clave)
+        return super().__contains__(clave)
+
+    def get(self, clave, defecto=None):
+        self.consultadas.add(clave)
+        return super().get(clave, defecto)
+
+
+def _problemas(resultado_hoja: ResultadoHoja, hoja: str) -> Set[Tuple[str, str, str]]:
+    """Conjunto de (hoja, tipo, mensaje) de una hoja validada"""
+    return ({(hoja, 'error', mensaje) for mensaje in resultado_hoja.errores} |
+            {(hoja, 'advertencia', mensaje) for mensaje in resultado_hoja.advertencias})
+
+
+class VigilanteLibro:
+    """Mantiene en memoria las hojas y resultados de un archivo para revalidarlo de forma incremental"""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.firma_archivo = None
+        self.firmas = {}          # hoja -> huella del XML
+        self.hojas = {}           # hoja -> DataFrame (header=1)
+        self.contexto = {}
+        self.resultados = {}      # hoja -> resultado de validar_hoja_completa
+        self.dependencias = {}    # hoja -> hojas de origen del contexto que consultó su validador
+
+    def _firma_archivo(self):
+        estado = os.stat(self.ruta)
+        return estado.st_mtime_ns, estado.st_size
+
+    def cambio_archivo(self) -> bool:
+        """True si cambió la fecha de modificación o el tamaño desde la última revisión"""
+        try:
+            return self._firma_archivo() != self.firma_archivo
+        except FileNotFoundError:
+            # Excel reemplaza el archivo al guardar: puede no existir por un instante
+            return False
+
+    def _validar(self, hoja: str) -> None:
+        contexto = _ContextoRegistrado(self.contexto)
+        self.resultados[hoja] = validar_hoja_completa(hoja, self.hojas.get(hoja), contexto)
+        self.dependencias[hoja] = {FUENTES_CONTEXTO[clave] for clave in contexto.consultadas
+                                   if clave in FUENTES_CONTEXTO}
+
+    def problemas(self) -> Set[Tuple[str, str, str]]:
+        """Todos los errores y advertencias actuales como (hoja, tipo, mensaje)"""
+        return set().union(*(_problemas(resultado, hoja) for hoja, resultado in self.resultados.items()))
+
+    def actualizar(self) -> Dict[str, Any]:
+        """
+        Relee las hojas modificadas y revalida las afectadas
+
+        Returns:
+            dict: 'hojas_modificadas', 'revalidadas', 'nuevos', 'resueltos' y 'duracion_s'
+
+        Raises:
+            zipfile.BadZipFile, OSError: si el archivo se está escribiendo todavía
+            Exception: cualquier otro error al leer o validar el archivo completo
+        """
+        inicio = time.perf_counter()
+        firma_archivo = self._firma_archivo()
+        try:
+            firmas = firmas_hojas(self.ruta)
+        except zipfile.BadZipFile:
+            if not self.ruta.lower().endswith('.xls'):
+                raise
+            # .xls no es un ZIP: sin huellas por hoja, se relee todo
+            firmas = {hoja: firma_archivo for hoja in pd.ExcelFile(self.ruta).sheet_names}
+
+        requeridas = [hoja for hoja in HOJAS_REQUERIDAS if hoja != "Instrucciones"]
+        modificadas = [hoja for hoja in requeridas if firmas.get(hoja) != self.firmas.get(hoja)
+                       or (hoja in firmas) != (hoja in self.hojas)]
+
+        if modificadas:
+            excel_file = pd.ExcelFile(self.ruta)
+            for hoja in modificadas:
+                if hoja in excel_file.sheet_names:
+                    self.hojas[hoja] = leer_hoja(excel_file, hoja)
+                else:
+                    self.hojas.pop(hoja, None)
+            self.contexto = construir_contexto(excel_file, self.ruta, self.hojas)
+
+        anteriores = self.problemas()
+        revalidadas = [hoja for hoja in requeridas
+                       if hoja in modificadas or hoja not in self.resultados
+                       or self.dependencias.get(hoja, set()) & set(modificadas)]
+        for hoja in revalidadas:
+            self._validar(hoja)
+        actuales = self.problemas()
+
+        self.firmas = firmas
+        self.firma_archivo = firma_archivo
+        return {
+            'hojas_modificadas': modificadas,
+            'revalidadas': revalidadas,
+            'nuevos': sorted(actuales - anteriores),
+            'resueltos': sorted(anteriores - actuales),
+            'duracion_s': time.perf_counter() - inicio
+        }
+
+    @property
+    def total_errores(self) -> int:
+        return sum(resultado.num_errores for resultado in self.resultados.values())
+
+    @property
+    def total_advertencias(self) -> int:
+        return sum(resultado.num_advertencias for resultado in self.resultados.values())
+
+
+def _imprimir_cambios(vigilante: VigilanteLibro, cambios: Dict[str, Any], imprimir: Callable) -> None:
+    hora = datetime.now().strftime('%H:%M:%S')
+    modificadas = ', '.join(cambios['hojas_modificadas']) or 'ninguna hoja'
+    imprimir(f"\n[{hora}] Cambios en: {modificadas} -> {len(cambios['revalidadas'])} hoja(s) "
+             f"revalidada(s) en {cambios['duracion_s']:.2f}s")
+    for hoja, tipo, mensaje in cambios['nuevos']:
+        imprimir(f"  + {'✗' if tipo == 'error' else '⚠'} {hoja}: {mensaje}")
+    for hoja, tipo, mensaje in cambios['resueltos']:
+        imprimir(f"  - ✓ resuelto {hoja}: {mensaje}")
+    if not cambios['nuevos'] and not cambios['resueltos']:
+        imprimir("  Sin cambios en errores ni advertencias")
+    estado = "✓ VÁLIDO" if vigilante.total_errores == 0 else "✗ CON ERRORES"
+    imprimir(f"  {estado}: {vigilante.total_errores} error(es), {vigilante.total_advertencias} advertencia(s)")
+
+
+def vigilar(ruta: str, intervalo: float = 0.3, imprimir: Callable = print) -> int:
+    """
+    Vigila un archivo e imprime los cambios en la validación cada vez que se guarda
+
+    Args:
+        ruta: Ruta del archivo Excel
+        intervalo: Segundos entre revisiones de fecha de modificación y tamaño
+        imprimir: Función de salida (por defecto print)
+
+    Returns:
+        int: Código de salida (0 al detenerse con Ctrl+C, 1 si el archivo no existe)
+    """
+    if not os.path.isfile(ruta):
+        imprimir(f"✗ No existe el archivo: {ruta}")
+        return 1
+
+    vigilante = VigilanteLibro(ruta)
+    imprimir(f"👀 Vigilando {ruta} (Ctrl+C para salir)")
+    try:
+        while True:
+            if vigilante.cambio_archivo():
+                try:
+                    firma_archivo = vigilante._firma_archivo()
+                    cambios = vigilante.actualizar()
+                except (zipfile.BadZipFile, OSError):
+                    # Archivo a medio escribir: se reintenta en la siguiente revisión
+                    time.sleep(intervalo)
+                    continue
+                except Exception as error:
+                    # El archivo está completo pero no se pudo validar: no se vuelve a
+                    # leer el mismo contenido hasta que se guarde otra vez
+                    imprimir(f"\n✗ No se pudo revalidar el archivo: {type(error).__name__}: {error}")
+                    vigilante.firma_archivo = firma_archivo
+                    time.sleep(intervalo)
+                    continue
+                _imprimir_cambios(vigilante, cambios, imprimir)
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        imprimir("\nVigilancia detenida")
+        return 0